@@ -0,0 +1,245 @@
+import os
+# Must be set before Qt is imported
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import sys
+import io
+import json
+import time
+import argparse
+import platform
+import itertools
+import contextlib
+import subprocess
+
+import numpy as np
+from PyQt5 import QtWidgets
+import pyqtgraph as pg
+
+from src.proto_gen import plot_pb2
+from src.main_window import MainWindow
+from src.plot_servicer import PlotServicer
+from src.sample_block import decode_point_batch, decode_packed_request
+
+# --- Headless ingest/render benchmark ---
+# Drives MainWindow and PlotServicer in-process with synthetic streams
+# and reports throughput, per-batch latency and frame time for every
+# combination of the matrix below.
+#
+#   uv run python -m bench.bench_ingest -o bench_output.json
+
+SIGNALS_PER_AXIS = 6
+
+DEFAULT_SIGNAL_COUNTS = [6, 60]
+DEFAULT_AXIS_SIZES = [1000, 100_000]
+DEFAULT_BATCH_SIZES = [1, 100]
+
+# Every path the data can take into the buffers. The 'window_*' cases
+# apply already decoded blocks (the GUI thread's share of the work), the
+# 'servicer_*' cases include decoding the protobuf messages.
+SCENARIOS = ['window_points', 'window_packed', 'servicer_points', 'servicer_packed']
+
+
+class _StreamContext:
+    """Stands in for the grpc.ServicerContext of a live stream."""
+
+    def is_active(self):
+        return True
+
+    def peer(self):
+        return 'bench'
+
+    def invocation_metadata(self):
+        return ()
+
+
+def _percentiles(samples, scale, points=(50, 90, 99)):
+    if not samples:
+        return {}
+    values = np.asarray(samples) * scale
+    result = {f'p{p}': float(np.percentile(values, p)) for p in points}
+    result['max'] = float(values.max())
+    return result
+
+
+def _make_points_batches(signal_ids, batch_size, rng):
+    """
+    One streamPointRequest per time step (one value per signal).
+    `batch_size` steps are returned, to be sent one after the other.
+    """
+    values = rng.standard_normal((batch_size, len(signal_ids))).astype(np.float32)
+    return [
+        plot_pb2.streamPointRequest(points=[
+            plot_pb2.streamPoint(signal_id=signal_id, value=value)
+            for signal_id, value in zip(signal_ids, row)
+        ])
+        for row in values
+    ]
+
+
+def _make_packed_request(signal_ids, batch_size, rng):
+    """A single streamPackedRequest carrying `batch_size` samples per signal."""
+    values = rng.standard_normal((len(signal_ids), batch_size)).astype('<f4')
+    return plot_pb2.streamPackedRequest(signals=[
+        plot_pb2.packedSamples(signal_id=signal_id, raw_values=row.tobytes())
+        for signal_id, row in zip(signal_ids, values)
+    ])
+
+
+def _configure(window, n_signals, axis_size):
+    """Creates the axes and signals directly through the GUI handlers."""
+    window.on_clear_all()
+    signal_ids = list(range(n_signals))
+    n_axes = (n_signals + SIGNALS_PER_AXIS - 1) // SIGNALS_PER_AXIS
+    for axis_id in range(n_axes):
+        window.on_add_axis(plot_pb2.AddAxisRequest(axis_id=axis_id, number_of_samples=axis_size))
+    for signal_id in signal_ids:
+        window.on_add_signal(plot_pb2.AddSignalRequest(
+            axis_id=signal_id // SIGNALS_PER_AXIS, signal_id=signal_id,
+            signal_name=f"s{signal_id}"))
+    return signal_ids
+
+
+def run_case(app, window, servicer, scenario, n_signals, axis_size, batch_size,
+             duration, batches_per_frame, seed=0):
+    rng = np.random.default_rng(seed)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        signal_ids = _configure(window, n_signals, axis_size)
+
+    # One "unit of work" is `batch_size` samples for every signal
+    if scenario.endswith('points'):
+        points_batches = _make_points_batches(signal_ids, batch_size, rng)
+        if scenario == 'window_points':
+            blocks = [decode_point_batch(batch, time.time()) for batch in points_batches]
+            def ingest():
+                window.on_add_sample_blocks(blocks)
+        else:
+            def ingest():
+                servicer.streamPlot(iter(points_batches), _StreamContext())
+    else:
+        packed_request = _make_packed_request(signal_ids, batch_size, rng)
+        if scenario == 'window_packed':
+            blocks = [decode_packed_request(packed_request, time.time(), {})]
+            def ingest():
+                window.on_add_sample_blocks(blocks)
+        else:
+            def ingest():
+                servicer.streamPlotPacked(iter([packed_request]), _StreamContext())
+
+    batch_latencies = []
+    frame_times = []
+    points = 0
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        deadline = start + duration
+        while time.perf_counter() < deadline:
+            t0 = time.perf_counter()
+            ingest()
+            batch_latencies.append(time.perf_counter() - t0)
+            points += n_signals * batch_size
+
+            if len(batch_latencies) % batches_per_frame == 0:
+                t0 = time.perf_counter()
+                window.on_render_frame()
+                app.processEvents()
+                frame_times.append(time.perf_counter() - t0)
+        elapsed = time.perf_counter() - start
+
+    return {
+        'scenario': scenario,
+        'signals': n_signals,
+        'axis_samples': axis_size,
+        'batch_size': batch_size,
+        'batches': len(batch_latencies),
+        'points': points,
+        'seconds': elapsed,
+        # Wall clock, including rendering
+        'points_per_sec': points / elapsed,
+        # Time spent in the ingest path only
+        'ingest_points_per_sec': points / sum(batch_latencies),
+        'batch_latency_us': _percentiles(batch_latencies, 1e6),
+        'frame_ms': _percentiles(frame_times, 1e3),
+    }
+
+
+def _git_revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _int_list(text):
+    return [int(item) for item in text.split(',') if item]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless ingest/render benchmark")
+    parser.add_argument('-o', '--output', type=str, default=None,
+                        help='Write the results as JSON to this file')
+    parser.add_argument('--signals', type=_int_list, default=DEFAULT_SIGNAL_COUNTS,
+                        help='Comma separated signal counts')
+    parser.add_argument('--axis-sizes', type=_int_list, default=DEFAULT_AXIS_SIZES,
+                        help='Comma separated number_of_samples per axis')
+    parser.add_argument('--batch-sizes', type=_int_list, default=DEFAULT_BATCH_SIZES,
+                        help='Comma separated samples per signal per batch')
+    parser.add_argument('--scenarios', type=lambda s: s.split(','), default=SCENARIOS,
+                        help=f'Comma separated subset of {",".join(SCENARIOS)}')
+    parser.add_argument('--duration', type=float, default=1.0,
+                        help='Seconds to run each case (default: 1.0)')
+    parser.add_argument('--batches-per-frame', type=int, default=10,
+                        help='Ingested batches between two rendered frames (default: 10)')
+    args = parser.parse_args()
+
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    app = QtWidgets.QApplication(sys.argv[:1])
+    window = MainWindow()
+    # Frames are rendered explicitly by the benchmark
+    window.render_timer.stop()
+    # Large enough that nothing is dropped: the queue is drained synchronously
+    servicer = PlotServicer(queue_capacity=1_000_000)
+    window.set_servicer(servicer)
+    window.show()
+
+    results = []
+    matrix = itertools.product(args.scenarios, args.signals, args.axis_sizes, args.batch_sizes)
+    for scenario, n_signals, axis_size, batch_size in matrix:
+        result = run_case(app, window, servicer, scenario, n_signals, axis_size,
+                          batch_size, args.duration, args.batches_per_frame)
+        results.append(result)
+        print(f"{scenario:16s} signals={n_signals:<5d} samples={axis_size:<8d} batch={batch_size:<5d} "
+              f"{result['points_per_sec'] / 1e3:10.1f} kpts/s "
+              f"(ingest {result['ingest_points_per_sec'] / 1e3:10.1f})  "
+              f"batch p50={result['batch_latency_us'].get('p50', 0):9.1f}us "
+              f"p99={result['batch_latency_us'].get('p99', 0):9.1f}us  "
+              f"frame p50={result['frame_ms'].get('p50', 0):7.2f}ms")
+
+    if args.output:
+        report = {
+            'meta': {
+                'revision': _git_revision(),
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'pyqtgraph': pg.__version__,
+                'platform': platform.platform(),
+                'duration_per_case': args.duration,
+                'batches_per_frame': args.batches_per_frame,
+            },
+            'results': results,
+        }
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    window.close()
+
+
+if __name__ == '__main__':
+    main()
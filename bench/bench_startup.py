@@ -0,0 +1,133 @@
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import argparse
+
+import grpc
+import numpy as np
+
+from src.client import Dashboard
+from src.proto_gen import plot_pb2_grpc
+from google.protobuf import empty_pb2
+
+# --- Startup benchmark ---
+# Launches the plot server (src.app, offscreen Qt) the way a producer
+# launched along with it would see it, and measures, from the launch:
+#   accept       the port accepts TCP connections
+#   configured   a Dashboard is connected and configure() returned
+#   first_frame  the server prints its "[Startup] First frame" line
+#   applied      GetStats reports every sample streamed right after
+#                configure() as applied to the buffers (none lost)
+#
+#   uv run python -m bench.bench_startup -o startup_output.json
+#   uv run python -m bench.bench_startup --app-args="--ingest-process --aio"
+
+# Samples streamed as soon as the server accepts
+SAMPLES = 10_000
+# Give up on a run after this many seconds
+TIMEOUT = 30.0
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _wait_for(condition, deadline, interval=0.001):
+    while not condition():
+        if time.time() > deadline:
+            raise TimeoutError
+        time.sleep(interval)
+
+
+def run_once(app_args):
+    port = _free_port()
+    address = f'127.0.0.1:{port}'
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get('QT_QPA_PLATFORM', 'offscreen'))
+
+    launch = time.time()
+    process = subprocess.Popen([sys.executable, '-u', '-m', 'src.app', '-p', str(port)] + app_args,
+                               stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, env=env)
+    deadline = launch + TIMEOUT
+    result = {}
+
+    # Timestamp the server's output as it comes
+    first_frame = []
+
+    def read_output():
+        for line in process.stdout:
+            if line.startswith('[Startup] First frame') and not first_frame:
+                first_frame.append(time.time())
+
+    threading.Thread(target=read_output, daemon=True).start()
+
+    try:
+        def accepting():
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=0.1).close()
+                return True
+            except OSError:
+                return False
+
+        _wait_for(accepting, deadline)
+        result['accept_s'] = time.time() - launch
+
+        # A producer launched along with the server
+        with Dashboard(address, connect_timeout=TIMEOUT) as dashboard:
+            axis = dashboard.add_axis(1, samples=SAMPLES)
+            signal = axis.add_signal(10, sample_period=1e-3)
+            dashboard.configure()
+            result['configured_s'] = time.time() - launch
+            for values in np.array_split(np.arange(SAMPLES, dtype=float), 10):
+                signal.push(values)
+
+        _wait_for(lambda: first_frame, deadline)
+        result['first_frame_s'] = first_frame[0] - launch
+
+        stub = plot_pb2_grpc.PlotServiceStub(grpc.insecure_channel(address))
+        _wait_for(lambda: stub.GetStats(empty_pb2.Empty()).points_applied >= SAMPLES, deadline, 0.01)
+        result['applied_s'] = time.time() - launch
+        stats = stub.GetStats(empty_pb2.Empty())
+        result['reported_accept_ms'] = stats.startup_accept_ms
+        result['reported_first_frame_ms'] = stats.startup_first_frame_ms
+    finally:
+        process.terminate()
+        process.wait()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup benchmark of the plot server")
+    parser.add_argument('-o', '--output', type=str, default=None,
+                        help='Write the results as JSON to this file')
+    parser.add_argument('--runs', type=int, default=5,
+                        help='Number of launches (default: 5)')
+    parser.add_argument('--app-args', type=str, default='',
+                        help='Extra arguments for src.app, e.g. "--aio"')
+    args = parser.parse_args()
+
+    runs = []
+    for index in range(args.runs):
+        result = run_once(args.app_args.split())
+        runs.append(result)
+        print(f"run {index + 1}: " + "  ".join(f"{key} {value * 1e3:.0f} ms" if key.endswith('_s') else
+                                              f"{key} {value:.0f}" for key, value in result.items()))
+
+    medians = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+    print("median: " + "  ".join(f"{key} {value * 1e3:.0f} ms" if key.endswith('_s') else
+                                 f"{key} {value:.0f}" for key, value in medians.items()))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'app_args': args.app_args, 'runs': runs, 'median': medians}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+import gzip
+import json
+import time
+import argparse
+
+import numpy as np
+
+from src.proto_gen import plot_pb2
+from src.sample_block import (decode_point_batch, decode_packed_request, quantization_scale,
+                              quantize_values)
+
+# --- Wire size benchmark ---
+# Bytes sent per sample, with and without gzip stream compression, for
+# every way of streaming the same synthetic sensor data (IMU-like: a few
+# Hz of motion plus noise, sampled at `--rate`), and the server's decode
+# time for each.
+#
+#   uv run python -m bench.bench_wire -o wire_output.json
+
+SIGNALS = 6
+# Range of the signals, as declared for quantization
+RANGE = (-4.0, 4.0)
+
+# Each encoding builds the requests sent for one flush interval
+ENCODINGS = ['points', 'packed_values', 'packed_raw', 'packed_raw_period', 'packed_quantized']
+
+# gRPC frames every message with a 5 byte header
+FRAME_HEADER = 5
+
+
+def _make_data(rate, seconds, rng):
+    t = np.arange(int(rate * seconds)) / rate
+    frequencies = 0.5 + rng.random(SIGNALS) * 3
+    values = np.sin(2 * np.pi * frequencies[:, None] * t) + 0.01 * rng.standard_normal((SIGNALS, len(t)))
+    return t + 1.7e9, values.astype(np.float32)
+
+
+def _requests(encoding, t, values, rate, flush):
+    """The requests of one flush interval (samples t, values[:, ...])."""
+    if encoding == 'points':
+        # One request per tick, timestamped, with a point per signal
+        return [plot_pb2.streamPointRequest(
+                    timestamp=t[i],
+                    points=[plot_pb2.streamPoint(signal_id=s, value=values[s, i]) for s in range(SIGNALS)])
+                for i in range(len(t))]
+
+    signals = []
+    for s in range(SIGNALS):
+        samples = plot_pb2.packedSamples(signal_id=s)
+        if encoding == 'packed_values':
+            samples.values.extend(values[s].tolist())
+        elif encoding == 'packed_quantized':
+            samples.quantized_values = quantize_values(values[s], *quantization_scale(
+                plot_pb2.Quantization(min=RANGE[0], max=RANGE[1])))
+        else:
+            samples.raw_values = values[s].tobytes()
+
+        if encoding == 'packed_raw':
+            samples.raw_timestamps = t.tobytes()
+        else:
+            samples.start_time = t[0]
+            samples.sample_period = 1.0 / rate
+        signals.append(samples)
+    return [plot_pb2.streamPackedRequest(signals=signals)]
+
+
+def run_encoding(encoding, t, values, rate, flush_samples):
+    quantizations = {s: quantization_scale(plot_pb2.Quantization(min=RANGE[0], max=RANGE[1]))
+                     for s in range(SIGNALS)}
+    plain = compressed = 0
+    decode_time = 0.0
+    error = 0.0
+    for start in range(0, len(t), flush_samples):
+        piece = slice(start, start + flush_samples)
+        for request in _requests(encoding, t[piece], values[:, piece], rate, flush_samples):
+            data = request.SerializeToString()
+            plain += FRAME_HEADER + len(data)
+            # gRPC's gzip compresses each message on its own
+            compressed += FRAME_HEADER + len(gzip.compress(data, compresslevel=6))
+
+            t0 = time.perf_counter()
+            if encoding == 'points':
+                block = decode_point_batch(request, time.time())
+            else:
+                block = decode_packed_request(request, time.time(), {}, quantizations)
+            decode_time += time.perf_counter() - t0
+
+            if encoding != 'points':
+                sent = values[:, piece].astype(np.float64).ravel()
+                error = max(error, float(np.abs(block.values - sent).max()))
+
+    samples = values.size
+    return {
+        'encoding': encoding,
+        'bytes_per_sample': plain / samples,
+        'gzip_bytes_per_sample': compressed / samples,
+        'decode_ns_per_sample': decode_time / samples * 1e9,
+        'max_abs_error': error,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Wire size benchmark of the streaming encodings")
+    parser.add_argument('-o', '--output', type=str, default=None,
+                        help='Write the results as JSON to this file')
+    parser.add_argument('--rate', type=float, default=1000.0,
+                        help='Samples per second per signal (default: 1000)')
+    parser.add_argument('--seconds', type=float, default=10.0,
+                        help='Seconds of data to encode (default: 10)')
+    parser.add_argument('--flush', type=float, default=0.02,
+                        help='Seconds of samples per packed request (default: 0.02)')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    t, values = _make_data(args.rate, args.seconds, rng)
+    flush_samples = max(1, int(args.rate * args.flush))
+
+    results = []
+    for encoding in ENCODINGS:
+        result = run_encoding(encoding, t, values, args.rate, flush_samples)
+        results.append(result)
+        print(f"{encoding:18s} {result['bytes_per_sample']:6.2f} B/sample  "
+              f"gzip {result['gzip_bytes_per_sample']:6.2f} B/sample  "
+              f"decode {result['decode_ns_per_sample']:7.1f} ns/sample  "
+              f"max error {result['max_abs_error']:.2e}")
+
+    baseline = results[0]['bytes_per_sample']
+    for result in results:
+        print(f"{result['encoding']:18s} {baseline / result['gzip_bytes_per_sample']:5.1f}x "
+              f"samples per megabit (gzip) vs uncompressed points")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'rate': args.rate, 'flush': args.flush, 'signals': SIGNALS,
+                       'results': results}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+import os
+# Must be set before Qt is imported
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import io
+import sys
+import time
+import asyncio
+import argparse
+import threading
+import contextlib
+from concurrent import futures
+
+import grpc
+import numpy as np
+from PyQt5 import QtWidgets
+
+from src.proto_gen import plot_pb2, plot_pb2_grpc
+from src.main_window import MainWindow
+from src.plot_servicer import PlotServicer, add_to_server
+from src.aio_server import start_aio_server
+
+# --- Concurrent stream stress test ---
+# Runs the server in-process (offscreen window), opens many long-lived
+# streams at once and, while they are all open, keeps probing the
+# server with unary AddAxis calls. With the thread pool server every
+# open stream holds a worker, so past --max-workers streams the probes
+# (and the extra streams) starve; the asyncio server keeps answering.
+#
+#   uv run python -m bench.stress_streams --mode aio --streams 200
+#   uv run python -m bench.stress_streams --mode thread --streams 200
+#
+# Exits with a non-zero status if a probe failed or a stream never got
+# its samples through.
+
+SIGNALS_PER_AXIS = 20
+PROBE_AXIS_ID = 1_000_000
+
+
+def _start_server(servicer, mode, max_workers):
+    if mode == 'aio':
+        return start_aio_server(servicer, '127.0.0.1:0')
+
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
+    add_to_server(servicer, server)
+    port = server.add_insecure_port('127.0.0.1:0')
+    server.start()
+    return port
+
+
+def _configure(window, n_streams, axis_size):
+    """One signal per stream, SIGNALS_PER_AXIS signals per axis."""
+    for axis_id in range((n_streams + SIGNALS_PER_AXIS - 1) // SIGNALS_PER_AXIS):
+        window.on_add_axis(plot_pb2.AddAxisRequest(axis_id=axis_id, number_of_samples=axis_size))
+    for signal_id in range(n_streams):
+        window.on_add_signal(plot_pb2.AddSignalRequest(
+            axis_id=signal_id // SIGNALS_PER_AXIS, signal_id=signal_id, signal_name=f"s{signal_id}"))
+
+
+async def _stream(stub, signal_id, duration, period, batch_size, stop):
+    async def requests():
+        rng = np.random.default_rng(signal_id)
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline and not stop.is_set():
+            values = rng.standard_normal(batch_size).astype('<f4')
+            yield plot_pb2.streamPackedRequest(signals=[
+                plot_pb2.packedSamples(signal_id=signal_id, raw_values=values.tobytes())])
+            await asyncio.sleep(period)
+
+    await stub.streamPlotPacked(requests())
+
+
+async def _probe(stub, results, stop, interval, timeout):
+    """Times unary calls while the streams are open."""
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        try:
+            await stub.AddAxis(plot_pb2.AddAxisRequest(axis_id=PROBE_AXIS_ID, number_of_samples=10),
+                               timeout=timeout)
+            await stub.RemoveAxis(plot_pb2.RemoveAxisRequest(axis_id=PROBE_AXIS_ID), timeout=timeout)
+            results['latencies'].append(time.perf_counter() - t0)
+        except grpc.aio.AioRpcError as e:
+            results['failures'].append(e.code().name)
+        await asyncio.sleep(interval)
+
+
+async def _run_clients(port, args, results):
+    async with grpc.aio.insecure_channel(f'127.0.0.1:{port}') as channel:
+        stub = plot_pb2_grpc.PlotServiceStub(channel)
+        stop = asyncio.Event()
+
+        streams = [
+            asyncio.ensure_future(_stream(stub, signal_id, args.duration, args.period, args.batch_size, stop))
+            for signal_id in range(args.streams)
+        ]
+        # Let every stream open before probing
+        await asyncio.sleep(min(1.0, args.duration / 4))
+        probe = asyncio.ensure_future(_probe(stub, results, stop, args.probe_interval, args.probe_timeout))
+
+        done, pending = await asyncio.wait(streams, timeout=args.duration + args.probe_timeout)
+        stop.set()
+        for task in pending:
+            task.cancel()
+        await probe
+
+        results['streams_completed'] = sum(1 for task in done if task.exception() is None)
+        results['streams_failed'] = sum(1 for task in done if task.exception() is not None)
+        results['streams_stuck'] = len(pending)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent stream stress test")
+    parser.add_argument('--mode', choices=['aio', 'thread'], default='aio',
+                        help='Server implementation to test (default: aio)')
+    parser.add_argument('--streams', type=int, default=200,
+                        help='Number of concurrent streams (default: 200)')
+    parser.add_argument('--max-workers', type=int, default=10,
+                        help='Thread pool size in thread mode (default: 10)')
+    parser.add_argument('--duration', type=float, default=5.0,
+                        help='Seconds every stream stays open (default: 5)')
+    parser.add_argument('--period', type=float, default=0.02,
+                        help='Seconds between two messages of a stream (default: 0.02)')
+    parser.add_argument('--batch-size', type=int, default=10,
+                        help='Samples per message (default: 10)')
+    parser.add_argument('--probe-interval', type=float, default=0.25,
+                        help='Seconds between two unary probes (default: 0.25)')
+    parser.add_argument('--probe-timeout', type=float, default=2.0,
+                        help='Deadline of a unary probe in seconds (default: 2)')
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication(sys.argv[:1])
+    window = MainWindow()
+    servicer = PlotServicer(queue_capacity=4096)
+    window.set_servicer(servicer)
+    window.show()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        _configure(window, args.streams, axis_size=1000)
+        port = _start_server(servicer, args.mode, args.max_workers)
+
+    results = {'latencies': [], 'failures': []}
+
+    def client_thread():
+        asyncio.run(_run_clients(port, args, results))
+
+    client = threading.Thread(target=client_thread, daemon=True)
+    start = time.perf_counter()
+
+    # The GUI has to keep draining the queue while the clients run
+    with contextlib.redirect_stdout(io.StringIO()):
+        client.start()
+        while client.is_alive():
+            app.processEvents()
+            time.sleep(0.001)
+        app.processEvents()
+    elapsed = time.perf_counter() - start
+
+    written = window.sample_bank.written[:args.streams]
+    silent_streams = int(np.count_nonzero(written == 0))
+    latencies = np.asarray(results['latencies']) * 1e3
+
+    print(f"mode={args.mode} streams={args.streams} elapsed={elapsed:.1f}s")
+    print(f"  streams: {results['streams_completed']} completed, {results['streams_failed']} failed, "
+          f"{results['streams_stuck']} stuck, {silent_streams} without samples")
+    print(f"  samples received: {int(written.sum())}")
+    if len(latencies):
+        print(f"  unary probes: {len(latencies)} ok, p50={np.percentile(latencies, 50):.1f}ms "
+              f"max={latencies.max():.1f}ms, {len(results['failures'])} failed")
+    else:
+        print(f"  unary probes: none succeeded, {len(results['failures'])} failed")
+    if results['failures']:
+        print(f"  probe errors: {sorted(set(results['failures']))}")
+
+    ok = (not results['failures'] and len(latencies) > 0 and silent_streams == 0
+          and results['streams_completed'] == args.streams)
+    print("PASS" if ok else "FAIL")
+
+    window.close()
+    # Skip interpreter teardown: the thread pool server may still hold starved streams
+    os._exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
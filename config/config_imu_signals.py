@@ -1,9 +1,8 @@
 import grpc
 import sys
 import argparse
-# gRPC stubs for your PLOT server
-from src.proto_gen import plot_pb2_grpc, plot_pb2
-from google.protobuf import empty_pb2
+# Client SDK of the PLOT server
+from src.client import Dashboard
 
 # --- Plot Configuration ---
 AXIS_ID_ACCEL = 1
@@ -17,6 +16,32 @@ SIGNAL_ID_GYRO_X = 20
 SIGNAL_ID_GYRO_Y = 21
 SIGNAL_ID_GYRO_Z = 22
 
+# Full scale of the sensors, used as the quantization ranges
+ACCEL_RANGE = (-16.0, 16.0)  # g
+GYRO_RANGE = (-2000.0, 2000.0)  # deg/s
+
+
+def declare_imu_dashboard(dashboard, quantize=False):
+    """
+    Declares the IMU axes and signals on a Dashboard (sent by configure()).
+    With quantize=True, samples are sent as 16-bit codes of the full scale.
+    """
+    accel_range = ACCEL_RANGE if quantize else None
+    gyro_range = GYRO_RANGE if quantize else None
+
+    accel = dashboard.add_axis(AXIS_ID_ACCEL, samples=SAMPLES_TO_SHOW, title="Accelerometer",
+                               x_title="Time (s)", y_title="Acceleration (g)")
+    accel.add_signal(SIGNAL_ID_ACC_X, name="Accel X", color="r", quantize=accel_range)
+    accel.add_signal(SIGNAL_ID_ACC_Y, name="Accel Y", color="g", quantize=accel_range)
+    accel.add_signal(SIGNAL_ID_ACC_Z, name="Accel Z", color="b", quantize=accel_range)
+
+    gyro = dashboard.add_axis(AXIS_ID_GYRO, samples=SAMPLES_TO_SHOW, title="Gyroscope",
+                              x_title="Time (s)", y_title="Angular Velocity (deg/s)")
+    gyro.add_signal(SIGNAL_ID_GYRO_X, name="Gyro X", color="c", quantize=gyro_range)
+    gyro.add_signal(SIGNAL_ID_GYRO_Y, name="Gyro Y", color="m", quantize=gyro_range)
+    gyro.add_signal(SIGNAL_ID_GYRO_Z, name="Gyro Z", color="y", quantize=gyro_range)
+
+
 def main():
 
     args = argparse.ArgumentParser(description="IMU Plot Configuration Client")
@@ -31,67 +56,16 @@ def main():
     print(f"Connecting to plot server at {parsed_args.address} to configure IMU plots...")
     
     try:
-        with grpc.insecure_channel(parsed_args.address) as channel:
-            stub = plot_pb2_grpc.PlotServiceStub(channel)
-            
-            # 1. Wait for plot server to be ready
+        with Dashboard(parsed_args.address) as dashboard:
             print(f"Connected. Sending configuration...")
-            
-            # Clear all existing plots first ---
-            print("  > Sending clearAll request...")
-            stub.clearAll(empty_pb2.Empty())
-            print("  > Server cleared.")
-
-
-            # --- Add Axis 1 (Accelerometer) ---
-            stub.AddAxis(plot_pb2.AddAxisRequest(
-                axis_id=AXIS_ID_ACCEL,
-                number_of_samples=SAMPLES_TO_SHOW,
-                plot_title="Accelerometer",
-                x_axis_title="Time (samples)",
-                y_axis_title="Acceleration (g)"
-            ))
-            print(f"  > Added Axis {AXIS_ID_ACCEL} (Accelerometer)")
-            
-            # Add signals to Axis 1
-            stub.AddSignal(plot_pb2.AddSignalRequest(
-                axis_id=AXIS_ID_ACCEL, signal_id=SIGNAL_ID_ACC_X, 
-                signal_name="Accel X", signal_color="r"
-            ))
-            stub.AddSignal(plot_pb2.AddSignalRequest(
-                axis_id=AXIS_ID_ACCEL, signal_id=SIGNAL_ID_ACC_Y, 
-                signal_name="Accel Y", signal_color="g"
-            ))
-            stub.AddSignal(plot_pb2.AddSignalRequest(
-                axis_id=AXIS_ID_ACCEL, signal_id=SIGNAL_ID_ACC_Z, 
-                signal_name="Accel Z", signal_color="b"
-            ))
-            print(f"    > Added signals {SIGNAL_ID_ACC_X}, {SIGNAL_ID_ACC_Y}, {SIGNAL_ID_ACC_Z}")
-
-            # --- Add Axis 2 (Gyroscope) ---
-            stub.AddAxis(plot_pb2.AddAxisRequest(
-                axis_id=AXIS_ID_GYRO,
-                number_of_samples=SAMPLES_TO_SHOW,
-                plot_title="Gyroscope",
-                x_axis_title="Time (samples)",
-                y_axis_title="Angular Velocity (deg/s)"
-            ))
-            print(f"  > Added Axis {AXIS_ID_GYRO} (Gyroscope)")
 
-            # Add signals to Axis 2
-            stub.AddSignal(plot_pb2.AddSignalRequest(
-                axis_id=AXIS_ID_GYRO, signal_id=SIGNAL_ID_GYRO_X, 
-                signal_name="Gyro X", signal_color="c"
-            ))
-            stub.AddSignal(plot_pb2.AddSignalRequest(
-                axis_id=AXIS_ID_GYRO, signal_id=SIGNAL_ID_GYRO_Y, 
-                signal_name="Gyro Y", signal_color="m"
-            ))
-            stub.AddSignal(plot_pb2.AddSignalRequest(
-                axis_id=AXIS_ID_GYRO, signal_id=SIGNAL_ID_GYRO_Z, 
-                signal_name="Gyro Z", signal_color="y"
-            ))
-            print(f"    > Added signals {SIGNAL_ID_GYRO_X}, {SIGNAL_ID_GYRO_Y}, {SIGNAL_ID_GYRO_Z}")
+            # The whole layout goes in a single request: the server
+            # replaces whatever was configured before with it
+            declare_imu_dashboard(dashboard)
+            dashboard.configure()
+            print(f"  > Configured axes {AXIS_ID_ACCEL} (Accelerometer) and {AXIS_ID_GYRO} (Gyroscope)")
+            print(f"    > Signals {SIGNAL_ID_ACC_X}, {SIGNAL_ID_ACC_Y}, {SIGNAL_ID_ACC_Z}, "
+                  f"{SIGNAL_ID_GYRO_X}, {SIGNAL_ID_GYRO_Y}, {SIGNAL_ID_GYRO_Z}")
             
             print("\nConfiguration complete. Plots are ready.")
 
@@ -110,4 +84,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
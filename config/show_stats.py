@@ -0,0 +1,49 @@
+import grpc
+import sys
+import time
+import argparse
+# gRPC stubs for your PLOT server
+from src.proto_gen import plot_pb2_grpc
+from google.protobuf import empty_pb2
+from google.protobuf import text_format
+
+
+def main():
+
+    args = argparse.ArgumentParser(description="Plot Server Statistics Client")
+    args.add_argument(
+        '-a', '--address',
+        type=str,
+        required=True,
+        help='Address of the gRPC plot server (e.g. localhost:50051)'
+    )
+    args.add_argument(
+        '-i', '--interval',
+        type=float,
+        default=0,
+        help='Keep polling every INTERVAL seconds (default: print once)'
+    )
+
+    parsed_args = args.parse_args()
+
+    try:
+        with grpc.insecure_channel(parsed_args.address) as channel:
+            stub = plot_pb2_grpc.PlotServiceStub(channel)
+            while True:
+                stats = stub.GetStats(empty_pb2.Empty())
+                print(text_format.MessageToString(stats))
+                if parsed_args.interval <= 0:
+                    break
+                time.sleep(parsed_args.interval)
+
+    except KeyboardInterrupt:
+        pass
+    except grpc.RpcError as e:
+        if e.code() == grpc.StatusCode.UNAVAILABLE:
+             print(f"!!! ERROR: Plot server is unavailable at {parsed_args.address}. Is it running? !!!")
+        else:
+             print(f"!!! gRPC ERROR: {e.details()} ({e.code()}) !!!")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import grpc
+import sys
+import time
+import argparse
+
+import numpy as np
+
+from src.client import Dashboard
+from config.config_imu_signals import (declare_imu_dashboard, SIGNAL_ID_ACC_X, SIGNAL_ID_ACC_Y,
+                                       SIGNAL_ID_ACC_Z, SIGNAL_ID_GYRO_X, SIGNAL_ID_GYRO_Y,
+                                       SIGNAL_ID_GYRO_Z)
+
+# Example producer: configures the IMU dashboard and streams synthetic
+# samples from a fixed-rate loop, one push() per sample.
+
+
+def main():
+
+    args = argparse.ArgumentParser(description="Synthetic IMU Stream Client")
+    args.add_argument(
+        '-a', '--address',
+        type=str,
+        required=True,
+        help='Address of the gRPC plot server (e.g. localhost:50051)'
+    )
+    args.add_argument(
+        '-r', '--rate',
+        type=float,
+        default=1000.0,
+        help='Samples per second and per signal (default: 1000)'
+    )
+    args.add_argument(
+        '-d', '--duration',
+        type=float,
+        default=10.0,
+        help='Seconds to stream (default: 10)'
+    )
+    args.add_argument(
+        '-c', '--compression',
+        choices=['gzip', 'deflate'],
+        default=None,
+        help='Compress the stream (default: none)'
+    )
+    args.add_argument(
+        '-q', '--quantize',
+        action='store_true',
+        help='Send the samples as 16-bit codes of the sensors\' full scale'
+    )
+
+    parsed_args = args.parse_args()
+    period = 1.0 / parsed_args.rate
+
+    try:
+        with Dashboard(parsed_args.address, compression=parsed_args.compression) as dashboard:
+            declare_imu_dashboard(dashboard, quantize=parsed_args.quantize)
+            dashboard.configure()
+            signals = [dashboard.signal(signal_id) for signal_id in (
+                SIGNAL_ID_ACC_X, SIGNAL_ID_ACC_Y, SIGNAL_ID_ACC_Z,
+                SIGNAL_ID_GYRO_X, SIGNAL_ID_GYRO_Y, SIGNAL_ID_GYRO_Z)]
+            # Fixed rate: the timestamps are generated, and sent as a period
+            for signal in signals:
+                signal.sample_period = period
+            print(f"Streaming {len(signals)} signals at {parsed_args.rate:g} Hz "
+                  f"for {parsed_args.duration:g}s...")
+
+            start = time.perf_counter()
+            next_time = start
+            i = 0
+            while next_time - start < parsed_args.duration:
+                t = i * period
+                for k, signal in enumerate(signals):
+                    signal.push(np.sin(2 * np.pi * (0.5 + 0.2 * k) * t) + 0.05 * np.random.randn())
+                i += 1
+                next_time += period
+                delay = next_time - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+        print(f"Done: {dashboard.stats()}")
+
+    except grpc.FutureTimeoutError:
+        print(f"!!! ERROR: Connection timed out. Is the plot server running at {parsed_args.address}? !!!")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
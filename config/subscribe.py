@@ -0,0 +1,72 @@
+import grpc
+import sys
+import time
+import argparse
+from collections import defaultdict
+
+from src.client import Dashboard
+
+# Example subscriber: receives the live data of some signals from the
+# plot server and prints, every second, how many samples arrived per
+# signal and the latest value.
+
+
+def main():
+
+    args = argparse.ArgumentParser(description="Live Data Subscriber")
+    args.add_argument(
+        '-a', '--address',
+        type=str,
+        required=True,
+        help='Address of the gRPC plot server (e.g. localhost:50051)'
+    )
+    args.add_argument(
+        '-s', '--signals',
+        type=lambda text: [int(item) for item in text.split(',') if item],
+        default=[],
+        help='Comma separated signal IDs (default: all)'
+    )
+    args.add_argument(
+        '--session',
+        type=str,
+        default='',
+        help='Producer session of the signals (default: the default session)'
+    )
+    args.add_argument(
+        '-r', '--rate',
+        type=float,
+        default=0.0,
+        help='At most this many samples per second and signal (default: all of them)'
+    )
+
+    parsed_args = args.parse_args()
+
+    try:
+        with Dashboard(parsed_args.address) as dashboard:
+            print(f"Subscribed to {parsed_args.address}. Press Ctrl+C to stop.")
+            counts = defaultdict(int)
+            latest = {}
+            last_report = time.monotonic()
+            for signal_id, timestamps, values in dashboard.subscribe(
+                    parsed_args.signals, parsed_args.session, parsed_args.rate):
+                counts[signal_id] += len(values)
+                latest[signal_id] = values[-1]
+
+                now = time.monotonic()
+                if now - last_report >= 1.0:
+                    print("  ".join(f"{signal_id}: {counts[signal_id]} ({latest[signal_id]:.3f})"
+                                    for signal_id in sorted(counts)))
+                    counts.clear()
+                    last_report = now
+
+    except grpc.FutureTimeoutError:
+        print(f"!!! ERROR: Connection timed out. Is the plot server running at {parsed_args.address}? !!!")
+        sys.exit(1)
+    except grpc.RpcError as e:
+        print(f"!!! gRPC ERROR: {e.details()} ({e.code()}) !!!")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
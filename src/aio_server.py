@@ -0,0 +1,199 @@
+import asyncio
+import threading
+
+import grpc
+
+from src.proto_gen import plot_pb2, plot_pb2_grpc
+from google.protobuf import empty_pb2
+
+from .plot_servicer import add_to_server
+
+# --- asyncio gRPC serving mode ---
+# The threaded server holds one worker thread per open stream, so with
+# N workers the (N+1)th client waits. grpc.aio serves every RPC as a
+# coroutine on a single event loop, run here in its own thread, so
+# hundreds of concurrent streams cost no threads.
+#
+# AioPlotServicer adapts the regular PlotServicer: requests go to the
+# same ingest queue and reach the GUI the same way. The configuration
+# requests are the servicer's own; only aborting an invalid one (which
+# is a coroutine here) is done differently.
+class AioPlotServicer(plot_pb2_grpc.PlotServiceServicer):
+
+    # How long a stream waits before retrying when the 'block' policy
+    # has no room (the event loop must never block)
+    BLOCK_POLL_INTERVAL = 0.005
+
+    def __init__(self, servicer):
+        self.servicer = servicer
+
+    # --- Configuration: never blocks, so the servicer's requests are reused ---
+
+    async def _configure(self, method, request, context):
+        try:
+            method(request, self.servicer.session(context))
+        except ValueError as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        return empty_pb2.Empty()
+
+    async def AddAxis(self, request, context):
+        return await self._configure(self.servicer.add_axis, request, context)
+
+    async def RemoveAxis(self, request, context):
+        return await self._configure(self.servicer.remove_axis, request, context)
+
+    async def AddSignal(self, request, context):
+        return await self._configure(self.servicer.add_signal, request, context)
+
+    async def RemoveSignal(self, request, context):
+        return await self._configure(self.servicer.remove_signal, request, context)
+
+    async def clearAll(self, request, context):
+        return await self._configure(lambda request, session: self.servicer.clear_all(session),
+                                     request, context)
+
+    async def ArmTrigger(self, request, context):
+        return await self._configure(self.servicer.arm_trigger, request, context)
+
+    async def GetStats(self, request, context):
+        return self.servicer.GetStats(request, context)
+
+    async def Snapshot(self, request, context):
+        token, future = self.servicer.request_snapshot(request.name)
+        try:
+            # Shielded: the window may still complete the future
+            result = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)),
+                                            self.servicer.SNAPSHOT_TIMEOUT)
+        except (TimeoutError, OSError, ValueError) as e:
+            await context.abort(*self.servicer.snapshot_failed(token, e))
+        return plot_pb2.SnapshotResponse(**result)
+
+    async def ConfigureDashboard(self, request, context):
+        return await self._configure(self.servicer.configure_dashboard, request, context)
+
+    # --- Streams ---
+
+    async def streamPlot(self, request_iterator, context):
+        """
+        Async version of PlotServicer.streamPlot.
+        This runs on the asyncio server's event loop.
+        """
+        print("[gRPC] Client connected for streaming points...")
+        try:
+            session = self.servicer.session(context)
+        except ValueError as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        stream_id = self.servicer.stats.open_stream(context.peer())
+        try:
+            async for batch in request_iterator:
+                block = self.servicer.decode_points(batch, stream_id, session)
+                if block is not None and not await self._enqueue('samples', [block], context, session.name):
+                    break
+            print("[gRPC] Client finished streaming.")
+
+        except asyncio.CancelledError:
+            print("[gRPC] Client cancelled stream.")
+            raise
+        finally:
+            self.servicer.stats.close_stream(stream_id)
+
+        return empty_pb2.Empty()
+
+    async def streamPlotPacked(self, request_iterator, context):
+        """
+        Async version of PlotServicer.streamPlotPacked.
+        This runs on the asyncio server's event loop.
+        """
+        print("[gRPC] Client connected for packed streaming...")
+        try:
+            session = self.servicer.session(context)
+        except ValueError as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        stream_id = self.servicer.stats.open_stream(context.peer())
+        try:
+            async for request in request_iterator:
+                try:
+                    block = self.servicer.decode_packed(request, stream_id, session)
+                except ValueError as e:
+                    await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+
+                if block is not None and not await self._enqueue('samples', [block], context, session.name):
+                    break
+            print("[gRPC] Client finished packed streaming.")
+
+        except asyncio.CancelledError:
+            print("[gRPC] Client cancelled packed stream.")
+            raise
+        finally:
+            self.servicer.stats.close_stream(stream_id)
+
+        return empty_pb2.Empty()
+
+    async def Subscribe(self, request, context):
+        """
+        Async version of PlotServicer.Subscribe.
+        This runs on the asyncio server's event loop.
+        """
+        print(f"[gRPC] Client subscribed to session '{request.session}' "
+              f"({len(request.signal_ids) or 'all'} signals)")
+        loop = asyncio.get_running_loop()
+        ready = asyncio.Event()
+        try:
+            subscriber = self.servicer.fanout.subscribe(
+                request, context.peer(), wakeup=lambda: loop.call_soon_threadsafe(ready.set))
+        except ValueError as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        try:
+            while True:
+                await ready.wait()
+                ready.clear()
+                for message in subscriber.take(timeout=0):
+                    yield message
+        finally:
+            self.servicer.fanout.unsubscribe(subscriber)
+            print("[gRPC] Subscriber left.")
+
+    async def _enqueue(self, kind, payload, context, session):
+        """
+        Queues an item, yielding to the event loop while the 'block'
+        policy has no room. Returns False if the stream went away.
+        """
+        while not self.servicer.try_enqueue(kind, payload, session):
+            if context.done():
+                return False
+            await asyncio.sleep(self.BLOCK_POLL_INTERVAL)
+        return True
+
+
+def start_aio_server(servicer, address):
+    """
+    Starts a grpc.aio server for `servicer` on its own event loop thread.
+    Returns the bound port once the server is accepting connections.
+    """
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+    result = {}
+
+    async def serve():
+        server = grpc.aio.server()
+        add_to_server(AioPlotServicer(servicer), server)
+        result['port'] = server.add_insecure_port(address)
+        await server.start()
+        started.set()
+        await server.wait_for_termination()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(serve())
+        except Exception as e:
+            result['error'] = e
+            started.set()
+
+    # 'daemon=True' ensures the thread exits when the main app does.
+    threading.Thread(target=run, name="grpc-aio", daemon=True).start()
+    started.wait()
+
+    if 'error' in result:
+        raise result['error']
+    return result['port']
@@ -1,22 +1,30 @@
+import time
+
+# Launch time, for the startup measurements. Wall clock: the ingest
+# process compares its own times to it.
+LAUNCH_TIME = time.time()
+
+import os
 import sys
-import grpc
-import threading
 import argparse  # (NEW) Import argparse
-from concurrent import futures
 
-from PyQt5 import QtWidgets
-import pyqtgraph as pg
+from .ingest_queue import OVERFLOW_POLICIES
 
-# Import the generated gRPC files
-from src.proto_gen import plot_pb2_grpc
+# --- Startup ---
+# The gRPC listener comes up first, before the GUI libraries (Qt
+# widgets, pyqtgraph) are even imported and the window is built:
+# producers launched along with the server can connect right away, and
+# what they send waits in the ingest queue (or the shared ring) until
+# the window is up and drains it. The times from launch to the first
+# accepted connection and to the first frame are printed and reported
+# in GetStats.
 
-# Import our new local classes
-from .main_window import MainWindow
-from .plot_servicer import PlotServicer
 
-# --- PyQtGraph Global Config ---
-pg.setConfigOption('background', 'k')
-pg.setConfigOption('foreground', 'w')
+def report_first_frame(window):
+    """Called once the window is shown and the event loop runs."""
+    window.stats.first_frame_ms = (time.time() - LAUNCH_TIME) * 1e3
+    print(f"[Startup] First frame {window.stats.first_frame_ms:.0f} ms after launch")
+
 
 # --- Main execution ---
 def main():
@@ -29,42 +37,193 @@ def main():
         default=50051,
         help='The gRPC port to listen on (default: 50051)'
     )
+    parser.add_argument(
+        '--fps',
+        type=float,
+        default=30.0,
+        help='Target plot refresh rate in frames per second (default: 30)'
+    )
+    parser.add_argument(
+        '--queue-capacity',
+        type=int,
+        default=256,
+        help='Maximum number of data batches waiting for the GUI, per producer session '
+             '(default: 256)'
+    )
+    parser.add_argument(
+        '--overflow-policy',
+        choices=OVERFLOW_POLICIES,
+        default='drop_oldest',
+        help='What to do with new batches when the ingest queue is full (default: drop_oldest)'
+    )
+    parser.add_argument(
+        '--session-quota',
+        type=float,
+        default=0,
+        help='Points per second accepted from each producer session, the excess is dropped '
+             '(default: 0, no limit)'
+    )
+    parser.add_argument(
+        '--aio',
+        action='store_true',
+        help='Serve with grpc.aio on its own event loop thread instead of a thread pool '
+             '(no limit on concurrent streams)'
+    )
+    parser.add_argument(
+        '--max-workers',
+        type=int,
+        default=10,
+        help='Thread pool size of the default server, i.e. how many streams can be open '
+             'at once (default: 10, ignored with --aio)'
+    )
+    parser.add_argument(
+        '--hud',
+        action='store_true',
+        help='Show the statistics overlay at startup (toggle with F3)'
+    )
+    parser.add_argument(
+        '--record',
+        type=str,
+        default=None,
+        metavar='FILE',
+        help='Record every ingested request to this capture file'
+    )
+    parser.add_argument(
+        '--replay',
+        type=str,
+        default=None,
+        metavar='FILE',
+        help='Replay a capture file through the ingest queue at startup'
+    )
+    parser.add_argument(
+        '--replay-speed',
+        type=float,
+        default=1.0,
+        help='Replay speed factor, 0 for as fast as possible (default: 1)'
+    )
+    parser.add_argument(
+        '--ingest-process',
+        action='store_true',
+        help='Receive and decode requests in a separate process, so that ingest '
+             'and rendering run on different cores'
+    )
+    parser.add_argument(
+        '--shm-size',
+        type=int,
+        default=64,
+        help='Size in MB of the shared memory ring between the ingest process '
+             'and the GUI (default: 64)'
+    )
+    parser.add_argument(
+        '--axes-per-page',
+        type=int,
+        default=0,
+        help='Split the axes into pages of this many plots, shown one at a time with tabs '
+             '(PageUp/PageDown to switch). Default: 0, all axes on one page'
+    )
+    parser.add_argument(
+        '--history-samples',
+        type=int,
+        default=0,
+        help='Keep the history of every signal beyond its live window, for zooming out: '
+             'number of samples per signal held in memory (default: 0, no history)'
+    )
+    parser.add_argument(
+        '--history-dir',
+        type=str,
+        default=None,
+        metavar='DIR',
+        help='Spill the history beyond --history-samples to files in this directory '
+             'instead of dropping it'
+    )
+    parser.add_argument(
+        '--snapshot-dir',
+        type=str,
+        default='.',
+        metavar='DIR',
+        help='Directory where snapshots of the buffers are written (Ctrl+S or the '
+             'Snapshot RPC, default: the current directory)'
+    )
     args = parser.parse_args()
-    port = args.port
+    if args.fps <= 0:
+        parser.error("--fps must be positive")
+    if args.queue_capacity <= 0:
+        parser.error("--queue-capacity must be positive")
+    if args.session_quota < 0:
+        parser.error("--session-quota can't be negative")
+    if args.max_workers <= 0:
+        parser.error("--max-workers must be positive")
+    if args.replay_speed < 0:
+        parser.error("--replay-speed must not be negative")
+    if args.shm_size <= 0:
+        parser.error("--shm-size must be positive")
+    if args.axes_per_page < 0:
+        parser.error("--axes-per-page must not be negative")
+    if args.history_samples < 0:
+        parser.error("--history-samples must not be negative")
+    if args.history_dir and not args.history_samples:
+        parser.error("--history-dir needs --history-samples")
+    if not os.path.isdir(args.snapshot_dir):
+        parser.error(f"--snapshot-dir {args.snapshot_dir} is not a directory")
     
-    # 1. Create the Qt Application
+    args.launch_time = LAUNCH_TIME
+
+    server = None
+    if args.ingest_process:
+        # 1./2. The servicer and the gRPC server run in their own process,
+        #       which feeds the window through shared memory
+        from .ingest_process import IngestProcessClient
+        servicer = IngestProcessClient(args)
+    else:
+        # 1. Create the gRPC servicer (which is also a QObject)
+        from .server import create_servicer, start_serving
+        servicer = create_servicer(args)
+
+        # 2. Create the gRPC server and start it. Requests are queued
+        #    until the window drains them. The threaded server stops
+        #    once garbage collected: it is kept until the shutdown below.
+        server = start_serving(servicer, args)
+
+    # Only now the GUI
+    from PyQt5 import QtWidgets, QtCore
+    import pyqtgraph as pg
+    from .main_window import MainWindow
+    from .history import HistoryStore
+
+    # --- PyQtGraph Global Config ---
+    pg.setConfigOption('background', 'k')
+    pg.setConfigOption('foreground', 'w')
+
+    # 3. Create the Qt Application
     app = QtWidgets.QApplication(sys.argv)
     
-    # 2. Create the main window
-    window = MainWindow()
-    
-    # 3. Create the gRPC servicer (which is also a QObject)
-    servicer = PlotServicer()
-    
-    # 4. Give the servicer to the window so it can connect signals
+    # 4. Create the main window
+    history = HistoryStore(args.history_samples, args.history_dir) if args.history_samples else None
+    window = MainWindow(target_fps=args.fps, show_hud=args.hud, history=history,
+                        axes_per_page=args.axes_per_page, snapshot_dir=args.snapshot_dir)
+
+    # 5. Give the servicer to the window so it can connect signals (and
+    #    drain what was queued meanwhile)
+    if args.ingest_process:
+        servicer.start_polling()
+        app.aboutToQuit.connect(servicer.shutdown)
     window.set_servicer(servicer)
     
-    # 5. Create the gRPC server
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    plot_pb2_grpc.add_PlotServiceServicer_to_server(servicer, server)
-    
-    # (MODIFIED) Use the port from argparse
-    server.add_insecure_port(f'[::]:{port}')
-    
-    # 6. Start the gRPC server in a separate thread.
-    #    'daemon=True' ensures the thread exits when the main app does.
-    server_thread = threading.Thread(target=server.start, daemon=True)
-    server_thread.start()
-    
-    # (MODIFIED) Print the port being used
-    print(f"--- gRPC Plot Server running in background on port {port} ---")
-    
-    # 7. Show the Qt window
+    # 6. Show the Qt window
     window.show()
+    QtCore.QTimer.singleShot(0, lambda: report_first_frame(window))
     
-    # 8. Start the Qt event loop (blocking call in the main thread)
+    # 7. Start the Qt event loop (blocking call in the main thread)
     print("--- Starting Qt GUI ---")
-    sys.exit(app.exec_())
+    exit_code = app.exec_()
+    # No more requests while the capture is closed
+    if server is not None:
+        server.stop(0)
+    if not args.ingest_process and servicer.capture is not None:
+        servicer.capture.close()
+    if history is not None:
+        history.close()
+    sys.exit(exit_code)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,77 @@
+import numpy as np
+
+from src.proto_gen import plot_pb2
+
+from .trigger import validate_trigger
+from .spectrogram import validate_spectrogram
+
+# --- Axis ranges ---
+# The window sets the view range of every plot itself, from the data it
+# has just decimated for drawing, and pyqtgraph's own auto-range is
+# turned off: it would scan every line for its bounds again after each
+# setData.
+#
+# The x range follows the live window. The y range follows the data
+# according to the axis' RangePolicy (see AddAxisRequest in plot.proto).
+
+Policy = plot_pb2.AddAxisRequest
+
+
+def validate_axis_request(request):
+    """
+    Checks the settings of an AddAxisRequest: its y range policy, its
+    trigger and its spectrogram. Raises ValueError if one is invalid.
+    """
+    if request.y_range_policy == Policy.FIXED and not request.y_min < request.y_max:
+        raise ValueError(f"axis {request.axis_id}: a FIXED range needs y_min < y_max, "
+                         f"got [{request.y_min}, {request.y_max}]")
+    validate_trigger(request)
+    validate_spectrogram(request)
+
+
+class AxisRange:
+    """
+    y range of one axis under a RangePolicy. update() is given the
+    bounds of the data on screen and returns the range to show.
+    """
+
+    # HYSTERESIS: headroom added on each side when the range expands, and
+    # how much of the range the data must still use before it shrinks
+    HEADROOM = 0.1
+    SHRINK_BELOW = 0.5
+
+    def __init__(self, request):
+        self.policy = request.y_range_policy
+        # The bounds as requested, and the range shown now (GROW and
+        # HYSTERESIS move it as the data comes)
+        self.requested = (request.y_min, request.y_max)
+        self.range = None
+        if request.y_min < request.y_max:
+            self.range = self.requested
+
+    def same_settings(self, request):
+        return self.policy == request.y_range_policy and (
+            self.policy not in (Policy.FIXED, Policy.GROW) or
+            self.requested == (request.y_min, request.y_max))
+
+    def update(self, lo, hi):
+        if self.policy == Policy.FIXED:
+            return self.range
+        if not (np.isfinite(lo) and np.isfinite(hi)):
+            return self.range
+
+        if self.policy == Policy.GROW:
+            if self.range is not None:
+                lo, hi = min(lo, self.range[0]), max(hi, self.range[1])
+            self.range = (lo, hi)
+
+        elif self.policy == Policy.HYSTERESIS:
+            span = hi - lo
+            if self.range is None or lo < self.range[0] or hi > self.range[1] or (
+                    span < self.SHRINK_BELOW * (self.range[1] - self.range[0])):
+                headroom = self.HEADROOM * span
+                self.range = (lo - headroom, hi + headroom)
+
+        else:
+            self.range = (lo, hi)
+        return self.range
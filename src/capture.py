@@ -0,0 +1,280 @@
+import json
+import mmap
+import struct
+import threading
+import time
+
+import numpy as np
+
+from src.proto_gen import plot_pb2
+
+from .sample_block import SampleBlock
+
+# --- Capture files ---
+# Append-only recording of everything that goes through the ingest
+# queue, to replay a session later through the same path.
+#
+# Layout (little-endian, every part 8-byte aligned):
+#   file header:  MAGIC, header length (uint32), JSON header, padding
+#   records:      RECORD_HEADER, payload, padding
+#   end:          zeros (the file is grown in CHUNK_SIZE steps and
+#                 truncated on close; a reader stops at kind 0)
+#
+# A record's payload is the serialized request for configuration items
+# (so the axis/signal configuration travels with the data), or the
+# SampleBlock columns for 'samples': signal_ids and lengths (int64,
+# one per run) then values and timestamps (float64, one per sample).
+#
+# The file is written and read through mmap: recording is a memcpy of
+# the decoded NumPy arrays into the page cache, and replayed blocks are
+# views of the mapping (no copy until they reach the ring buffers).
+MAGIC = b'MSPCAP\x00\x01'
+CHUNK_SIZE = 64 * 1024 * 1024
+
+# kind, capture time, number of runs, number of samples, payload bytes
+RECORD_HEADER = struct.Struct('<B7xdQQQ')
+
+RECORD_KINDS = {
+    'add_axis': (1, plot_pb2.AddAxisRequest),
+    'remove_axis': (2, plot_pb2.RemoveAxisRequest),
+    'add_signal': (3, plot_pb2.AddSignalRequest),
+    'remove_signal': (4, plot_pb2.RemoveSignalRequest),
+    'clear_all': (5, None),
+    'samples': (6, None),
+    'configure_dashboard': (7, plot_pb2.DashboardSpec),
+    'arm_trigger': (8, plot_pb2.ArmTriggerRequest),
+}
+_KIND_NAMES = {code: (kind, message) for kind, (code, message) in RECORD_KINDS.items()}
+
+
+def _aligned(n):
+    return (n + 7) & ~7
+
+
+# --- Record encoding (also used by the shared memory ring) ---
+
+def item_records(kind, payload):
+    """
+    Splits an ingest queue item into records: yields (code, data) with
+    `data` a SampleBlock or the serialized request.
+    """
+    code, _ = RECORD_KINDS[kind]
+    if kind == 'samples':
+        for block in payload:
+            yield code, block
+    else:
+        yield code, payload.SerializeToString() if payload is not None else b''
+
+
+def record_size(data):
+    """Bytes taken by a record, header and padding included."""
+    if isinstance(data, SampleBlock):
+        nbytes = 16 * (len(data.signal_ids) + data.size)
+    else:
+        nbytes = len(data)
+    return RECORD_HEADER.size + _aligned(nbytes)
+
+
+def write_record(buffer, start, code, capture_time, data):
+    """
+    Writes a record at `start` in a writable buffer (which must have
+    room for it). Returns the offset right after it.
+    """
+    if isinstance(data, SampleBlock):
+        n_runs, n_samples = len(data.signal_ids), data.size
+        nbytes = 16 * (n_runs + n_samples)
+    else:
+        n_runs = n_samples = 0
+        nbytes = len(data)
+
+    offset = start + RECORD_HEADER.size
+    if n_runs:
+        columns = ((data.signal_ids, np.int64, n_runs), (data.lengths, np.int64, n_runs),
+                   (data.values, np.float64, n_samples), (data.timestamps, np.float64, n_samples))
+        for column, dtype, count in columns:
+            np.frombuffer(buffer, dtype=dtype, count=count, offset=offset)[:] = column
+            offset += 8 * count
+    else:
+        buffer[offset:offset + nbytes] = data
+
+    # The header goes in last: a reader never sees a partial record
+    buffer[start:start + RECORD_HEADER.size] = RECORD_HEADER.pack(
+        code, capture_time, n_runs, n_samples, nbytes)
+    return start + RECORD_HEADER.size + _aligned(nbytes)
+
+
+def read_record(buffer, position):
+    """
+    Reads the record at `position`. Returns (kind, payload, capture_time,
+    next position), or None at the end (kind 0). Payloads are as queued:
+    a list with one SampleBlock (views of `buffer`) for 'samples', the
+    request message (or None) otherwise.
+    """
+    code, capture_time, n_runs, n_samples, nbytes = RECORD_HEADER.unpack_from(buffer, position)
+    if code == 0:
+        return None
+    offset = position + RECORD_HEADER.size
+    kind, message = _KIND_NAMES[code]
+
+    if kind == 'samples':
+        signal_ids = np.frombuffer(buffer, np.int64, n_runs, offset)
+        lengths = np.frombuffer(buffer, np.int64, n_runs, offset + 8 * n_runs)
+        offset += 16 * n_runs
+        values = np.frombuffer(buffer, np.float64, n_samples, offset)
+        timestamps = np.frombuffer(buffer, np.float64, n_samples, offset + 8 * n_samples)
+        payload = [SampleBlock(signal_ids, lengths, values, timestamps)]
+    elif message is not None:
+        payload = message.FromString(bytes(buffer[offset:offset + nbytes]))
+    else:
+        payload = None
+
+    return kind, payload, capture_time, position + RECORD_HEADER.size + _aligned(nbytes)
+
+
+class CaptureWriter:
+    """
+    Records ingest queue items to `path`. Thread-safe: called from the
+    gRPC threads as items are queued.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.records = 0
+        self._lock = threading.Lock()
+        self._file = open(path, 'w+b')
+
+        header = json.dumps({'format': 'msensor-remote-plotter capture', 'version': 1,
+                             'created': time.time()}).encode()
+        self._file.write(MAGIC + struct.pack('<I', len(header)) + header)
+        self._position = _aligned(self._file.tell())
+
+        self._size = 0
+        self._map = None
+        self._grow(self._position)
+
+    def write(self, kind, payload, capture_time=None):
+        """
+        Appends one queue item. Items written after close() are ignored.
+        """
+        if capture_time is None:
+            capture_time = time.time()
+
+        for code, data in item_records(kind, payload):
+            with self._lock:
+                if self._map is None:
+                    return
+                end = self._position + record_size(data)
+                if end > self._size:
+                    self._grow(end)
+                self._position = write_record(self._map, self._position, code, capture_time, data)
+                self.records += 1
+
+    def _grow(self, needed):
+        if self._map is not None:
+            self._map.close()
+        self._size = max(needed, self._size + CHUNK_SIZE)
+        self._file.truncate(self._size)
+        self._map = mmap.mmap(self._file.fileno(), self._size)
+
+    def close(self):
+        with self._lock:
+            if self._map is None:
+                return
+            self._map.flush()
+            self._map.close()
+            self._map = None
+            self._file.truncate(self._position)
+            self._file.close()
+        print(f"[Capture] {self.records} records written to {self.path}")
+
+
+class CaptureReader:
+    """
+    Iterates over the records of a capture file. Call close() (or use it
+    as a context manager) when done.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._map[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a capture file")
+        (header_length,) = struct.unpack_from('<I', self._map, len(MAGIC))
+        header_start = len(MAGIC) + 4
+        self.header = json.loads(self._map[header_start:header_start + header_length])
+        self._start = _aligned(header_start + header_length)
+
+    def __iter__(self):
+        """
+        Yields (kind, payload, capture_time) in recording order, with
+        payloads as they are queued: a list with one SampleBlock for
+        'samples', the request message (or None) otherwise.
+        """
+        if self._map is None:
+            raise ValueError(f"{self.path} is closed")
+        position = self._start
+        end = len(self._map)
+        while position + RECORD_HEADER.size <= end:
+            record = read_record(self._map, position)
+            if record is None:
+                break
+            kind, payload, capture_time, position = record
+            yield kind, payload, capture_time
+
+    def close(self):
+        """
+        Unmaps the file. Sample blocks read from it are views of the
+        mapping: while some are still referenced (e.g. queued by a
+        replay), it is only released once they are gone.
+        """
+        if self._map is None:
+            return
+        try:
+            self._map.close()
+        except BufferError:
+            pass
+        self._map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def replay_capture(path, servicer, speed=1.0, stop_event=None):
+    """
+    Pushes a capture back through `servicer`'s ingest queue, keeping the
+    original pacing divided by `speed`. `speed` 0 replays as fast as the
+    GUI drains the queue.
+    This runs in a background thread.
+    """
+    queue = servicer.ingest_queue
+    print(f"[Replay] Replaying {path} at {'max speed' if speed <= 0 else f'{speed:g}x'}...")
+
+    first_capture_time = None
+    start = time.monotonic()
+    records = 0
+    with CaptureReader(path) as reader:
+        for kind, payload, capture_time in reader:
+            if stop_event is not None and stop_event.is_set():
+                break
+
+            if speed > 0:
+                if first_capture_time is None:
+                    first_capture_time = capture_time
+                delay = (capture_time - first_capture_time) / speed - (time.monotonic() - start)
+                if delay > 0:
+                    time.sleep(delay)
+            else:
+                # Don't outrun the GUI: with 'drop_oldest' that would lose data
+                while queue.depth() >= queue.capacity:
+                    time.sleep(0.001)
+
+            servicer.enqueue(kind, payload)
+            records += 1
+
+    print(f"[Replay] {records} records replayed in {time.monotonic() - start:.1f}s")
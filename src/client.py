@@ -0,0 +1,403 @@
+import threading
+import time
+
+import grpc
+import numpy as np
+
+from src.proto_gen import plot_pb2, plot_pb2_grpc
+from src.sample_block import quantization_scale, quantize_values
+from src.sessions import SESSION_METADATA_KEY
+
+# --- Client SDK ---
+# Object-level API for producers, so they don't have to deal with the
+# stubs and the batching themselves:
+#
+#     with Dashboard('localhost:50051') as dashboard:
+#         accel = dashboard.add_axis(1, samples=1000, title="Accelerometer")
+#         acc_x = accel.add_signal(10, name="Accel X", color='r')
+#         dashboard.configure()
+#         while running:
+#             acc_x.push(read_sensor())
+#
+# push() only writes into a preallocated NumPy buffer of the signal. A
+# background thread streams the buffers to the server (streamPlotPacked,
+# raw float32 values and float64 timestamps) every `max_latency`
+# seconds, or sooner when a buffer is `flush_size` samples full. When
+# the server or the link can't keep up, full buffers drop the new
+# samples (counted in Signal.dropped) instead of blocking the producer.
+#
+# For slow links, Dashboard(compression='gzip') compresses the stream,
+# and add_signal(quantize=(min, max)) sends the values as 16-bit codes
+# (see Quantization in plot.proto) instead of float32. Signals with a
+# `sample_period` whose timestamps were all generated send the period
+# instead of one timestamp per sample.
+#
+# Dashboard(session='robot1') makes the dashboard a producer session of
+# its own (see plot.proto): its IDs can't clash with other producers',
+# and configure() only replaces its own axes.
+#
+# Dashboard.subscribe() goes the other way: it receives the live data of
+# signals from the server, e.g. for a logger or a second viewer.
+
+# Stream compression algorithms, by name
+COMPRESSION = {
+    None: grpc.Compression.NoCompression,
+    'gzip': grpc.Compression.Gzip,
+    'deflate': grpc.Compression.Deflate,
+}
+
+# Reconnection backoff of the channel, in ms. gRPC's default starts at
+# 1 s, so a producer launched along with the server (that isn't
+# accepting yet) would connect up to a second late.
+CHANNEL_OPTIONS = [
+    ('grpc.initial_reconnect_backoff_ms', 100),
+    ('grpc.min_reconnect_backoff_ms', 100),
+    ('grpc.max_reconnect_backoff_ms', 1000),
+]
+
+# Seconds before reopening a broken stream, doubled after each failed
+# attempt up to MAX_RETRY_INTERVAL
+RETRY_INTERVAL = 0.1
+MAX_RETRY_INTERVAL = 5.0
+
+# Stream errors worth reopening the stream for. Any other one (e.g.
+# INVALID_ARGUMENT) would fail again: the sending thread stops, and the
+# error is raised by the next push() or close()
+RETRY_CODES = (grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED)
+
+
+def _sample_count(samples):
+    """Number of samples in a packedSamples message."""
+    if samples.raw_values:
+        return len(samples.raw_values) // 4
+    return len(samples.quantized_values) // 2
+
+
+class Signal:
+    """
+    A line of an axis. Create it with Axis.add_signal().
+    """
+
+    def __init__(self, dashboard, request, sample_period=None):
+        self.dashboard = dashboard
+        self.request = request
+        self.signal_id = request.signal_id
+        # If set, samples pushed without timestamps are spaced by it
+        self.sample_period = sample_period
+        # (offset, step) if the values are sent quantized
+        self.scale = None
+        if request.HasField('quantization'):
+            self.scale = quantization_scale(request.quantization)
+
+        capacity = dashboard.buffer_size
+        self._lock = threading.Lock()
+        self._values = np.empty(capacity, dtype=np.float32)
+        self._timestamps = np.empty(capacity, dtype=np.float64)
+        # The buffers being sent while push() fills the others
+        self._spare = (np.empty(capacity, dtype=np.float32), np.empty(capacity, dtype=np.float64))
+        self._count = 0
+        # False once a timestamp of the buffer was given by the producer
+        self._regular = True
+        self._capacity = capacity
+        self._flush_size = dashboard.flush_size
+        self._last_time = None
+
+        self.pushed = 0
+        self.dropped = 0
+
+    def push(self, value, timestamp=None):
+        """
+        Adds one sample (a number) or several (a 1-D array), with their
+        timestamps in seconds. By default the samples are timestamped
+        now, or spaced by `sample_period` after the previous ones.
+        Raises the stream's grpc.RpcError if it failed for good.
+        """
+        if self.dashboard.error is not None:
+            raise self.dashboard.error
+        if isinstance(value, (int, float)) and self.sample_period is None:
+            # Fast path: a single sample
+            with self._lock:
+                n = self._count
+                if n == self._capacity:
+                    self.dropped += 1
+                    return
+                self._values[n] = value
+                self._timestamps[n] = time.time() if timestamp is None else timestamp
+                self._last_time = self._timestamps[n]
+                self._count = n + 1
+                self.pushed += 1
+            if n + 1 >= self._flush_size:
+                self.dashboard._wake.set()
+            return
+
+        values = np.atleast_1d(np.asarray(value, dtype=np.float32))
+        with self._lock:
+            start = self._count
+            n = min(len(values), self._capacity - start)
+            self.dropped += len(values) - n
+            if not n:
+                return
+            timestamps = self._next_timestamps(len(values), timestamp)
+            if timestamp is not None:
+                self._regular = False
+            self._values[start:start + n] = values[:n]
+            self._timestamps[start:start + n] = timestamps[:n]
+            self._last_time = timestamps[n - 1]
+            self._count = start + n
+            self.pushed += n
+        if start + n >= self._flush_size:
+            self.dashboard._wake.set()
+
+    def _next_timestamps(self, n, timestamps):
+        if timestamps is not None:
+            timestamps = np.atleast_1d(np.asarray(timestamps, dtype=np.float64))
+            if len(timestamps) != n:
+                raise ValueError(f"signal {self.signal_id}: {n} values but {len(timestamps)} timestamps")
+            return timestamps
+
+        now = time.time()
+        if self.sample_period is not None:
+            if self._last_time is None:
+                return now - self.sample_period * np.arange(n - 1, -1, -1)
+            return self._last_time + self.sample_period * np.arange(1, n + 1)
+        if self._last_time is None or self._last_time >= now:
+            return np.full(n, now)
+        # Spread between the previous sample and now
+        return np.linspace(self._last_time, now, n + 1)[1:]
+
+    def _take(self):
+        """
+        Swaps the buffers and returns what was pushed since the last call
+        as a packedSamples message (or None). Called by the sending thread.
+        """
+        with self._lock:
+            n = self._count
+            if not n:
+                return None
+            values, timestamps = self._values, self._timestamps
+            regular = self._regular and self.sample_period is not None
+            self._values, self._timestamps = self._spare
+            self._count = 0
+            self._regular = True
+        # Copied out here, so the buffers can be handed back next time
+        self._spare = (values, timestamps)
+
+        samples = plot_pb2.packedSamples(signal_id=self.signal_id)
+        if self.scale is not None:
+            samples.quantized_values = quantize_values(values[:n], *self.scale)
+        else:
+            samples.raw_values = values[:n].tobytes()
+        if regular:
+            samples.start_time = timestamps[0]
+            samples.sample_period = self.sample_period
+        else:
+            samples.raw_timestamps = timestamps[:n].tobytes()
+        return samples
+
+
+class Axis:
+    """
+    A plot of the dashboard. Create it with Dashboard.add_axis().
+    """
+
+    def __init__(self, dashboard, request):
+        self.dashboard = dashboard
+        self.request = request
+        self.axis_id = request.axis_id
+
+    def add_signal(self, signal_id, name="", color=None, sample_period=None, derived=None,
+                   quantize=None):
+        """
+        Declares a signal of this axis (sent by Dashboard.configure()).
+        `derived` is an optional plot_pb2.DerivedSignal: the server then
+        computes the signal, and nothing should be pushed to it.
+        `quantize` is an optional (min, max) range: values are then sent
+        as 16-bit codes, clamped to it.
+        """
+        request = plot_pb2.AddSignalRequest(axis_id=self.axis_id, signal_id=signal_id, signal_name=name)
+        if color is not None:
+            request.signal_color = color
+        if derived is not None:
+            request.derived.CopyFrom(derived)
+        if quantize is not None:
+            request.quantization.min, request.quantization.max = quantize
+        return self.dashboard._add_signal(Signal(self.dashboard, request, sample_period))
+
+
+class Dashboard:
+    """
+    Connection to a plot server, and the axes and signals declared on it.
+    """
+
+    def __init__(self, address, buffer_size=65536, flush_size=None, max_latency=0.02,
+                 connect_timeout=5.0, compression=None, session=None):
+        # Samples each signal can hold between two sends
+        self.buffer_size = int(buffer_size)
+        # A buffer this full is sent without waiting for max_latency
+        self.flush_size = int(flush_size) if flush_size else self.buffer_size // 4
+        self.max_latency = max_latency
+
+        self.channel = grpc.insecure_channel(address, options=CHANNEL_OPTIONS,
+                                             compression=COMPRESSION[compression])
+        grpc.channel_ready_future(self.channel).result(timeout=connect_timeout)
+        self.stub = plot_pb2_grpc.PlotServiceStub(self.channel)
+        # Sent with every call
+        self.metadata = ((SESSION_METADATA_KEY, session),) if session else ()
+
+        self.axes = {}
+        self.signals = {}
+        # Read by the sending thread: replaced, never modified in place
+        self._signal_list = ()
+
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = None
+        self.requests_sent = 0
+        # Samples of the requests being sent when the stream broke
+        self.lost = 0
+        self._in_flight = 0
+        # The grpc.RpcError that stopped the sending thread, if any
+        self.error = None
+
+    def add_axis(self, axis_id, samples=1000, title="", x_title="", y_title="",
+                 y_range='auto', y_min=0.0, y_max=0.0, trigger=None, spectrogram=None):
+        """
+        Declares an axis (sent by configure()). `y_range` is one of
+        'auto', 'fixed', 'grow' or 'hysteresis' (see plot.proto).
+        `trigger` is an optional plot_pb2.Trigger, `spectrogram` an
+        optional plot_pb2.Spectrogram.
+        """
+        request = plot_pb2.AddAxisRequest(
+            axis_id=axis_id, number_of_samples=samples, plot_title=title,
+            x_axis_title=x_title, y_axis_title=y_title,
+            y_range_policy=plot_pb2.AddAxisRequest.RangePolicy.Value(y_range.upper()),
+            y_min=y_min, y_max=y_max)
+        if trigger is not None:
+            request.trigger.CopyFrom(trigger)
+        if spectrogram is not None:
+            request.spectrogram.CopyFrom(spectrogram)
+        axis = self.axes[axis_id] = Axis(self, request)
+        return axis
+
+    def _add_signal(self, signal):
+        self.signals[signal.signal_id] = signal
+        self._signal_list = tuple(self.signals.values())
+        return signal
+
+    def signal(self, signal_id):
+        return self.signals[signal_id]
+
+    def configure(self):
+        """
+        Sends the declared axes and signals in one ConfigureDashboard
+        request (replacing whatever the server showed), and starts
+        streaming.
+        """
+        self.stub.ConfigureDashboard(plot_pb2.DashboardSpec(
+            axes=[axis.request for axis in self.axes.values()],
+            signals=[signal.request for signal in self.signals.values()]), metadata=self.metadata)
+        self.start()
+
+    def start(self):
+        """Starts the sending thread (done by configure())."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="plot-client", daemon=True)
+            self._thread.start()
+
+    def close(self):
+        """
+        Sends what is left in the buffers, then closes the connection.
+        Raises the stream's grpc.RpcError if it failed for good.
+        """
+        if self._thread is not None:
+            self._closed = True
+            self._wake.set()
+            self._thread.join()
+        self.channel.close()
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def subscribe(self, signal_ids=(), session='', max_rate=0.0):
+        """
+        Yields (signal_id, timestamps, values) arrays as the server
+        ingests samples of `signal_ids` (default: all the signals) of a
+        producer session, at most `max_rate` samples per second and
+        signal if set. Runs until the connection closes.
+        """
+        responses = self.stub.Subscribe(plot_pb2.SubscribeRequest(
+            session=session, signal_ids=signal_ids, max_rate=max_rate), metadata=self.metadata)
+        for response in responses:
+            for samples in response.signals:
+                yield (samples.signal_id, np.frombuffer(samples.raw_timestamps, dtype='<f8'),
+                       np.frombuffer(samples.raw_values, dtype='<f4'))
+
+    def arm_trigger(self, *axis_ids):
+        """Re-arms the triggers of some axes (default: all of them)."""
+        self.stub.ArmTrigger(plot_pb2.ArmTriggerRequest(axis_ids=axis_ids), metadata=self.metadata)
+
+    def snapshot(self, name=''):
+        """
+        Has the server export its buffers to a .npz file (see Snapshot
+        in plot.proto). Returns the SnapshotResponse.
+        """
+        return self.stub.Snapshot(plot_pb2.SnapshotRequest(name=name), metadata=self.metadata)
+
+    def stats(self):
+        return {
+            'requests_sent': self.requests_sent,
+            'pushed': sum(signal.pushed for signal in self._signal_list),
+            'dropped': sum(signal.dropped for signal in self._signal_list),
+            'lost': self.lost,
+        }
+
+    # --- Sending thread ---
+
+    def _run(self):
+        delay = RETRY_INTERVAL
+        while True:
+            sent = self.requests_sent
+            self._in_flight = 0
+            try:
+                self.stub.streamPlotPacked(self._requests(), metadata=self.metadata)
+                return
+            except grpc.RpcError as e:
+                # The last request taken from the buffers may not have
+                # reached the server
+                self.lost += self._in_flight
+                if e.code() not in RETRY_CODES:
+                    print(f"[Client] Stream failed ({e.code()}): {e.details()}")
+                    self.error = e
+                    return
+                if self._closed:
+                    return
+                # Back to the shortest delay once a stream got requests through
+                if self.requests_sent > sent + 1:
+                    delay = RETRY_INTERVAL
+                print(f"[Client] Stream interrupted ({e.code()}), reconnecting in {delay:g}s")
+                time.sleep(delay)
+                delay = min(2 * delay, MAX_RETRY_INTERVAL)
+
+    def _requests(self):
+        """
+        Yields the buffered samples every max_latency seconds, or as soon
+        as a buffer passes flush_size, until close().
+        """
+        while True:
+            self._wake.wait(self.max_latency)
+            self._wake.clear()
+            closing = self._closed
+
+            samples = [packed for packed in (signal._take() for signal in self._signal_list)
+                       if packed is not None]
+            if samples:
+                self.requests_sent += 1
+                self._in_flight = sum(_sample_count(packed) for packed in samples)
+                yield plot_pb2.streamPackedRequest(signals=samples)
+            if closing:
+                return
@@ -0,0 +1,124 @@
+import numpy as np
+
+# --- Min/Max Envelope Decimation ---
+# A plot is only a few hundred to a few thousand pixels wide, so drawing
+# more than ~2 points per pixel column is wasted work. Each column
+# (bucket of consecutive samples) is reduced to its min and max, which
+# keeps every spike visible at any zoom level.
+
+
+def minmax_envelope(x, y, max_points, phase=0):
+    """
+    Reduces (x, y) to at most about `max_points` points.
+    Returns the inputs unchanged if they are already small enough.
+
+    `phase` is the absolute index of y[0] in the stream. Bucket edges are
+    aligned on absolute indices, so the envelope of a scrolling window
+    doesn't shimmer from one frame to the next.
+    """
+    n = len(y)
+    if n <= max_points or max_points < 2:
+        return x, y
+
+    # Two output points (min and max) per bucket
+    bucket = int(np.ceil(2 * n / max_points))
+
+    # First full bucket starts on an absolute multiple of `bucket`;
+    # the samples before it (if any) form a shorter leading bucket
+    first = (-phase) % bucket
+    starts = np.arange(first, n, bucket)
+    if first:
+        starts = np.concatenate(([0], starts))
+
+    mins = np.minimum.reduceat(y, starts)
+    maxs = np.maximum.reduceat(y, starts)
+
+    x_out = np.repeat(x[starts], 2)
+    y_out = np.empty(2 * len(starts), dtype=y.dtype)
+    y_out[0::2] = mins
+    y_out[1::2] = maxs
+    return x_out, y_out
+
+
+def visible_slice(x, x_range, margin=1):
+    """
+    Returns the slice of the sorted array `x` that falls inside
+    `x_range` = (x_min, x_max), widened by `margin` samples per side so
+    lines still reach the edges of the view.
+    """
+    lo = np.searchsorted(x, x_range[0], side='left') - margin
+    hi = np.searchsorted(x, x_range[1], side='right') + margin
+    return slice(max(lo, 0), min(hi, len(x)))
+
+
+class IncrementalEnvelope:
+    """
+    minmax_envelope() of a full, scrolling window, kept up to date as
+    samples enter and leave it: the buckets already summarized are
+    reused, so an update costs the new samples plus the number of
+    buckets, not the size of the window.
+
+    Gives the same result as minmax_envelope(t, y, max_points, phase)
+    with `phase` = written - len(y).
+    """
+
+    def __init__(self):
+        self.bucket = None
+
+    def update(self, t, y, written, max_points):
+        """
+        `t` and `y` are the window (oldest first), `written` the absolute
+        index just after its newest sample.
+        """
+        n = len(y)
+        if n <= max_points or max_points < 2:
+            return t, y
+        bucket = int(np.ceil(2 * n / max_points))
+        start = written - n
+
+        # Absolute index of the first bucket fully in the window, and
+        # the end of the last complete bucket
+        first_full = -(-start // bucket) * bucket
+        end_full = (written // bucket) * bucket
+
+        if bucket != self.bucket or self.next < first_full or self.next > end_full:
+            # New width or window size, or too far behind: start over
+            self.bucket = bucket
+            self.next = first_full
+            self.x = np.zeros(0, dtype=t.dtype)
+            self.mins = self.maxs = np.zeros(0, dtype=y.dtype)
+            self.first = first_full
+
+        # 1. Drop the buckets that left the window
+        dropped = (first_full - self.first) // bucket
+        if dropped > 0:
+            self.x, self.mins, self.maxs = self.x[dropped:], self.mins[dropped:], self.maxs[dropped:]
+            self.first = first_full
+
+        # 2. Summarize the buckets completed since the last update
+        if end_full > self.next:
+            new = slice(self.next - start, end_full - start)
+            values = y[new].reshape(-1, bucket)
+            self.x = np.concatenate((self.x, t[new][::bucket]))
+            self.mins = np.concatenate((self.mins, values.min(axis=1)))
+            self.maxs = np.concatenate((self.maxs, values.max(axis=1)))
+            self.next = end_full
+
+        # 3. The partial buckets at both ends are taken as they are
+        x, mins, maxs = [self.x], [self.mins], [self.maxs]
+        if first_full > start:
+            lead = y[:first_full - start]
+            x.insert(0, t[:1])
+            mins.insert(0, [lead.min()])
+            maxs.insert(0, [lead.max()])
+        if written > end_full:
+            trail = y[end_full - start:]
+            x.append(t[end_full - start:end_full - start + 1])
+            mins.append([trail.min()])
+            maxs.append([trail.max()])
+
+        x_out = np.repeat(np.concatenate(x), 2)
+        y_out = np.empty(len(x_out), dtype=y.dtype)
+        y_out[0::2] = np.concatenate(mins)
+        y_out[1::2] = np.concatenate(maxs)
+        return x_out, y_out
@@ -0,0 +1,245 @@
+import threading
+
+import numpy as np
+
+from src.proto_gen import plot_pb2
+
+from .sample_block import SampleBlock
+
+# --- Derived Signals ---
+# Signals computed by the server from the samples of another (streamed)
+# signal, declared with the `derived` field of AddSignalRequest.
+#
+# Every transform is applied to the source's samples of a whole block at
+# once, carrying the little state it needs (last output, last samples)
+# from one block to the next. The results are appended to the block as
+# runs of the derived signals, so they reach the GUI through the same
+# queue, buffers and render path as streamed samples.
+#
+# This runs in the gRPC threads, as blocks are decoded. Derived signals
+# are only computed from the block's own runs, so the source of a
+# derived signal can't be a derived signal itself.
+
+
+class EmaTransform:
+    """
+    Exponential moving average: y[n] = alpha * x[n] + (1 - alpha) * y[n-1]
+    Non-finite inputs are skipped: they would stay in the average forever.
+    """
+
+    def __init__(self, alpha):
+        self.alpha = alpha
+        self.decay = 1.0 - alpha
+        self.last = None
+        # Samples per chunk, so that decay ** -n can't overflow
+        self.chunk = 65536
+        if 0.0 < self.decay < 1.0:
+            self.chunk = max(1, min(self.chunk, int(600.0 / -np.log(self.decay))))
+
+    def process(self, t, x):
+        if self.decay == 0.0:
+            return t, x.copy()
+        finite = np.isfinite(x)
+        if not finite.all():
+            t, x = t[finite], x[finite]
+            if not len(x):
+                return t, x
+        if self.last is None:
+            self.last = x[0]
+
+        y = np.empty_like(x)
+        for start in range(0, len(x), self.chunk):
+            y[start:start + self.chunk] = self._chunk(x[start:start + self.chunk])
+        return t, y
+
+    def _chunk(self, x):
+        # Closed form of the recursion over the chunk:
+        #   y[i] = w^(i+1) * last + alpha * sum_j<=i w^(i-j) * x[j]
+        n = np.arange(len(x))
+        inverse_powers = self.decay ** -n
+        y = self.decay ** n * (self.decay * self.last + self.alpha * np.cumsum(x * inverse_powers))
+        self.last = y[-1]
+        return y
+
+
+class FirTransform:
+    """Finite impulse response filter: y[n] = sum_k taps[k] * x[n-k]"""
+
+    def __init__(self, taps):
+        self.taps = np.asarray(taps, dtype=np.float64)
+        # The last len(taps) - 1 inputs (zeros before the first sample)
+        self.history = np.zeros(len(self.taps) - 1)
+
+    def process(self, t, x):
+        padded = np.concatenate((self.history, x))
+        if len(self.history):
+            self.history = padded[-len(self.history):]
+        return t, np.convolve(padded, self.taps, mode='valid')
+
+
+class DiffTransform:
+    """Rate of change in units per second: (x[n] - x[n-1]) / (t[n] - t[n-1])"""
+
+    def __init__(self):
+        self.last = None
+
+    def process(self, t, x):
+        if self.last is not None:
+            t = np.concatenate(([self.last[0]], t))
+            x = np.concatenate(([self.last[1]], x))
+        self.last = (t[-1], x[-1])
+
+        dt = np.diff(t)
+        # Samples without a time step (e.g. same reception time) are skipped
+        valid = dt > 0
+        return t[1:][valid], np.diff(x)[valid] / dt[valid]
+
+
+class RmsTransform:
+    """Root mean square over the last `window` samples."""
+
+    def __init__(self, window):
+        self.window = window
+        # Squares of the last window - 1 inputs
+        self.history = np.zeros(0)
+
+    def process(self, t, x):
+        squares = np.concatenate((self.history, x * x))
+        sums = np.cumsum(squares)
+        sums[self.window:] -= sums[:-self.window]
+
+        # Until the window is full, the mean is over the samples seen so far
+        counts = np.minimum(np.arange(1, len(squares) + 1), self.window)
+        y = np.sqrt(np.maximum(sums / counts, 0.0))
+
+        self.history = squares[-(self.window - 1):] if self.window > 1 else np.zeros(0)
+        return t, y[-len(x):]
+
+
+def make_transform(derived):
+    """
+    Creates the transform described by a DerivedSignal message.
+    Raises ValueError if its parameters are invalid.
+    """
+    Transform = plot_pb2.DerivedSignal
+    if derived.transform == Transform.EMA:
+        if not 0.0 < derived.alpha <= 1.0:
+            raise ValueError(f"EMA alpha must be in (0, 1], got {derived.alpha}")
+        return EmaTransform(derived.alpha)
+
+    if derived.transform == Transform.FIR:
+        if not len(derived.taps):
+            raise ValueError("FIR needs at least one tap")
+        return FirTransform(derived.taps)
+
+    if derived.transform == Transform.DIFF:
+        return DiffTransform()
+
+    if derived.transform == Transform.RMS:
+        if derived.window < 1:
+            raise ValueError(f"RMS window must be at least 1 sample, got {derived.window}")
+        return RmsTransform(derived.window)
+
+    raise ValueError(f"Unknown derived signal transform {derived.transform}")
+
+
+class DerivedSignals:
+    """
+    The derived signals declared so far, grouped by source signal.
+    Thread-safe: shared by all the gRPC streams.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            # source_id -> {signal_id: transform}
+            self._by_source = {}
+            # signal_id -> (source_id, serialized DerivedSignal)
+            self._definitions = {}
+
+    def add(self, signal_id, derived):
+        """
+        Registers (or redefines) a derived signal. Raises ValueError if
+        the definition is invalid, or if it would chain derived signals.
+        """
+        if derived.source_signal_id == signal_id:
+            raise ValueError(f"signal {signal_id} can't be derived from itself")
+        transform = make_transform(derived)
+
+        with self._lock:
+            if derived.source_signal_id in self._definitions:
+                raise ValueError("the source of a derived signal can't be a derived signal")
+            if signal_id in self._by_source:
+                raise ValueError("a signal that is the source of derived signals can't be derived")
+            self._remove(signal_id)
+            self._by_source.setdefault(derived.source_signal_id, {})[signal_id] = transform
+            self._definitions[signal_id] = (derived.source_signal_id, derived.SerializeToString())
+
+    def remove(self, signal_id):
+        with self._lock:
+            self._remove(signal_id)
+
+    def configure(self, signals):
+        """
+        Makes the derived signals match a list of AddSignalRequests (see
+        ConfigureDashboard). Unchanged definitions keep their state.
+        """
+        wanted = {signal.signal_id: signal.derived for signal in signals if signal.HasField('derived')}
+        for signal_id in list(self._definitions):
+            definition = wanted.get(signal_id)
+            if definition is None or self._definitions[signal_id][1] != definition.SerializeToString():
+                self.remove(signal_id)
+        for signal_id, derived in wanted.items():
+            if signal_id not in self._definitions:
+                self.add(signal_id, derived)
+
+    def apply(self, block):
+        """
+        Returns `block` with the runs of every derived signal whose
+        source has samples in it appended.
+        """
+        if not self._by_source:
+            return block
+
+        ids, lengths, values, timestamps = [], [], [], []
+        sample_ids = None
+        with self._lock:
+            for source_id, transforms in self._by_source.items():
+                if not np.any(block.signal_ids == source_id):
+                    continue
+                if sample_ids is None:
+                    sample_ids = np.repeat(block.signal_ids, block.lengths)
+                samples = sample_ids == source_id
+                t, x = block.timestamps[samples], block.values[samples]
+
+                for signal_id, transform in transforms.items():
+                    derived_t, derived_y = transform.process(t, x)
+                    if len(derived_y):
+                        ids.append(signal_id)
+                        lengths.append(len(derived_y))
+                        values.append(derived_y)
+                        timestamps.append(derived_t)
+
+        if not ids:
+            return block
+        return SampleBlock(
+            np.concatenate((block.signal_ids, np.array(ids, dtype=np.int64))),
+            np.concatenate((block.lengths, np.array(lengths, dtype=np.int64))),
+            np.concatenate([block.values] + values),
+            np.concatenate([block.timestamps] + timestamps),
+        )
+
+    # --- Internal helpers (called with the lock held) ---
+
+    def _remove(self, signal_id):
+        definition = self._definitions.pop(signal_id, None)
+        if definition is None:
+            return
+        source_id = definition[0]
+        transforms = self._by_source[source_id]
+        del transforms[signal_id]
+        if not transforms:
+            del self._by_source[source_id]
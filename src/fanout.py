@@ -0,0 +1,214 @@
+import threading
+from collections import deque
+
+import numpy as np
+
+from src.proto_gen import plot_pb2
+
+# --- Subscriptions ---
+# The Subscribe RPC streams the live ingested data back out, so viewers
+# and loggers can get it from the plot server instead of each producer
+# opening a stream to each of them.
+#
+# The gRPC streams publish every decoded block (with its derived
+# signals) to the FanOut. For each signal some subscriber wants, the
+# samples are decimated and encoded as a packedSamples message once per
+# requested rate; the message of each subscriber is then only its
+# signals' encoded bytes joined (a serialized streamPackedRequest is
+# its packedSamples fields back to back), and is sent as is.
+#
+# Each subscriber has a bounded queue of messages: a slow viewer loses
+# its oldest messages, and publishing never waits, so it can't stall
+# the ingest or the window.
+
+# Messages waiting per subscriber before the oldest are dropped
+SUBSCRIBER_QUEUE = 256
+
+
+class Subscriber:
+    """
+    One Subscribe call: what it wants and its queue of encoded messages.
+    """
+
+    def __init__(self, session_name, signal_ids, max_rate, peer, wakeup=None):
+        # Producer session whose IDs the subscription uses
+        self.session_name = session_name
+        # Global IDs, or None for all the signals of the session
+        self.signal_ids = signal_ids
+        self.max_rate = max_rate
+        self.peer = peer
+        # Called (from any thread) when messages are queued, for
+        # consumers that don't wait on the condition (asyncio)
+        self.wakeup = wakeup
+
+        self._messages = deque()
+        self._ready = threading.Condition()
+        self.sent = 0
+        self.dropped = 0
+
+    def wants(self, global_id, owner):
+        if self.signal_ids is not None:
+            return global_id in self.signal_ids
+        return owner[0] == self.session_name
+
+    def put(self, message):
+        with self._ready:
+            if len(self._messages) >= SUBSCRIBER_QUEUE:
+                self._messages.popleft()
+                self.dropped += 1
+            self._messages.append(message)
+            self._ready.notify()
+        if self.wakeup is not None:
+            self.wakeup()
+
+    def take(self, timeout=None):
+        """
+        Returns the queued messages (serialized streamPackedRequests),
+        waiting up to `timeout` seconds for some if there are none.
+        """
+        with self._ready:
+            if not self._messages and timeout != 0:
+                self._ready.wait(timeout)
+            messages = list(self._messages)
+            self._messages.clear()
+        self.sent += len(messages)
+        return messages
+
+    def stats(self):
+        return {
+            'peer': self.peer,
+            'session': self.session_name,
+            'signals': len(self.signal_ids) if self.signal_ids is not None else 0,
+            'max_rate': self.max_rate,
+            'messages_sent': self.sent,
+            'messages_dropped': self.dropped,
+            'queued': len(self._messages),
+        }
+
+
+class FanOut:
+    """
+    The open subscriptions. publish() is called by the gRPC streams.
+    """
+
+    def __init__(self, sessions):
+        self.sessions = sessions
+        self._lock = threading.Lock()
+        # Replaced, never modified in place: publish() reads it unlocked
+        self.subscribers = ()
+        # Last decimation bucket sent, per (signal, rate)
+        self._last_bucket = {}
+
+    def subscribe(self, request, peer, wakeup=None):
+        """
+        Opens a subscription for a SubscribeRequest. Raises ValueError if
+        it is invalid.
+        """
+        if request.max_rate < 0:
+            raise ValueError(f"max_rate can't be negative, got {request.max_rate}")
+        # Only looks sessions and IDs up: a subscriber must not create
+        # sessions or use up the global IDs
+        session = self.sessions.sessions.get(request.session)
+        if session is None:
+            raise ValueError(f"no session '{request.session}'")
+        signal_ids = None
+        if len(request.signal_ids):
+            with self.sessions.lock:
+                global_ids = {signal_id: session.lookup_signal_id(signal_id)
+                              for signal_id in request.signal_ids}
+            unknown = sorted(signal_id for signal_id, global_id in global_ids.items() if global_id is None)
+            if unknown:
+                raise ValueError(f"session {session.label} has no signals {unknown}")
+            signal_ids = frozenset(global_ids.values())
+
+        subscriber = Subscriber(request.session, signal_ids, request.max_rate, peer, wakeup)
+        with self._lock:
+            self.subscribers += (subscriber,)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self.subscribers = tuple(s for s in self.subscribers if s is not subscriber)
+            # Nobody else decimates at that rate
+            if all(s.max_rate != subscriber.max_rate for s in self.subscribers):
+                self._last_bucket = {key: bucket for key, bucket in self._last_bucket.items()
+                                     if key[1] != subscriber.max_rate}
+
+    def forget(self, signal_ids):
+        """Drops the decimation state of removed signals (global IDs)."""
+        if not signal_ids:
+            return
+        with self._lock:
+            self._last_bucket = {key: bucket for key, bucket in self._last_bucket.items()
+                                 if key[0] not in signal_ids}
+
+    def publish(self, block):
+        subscribers = self.subscribers
+        if not subscribers or not block.size:
+            return
+
+        # 1. Which subscribers want which of the block's signals
+        owners = {signal_id: self.sessions.owner(signal_id)
+                  for signal_id in np.unique(block.signal_ids).tolist()}
+        wanted = [[signal_id for signal_id, owner in owners.items() if subscriber.wants(signal_id, owner)]
+                  for subscriber in subscribers]
+        needed = set().union(*wanted)
+        if not needed:
+            return
+
+        # 2. Samples of each needed signal, in order
+        samples = self._group(block, needed)
+
+        # 3. Encode each (signal, rate) once
+        chunks = {}
+        with self._lock:
+            for subscriber, signal_ids in zip(subscribers, wanted):
+                for signal_id in signal_ids:
+                    key = (signal_id, subscriber.max_rate)
+                    if key not in chunks:
+                        chunks[key] = self._encode(signal_id, owners[signal_id][1],
+                                                   *samples[signal_id], subscriber.max_rate)
+
+        # 4. One message per subscriber, from the shared chunks
+        messages = {}
+        for subscriber, signal_ids in zip(subscribers, wanted):
+            parts = tuple(chunks[(signal_id, subscriber.max_rate)] for signal_id in signal_ids)
+            if not any(parts):
+                continue
+            message = messages.get(parts)
+            if message is None:
+                message = messages[parts] = b''.join(parts)
+            subscriber.put(message)
+
+    @staticmethod
+    def _group(block, signal_ids):
+        if len(block.signal_ids) == 1:
+            return {int(block.signal_ids[0]): (block.timestamps, block.values)}
+        sample_ids = np.repeat(block.signal_ids, block.lengths)
+        return {signal_id: (block.timestamps[sample_ids == signal_id], block.values[sample_ids == signal_id])
+                for signal_id in signal_ids}
+
+    def _encode(self, global_id, local_id, t, y, max_rate):
+        """
+        A streamPackedRequest field holding the samples of one signal,
+        keeping the first sample of every 1 / max_rate seconds.
+        Called with the lock held. Returns b'' if nothing is left.
+        """
+        if max_rate > 0:
+            buckets = np.floor(t * max_rate)
+            keep = np.empty(len(t), dtype=bool)
+            keep[0] = buckets[0] > self._last_bucket.get((global_id, max_rate), -np.inf)
+            np.greater(buckets[1:], buckets[:-1], out=keep[1:])
+            if not keep.any():
+                return b''
+            self._last_bucket[(global_id, max_rate)] = buckets[-1]
+            t, y = t[keep], y[keep]
+
+        return plot_pb2.streamPackedRequest(signals=[plot_pb2.packedSamples(
+            signal_id=local_id,
+            raw_values=y.astype('<f4').tobytes(),
+            raw_timestamps=t.astype('<f8', copy=False).tobytes(),
+        )]).SerializeToString()
+
+    def stats(self):
+        return [subscriber.stats() for subscriber in self.subscribers]
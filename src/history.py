@@ -0,0 +1,354 @@
+import bisect
+import os
+import queue
+import shutil
+import tempfile
+import threading
+
+import numpy as np
+
+# --- History Store ---
+# Keeps the samples of every signal beyond the live window (the axis'
+# `number_of_samples`), so the user can zoom out or pan back in time.
+#
+# Each signal has a pyramid of levels. Level 0 holds the raw samples
+# (t, y); level k holds one bucket (t of its first sample, min, max,
+# mean) per FACTOR rows of level k - 1, i.e. per FACTOR ** k samples.
+# Buckets are cut by sample count, not by time, so they are computed
+# once, vectorized, as samples arrive.
+#
+# Every level is a list of fixed-size chunks (the one being filled
+# starts small and grows, so idle signals cost little). Only the newest
+# `memory_chunks` sealed chunks of a level stay in memory: older ones
+# are spilled to .npy files and memory-mapped back (if a directory was
+# given), or dropped. Spill files are written by a background thread, so
+# the GUI thread never waits on the disk: the chunk stays in memory
+# until its file is written, then the memory map takes its place.
+#
+# A fetch picks the finest level with at most `max_points` rows in the
+# requested time range, so its cost depends on the plot width, not on
+# how much history there is.
+
+# Rows per chunk, at every level
+CHUNK_SIZE = 65536
+# Initial capacity of the chunk being filled
+INITIAL_ROWS = 1024
+# Rows of level k - 1 per bucket of level k
+FACTOR = 16
+# Levels above the raw samples (the coarsest bucket is FACTOR ** LEVELS samples)
+LEVELS = 6
+
+# Columns of the levels
+RAW_COLUMNS = 2        # t, y
+BUCKET_COLUMNS = 4     # t, min, max, mean
+T, Y = 0, 1
+MIN, MAX, MEAN = 1, 2, 3
+
+
+class _Level:
+    """
+    One level of a signal's pyramid: rows of `columns` float64 values,
+    sorted by time (column 0), in chunks of CHUNK_SIZE.
+    """
+
+    def __init__(self, columns, store, name):
+        self.columns = columns
+        self.store = store
+        self.name = name
+        # The last chunk is the one being filled
+        self.chunks = []
+        # Time of the first row of each chunk
+        self.starts = []
+        # Global index of the first row of chunks[0] (rows before were dropped)
+        self.first = 0
+        # Global index after the last row
+        self.size = 0
+        # Index in `chunks` of the first chunk not spilled (or being spilled)
+        self.memory_start = 0
+        # Spill files written so far (guarded by the store's lock)
+        self.files = []
+        # Set when the signal is removed: spills still in flight delete
+        # their file instead
+        self.removed = False
+
+    def first_time(self):
+        return self.starts[0] if self.starts else None
+
+    def append(self, rows):
+        """Appends rows (shape (columns, n)), sealing chunks as they fill up."""
+        n = rows.shape[1]
+        done = 0
+        while done < n:
+            filled = (self.size - self.first) % CHUNK_SIZE
+            count = min(n - done, CHUNK_SIZE - filled)
+            if not filled:
+                self.chunks.append(np.empty((self.columns, max(INITIAL_ROWS, count))))
+                self.starts.append(float(rows[T, done]))
+            elif filled + count > self.chunks[-1].shape[1]:
+                grown = np.empty((self.columns, min(CHUNK_SIZE, max(2 * self.chunks[-1].shape[1], filled + count))))
+                grown[:, :filled] = self.chunks[-1][:, :filled]
+                self.chunks[-1] = grown
+            self.chunks[-1][:, filled:filled + count] = rows[:, done:done + count]
+            self.size += count
+            done += count
+            if filled + count == CHUNK_SIZE:
+                self._seal()
+
+    def _seal(self):
+        """Enforces the memory limit once the last chunk is full."""
+        sealed_in_memory = len(self.chunks) - self.memory_start
+        if sealed_in_memory <= self.store.memory_chunks:
+            return
+        index = self.memory_start
+        if self.store.directory is not None:
+            path = os.path.join(self.store.directory, f"{self.name}_{index}.npy")
+            self.store.spill(self, index, path)
+            self.memory_start += 1
+        else:
+            del self.chunks[0], self.starts[0]
+            self.first += CHUNK_SIZE
+
+    def rows(self, a, b):
+        """Rows [a, b) (global indices, clamped to what is kept)."""
+        a, b = max(a, self.first), min(b, self.size)
+        if a >= b:
+            return np.zeros((self.columns, 0))
+        first_chunk = (a - self.first) // CHUNK_SIZE
+        last_chunk = (b - 1 - self.first) // CHUNK_SIZE
+        parts = []
+        for index in range(first_chunk, last_chunk + 1):
+            base = self.first + index * CHUNK_SIZE
+            parts.append(self.chunks[index][:, max(a - base, 0):min(b - base, CHUNK_SIZE)])
+        return parts[0] if len(parts) == 1 else np.concatenate(parts, axis=1)
+
+    def search(self, t, side='left'):
+        """Global index where time `t` would be inserted."""
+        index = bisect.bisect_right(self.starts, t) - 1
+        if index < 0:
+            return self.first
+        base = self.first + index * CHUNK_SIZE
+        filled = min(self.size - base, CHUNK_SIZE)
+        return base + int(np.searchsorted(self.chunks[index][T, :filled], t, side=side))
+
+
+class SignalHistory:
+    """
+    The history of one signal: raw samples and their min/max/mean pyramid.
+    """
+
+    def __init__(self, store, name):
+        self.levels = [_Level(RAW_COLUMNS, store, f"{name}_raw")]
+        self.levels += [_Level(BUCKET_COLUMNS, store, f"{name}_l{k}") for k in range(1, LEVELS + 1)]
+
+    def append(self, t, y):
+        # In pieces of at most a chunk, so that no row is spilled or
+        # dropped before the next level has taken it into account
+        for start in range(0, len(t), CHUNK_SIZE):
+            piece = slice(start, start + CHUNK_SIZE)
+            self.levels[0].append(np.vstack((t[piece], y[piece])))
+            self._update_pyramid()
+
+    def _update_pyramid(self):
+        for k in range(1, len(self.levels)):
+            source, level = self.levels[k - 1], self.levels[k]
+            complete = source.size // FACTOR
+            if complete == level.size:
+                break
+            rows = source.rows(level.size * FACTOR, complete * FACTOR).reshape(source.columns, -1, FACTOR)
+            buckets = np.empty((BUCKET_COLUMNS, rows.shape[1]))
+            buckets[T] = rows[T, :, 0]
+            if k == 1:
+                buckets[MIN] = rows[Y].min(axis=1)
+                buckets[MAX] = rows[Y].max(axis=1)
+                buckets[MEAN] = rows[Y].mean(axis=1)
+            else:
+                buckets[MIN] = rows[MIN].min(axis=1)
+                buckets[MAX] = rows[MAX].max(axis=1)
+                buckets[MEAN] = rows[MEAN].mean(axis=1)
+            level.append(buckets)
+
+    def time_range(self):
+        """(first, last) time kept, or None if empty."""
+        raw = self.levels[0]
+        if raw.size == raw.first:
+            return None
+        first = min(level.first_time() for level in self.levels if level.starts)
+        return first, float(raw.rows(raw.size - 1, raw.size)[T, 0])
+
+    def fetch(self, t0, t1, max_points):
+        """
+        Returns (t, min, max, mean) arrays covering [t0, t1] with at most
+        about `max_points` rows, from the finest level with at most
+        FACTOR * max_points rows in the range (whose rows are then merged
+        in groups). Raw samples have min == max == mean.
+        """
+        # 1. Finest level that still holds t0 (finer ones may have dropped it)
+        k = 0
+        while k + 1 < len(self.levels) and self.levels[k + 1].size and (
+                not self.levels[k].size or self.levels[k].first_time() > t0):
+            k += 1
+
+        # 2. Coarser levels until the range fits. Bucket j of level k + 1
+        #    covers rows [j * FACTOR, (j + 1) * FACTOR) of level k.
+        level = self.levels[k]
+        a = max(level.search(t0) - 1, level.first)
+        b = min(level.search(t1, side='right') + 1, level.size)
+        while b - a > FACTOR * max_points and k + 1 < len(self.levels) and self.levels[k + 1].size:
+            k += 1
+            a, b = a // FACTOR, -(-b // FACTOR)
+        a = max(a, self.levels[k].first)
+        parts = [self._merge(self._as_buckets(k, self.levels[k].rows(a, b)), a, max_points)]
+
+        # 3. The newest rows of the finer levels are not in a (complete)
+        #    bucket of level k yet: add them, at most FACTOR per level
+        for fine in range(k - 1, -1, -1):
+            rows = self.levels[fine].rows(self.levels[fine + 1].size * FACTOR, self.levels[fine].size)
+            rows = rows[:, rows[T] <= t1]
+            parts.append(self._as_buckets(fine, rows))
+
+        buckets = np.concatenate(parts, axis=1)
+        return buckets[T], buckets[MIN], buckets[MAX], buckets[MEAN]
+
+    @staticmethod
+    def _as_buckets(k, rows):
+        if k:
+            return rows
+        return rows[[T, Y, Y, Y]]
+
+    @staticmethod
+    def _merge(buckets, phase, max_points):
+        """
+        Merges consecutive buckets so that at most about `max_points` are
+        left. Groups are aligned on absolute row indices (`phase` is the
+        index of the first row), so they don't shimmer while scrolling.
+        """
+        n = buckets.shape[1]
+        if n <= max_points:
+            return buckets
+        group = -(-n // max_points)
+        first = (-phase) % group
+        starts = np.arange(first, n, group)
+        if first:
+            starts = np.concatenate(([0], starts))
+
+        merged = np.empty((BUCKET_COLUMNS, len(starts)))
+        merged[T] = buckets[T, starts]
+        merged[MIN] = np.minimum.reduceat(buckets[MIN], starts)
+        merged[MAX] = np.maximum.reduceat(buckets[MAX], starts)
+        merged[MEAN] = np.add.reduceat(buckets[MEAN], starts) / np.diff(np.r_[starts, n])
+        return merged
+
+
+class HistoryStore:
+    """
+    Histories of all the signals, by signal ID. Used by MainWindow, in
+    the GUI thread (the spill writer thread aside).
+    """
+
+    def __init__(self, memory_samples, directory=None):
+        # Sealed chunks kept in memory per level (at least one)
+        self.memory_chunks = max(1, -(-int(memory_samples) // CHUNK_SIZE))
+        # Spill files go to a directory of their own, removed by close()
+        self.directory = None
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self.directory = tempfile.mkdtemp(prefix='history_', dir=directory)
+        self.signals = {}
+        self._generation = 0
+
+        # Spill writer: (level, index, path) to write, and how many are
+        # queued or being written
+        self._lock = threading.Lock()
+        self._spills = queue.SimpleQueue()
+        self._pending = 0
+        self._idle = threading.Condition(self._lock)
+        self._writer = None
+
+    def spill(self, level, index, path):
+        """Queues chunk `index` of `level` to be written to `path`."""
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_spills, name="history", daemon=True)
+            self._writer.start()
+        with self._lock:
+            self._pending += 1
+        self._spills.put((level, index, path))
+
+    def _write_spills(self):
+        # Runs on its own thread
+        while True:
+            level, index, path = self._spills.get()
+            try:
+                np.save(path, level.chunks[index])
+                chunk = np.load(path, mmap_mode='r')
+            except OSError as e:
+                # The chunk stays in memory
+                print(f"[GUI] Error: Could not spill history to {path}: {e}")
+                chunk = None
+            with self._lock:
+                if chunk is not None:
+                    if level.removed:
+                        del chunk
+                        os.remove(path)
+                    else:
+                        # Same rows: readers see either one
+                        level.chunks[index] = chunk
+                        level.files.append(path)
+                self._pending -= 1
+                self._idle.notify_all()
+
+    def flush(self, timeout=None):
+        """Waits until the queued spills are written. Returns False on timeout."""
+        with self._lock:
+            return self._idle.wait_for(lambda: not self._pending, timeout)
+
+    def append_runs(self, signal_ids, lengths, timestamps, values):
+        """
+        Appends runs of samples (as in a SampleBlock). The runs of a
+        signal are appended in order.
+        """
+        if not len(signal_ids):
+            return
+        if len(signal_ids) == 1:
+            self._signal(int(signal_ids[0])).append(timestamps, values)
+            return
+
+        # Group the samples by signal (stable: keeps each signal's order)
+        sample_ids = np.repeat(signal_ids, lengths)
+        order = np.argsort(sample_ids, kind='stable')
+        sorted_ids = sample_ids[order]
+        timestamps, values = timestamps[order], values[order]
+        boundaries = np.flatnonzero(sorted_ids[1:] != sorted_ids[:-1]) + 1
+        starts = np.concatenate(([0], boundaries))
+        ends = np.concatenate((boundaries, [len(sorted_ids)]))
+        for signal_id, start, end in zip(sorted_ids[starts].tolist(), starts, ends):
+            self._signal(signal_id).append(timestamps[start:end], values[start:end])
+
+    def _signal(self, signal_id):
+        history = self.signals.get(signal_id)
+        if history is None:
+            # The generation keeps the file names of a re-added signal apart
+            self._generation += 1
+            history = self.signals[signal_id] = SignalHistory(self, f"s{signal_id}_{self._generation}")
+        return history
+
+    def get(self, signal_id):
+        return self.signals.get(signal_id)
+
+    def remove(self, signal_id):
+        history = self.signals.pop(signal_id, None)
+        if history is not None:
+            with self._lock:
+                for level in history.levels:
+                    level.removed = True
+                    for path in level.files:
+                        os.remove(path)
+
+    def clear(self):
+        for signal_id in list(self.signals):
+            self.remove(signal_id)
+
+    def close(self):
+        self.signals = {}
+        self.flush(timeout=5.0)
+        if self.directory is not None:
+            shutil.rmtree(self.directory, ignore_errors=True)
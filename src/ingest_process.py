@@ -0,0 +1,220 @@
+import time
+import threading
+import multiprocessing
+from multiprocessing import shared_memory
+
+from PyQt5 import QtCore
+
+from .shm_ring import create_ring, SharedRingWriter, SharedRingReader
+
+# --- Ingest process ---
+# With --ingest-process the gRPC server, the protobuf decoding, derived
+# signals and capture run in a separate process with its own GIL. It
+# forwards the ingest queue, in order, to the GUI process through a
+# shared memory ring (see shm_ring.py); the GUI reads the sample blocks
+# in place and only has to copy them into its buffers and render.
+#
+# Statistics are exchanged over a pipe, so that GetStats (served by the
+# ingest process) and the HUD (in the GUI process) both see everything.
+# Snapshot calls are forwarded to the window over the same pipe. Its
+# messages are tuples:
+#   ('stats', snapshot)                     both ways
+#   ('snapshot', token, name)               ingest -> GUI
+#   ('snapshot_finished', token, result)    GUI -> ingest
+#   ('stop',)                               GUI -> ingest
+#
+# On 'stop' (or if the GUI process goes away) the ingest process stops
+# its server and closes the capture file, if recording, before exiting.
+
+# Seconds between two statistics exchanges
+STATS_INTERVAL = 0.5
+# How long the GUI waits for the ingest process to stop by itself
+STOP_TIMEOUT = 5.0
+
+
+class _RemoteStats:
+    """Latest statistics received from the other process."""
+
+    def __init__(self):
+        self.latest = {}
+
+    def snapshot(self):
+        return self.latest
+
+
+def run_ingest_process(shm_name, stats_connection, args):
+    """
+    Entry point of the ingest process.
+    """
+    # Imported here: the GUI process doesn't need any of it
+    from .server import create_servicer, start_serving
+
+    shm = shared_memory.SharedMemory(name=shm_name, track=False)
+    ring = SharedRingWriter(shm)
+
+    servicer = create_servicer(args)
+    gui_stats = _RemoteStats()
+    servicer.gui_stats = gui_stats
+    # Sent to from the gRPC threads too
+    send_lock = threading.Lock()
+
+    def send(*message):
+        with send_lock:
+            stats_connection.send(message)
+
+    # No event loop here to queue the signal to
+    servicer.snapshot_requested.connect(lambda token, name: send('snapshot', token, name),
+                                        type=QtCore.Qt.DirectConnection)
+    server = start_serving(servicer, args)
+    stopping = threading.Event()
+
+    def exchange():
+        last_stats = 0.0
+        while True:
+            try:
+                message = stats_connection.recv() if stats_connection.poll(STATS_INTERVAL) else None
+            except (EOFError, OSError):
+                # The GUI process is gone
+                message = ('stop',)
+            if message is None:
+                pass
+            elif message[0] == 'stop':
+                stopping.set()
+                return
+            elif message[0] == 'stats':
+                gui_stats.latest = message[1]
+            elif message[0] == 'snapshot_finished':
+                servicer.snapshot_finished(*message[1:])
+            now = time.monotonic()
+            if now - last_stats >= STATS_INTERVAL:
+                last_stats = now
+                send('stats', servicer.stats_snapshot())
+
+    threading.Thread(target=exchange, daemon=True).start()
+
+    # Forward the queue to the GUI as items arrive
+    queue = servicer.ingest_queue
+    try:
+        while not stopping.is_set():
+            if not queue.wait(timeout=0.1):
+                continue
+            for kind, payload in queue.drain():
+                # The GUI stops draining the ring on exit
+                if not ring.write(kind, payload, stopping=stopping):
+                    break
+    finally:
+        if server is not None:
+            server.stop(0)
+        if servicer.capture is not None:
+            servicer.capture.close()
+        ring.close()
+        shm.close()
+
+
+class IngestProcessClient(QtCore.QObject):
+    """
+    Stands in for the PlotServicer in the GUI process: starts the ingest
+    process and exposes the shared ring as its `ingest_queue`.
+    """
+
+    ingest_ready_signal = QtCore.pyqtSignal()
+    snapshot_requested = QtCore.pyqtSignal(object, str)
+
+    # How often the GUI looks for new items in the ring
+    POLL_INTERVAL_MS = 5
+
+    def __init__(self, args):
+        super().__init__()
+
+        self.shm = create_ring(args.shm_size * 1024 * 1024)
+        self.ingest_queue = SharedRingReader(self.shm)
+
+        self.gui_stats = None
+        self._remote_stats = {}
+        self._last_stats_exchange = 0.0
+
+        # 'spawn': the GUI process already runs Qt, which must not be forked
+        context = multiprocessing.get_context('spawn')
+        self._connection, child_connection = context.Pipe()
+        # Sent to from the GUI thread and the snapshot writer thread
+        self._send_lock = threading.Lock()
+        self.process = context.Process(
+            target=run_ingest_process, args=(self.shm.name, child_connection, args),
+            name="ingest", daemon=True)
+        self.process.start()
+        print(f"--- Ingest process started (pid {self.process.pid}) ---")
+
+        self.poll_timer = QtCore.QTimer(self)
+        self.poll_timer.timeout.connect(self.poll)
+
+    def start_polling(self):
+        """
+        Starts reading the ring. The process is started first, so that it
+        accepts connections while the GUI is still being built; what it
+        receives meanwhile waits in the ring.
+        """
+        self.poll_timer.start(self.POLL_INTERVAL_MS)
+
+    @QtCore.pyqtSlot()
+    def poll(self):
+        """
+        This function runs in the MAIN GUI THREAD.
+        """
+        if self.ingest_queue.depth():
+            # Connected directly: the window drains the ring and is done
+            # with the items when emit() returns
+            self.ingest_ready_signal.emit()
+            self.ingest_queue.release()
+
+        while self._connection.poll():
+            message = self._connection.recv()
+            if message[0] == 'stats':
+                self._remote_stats = message[1]
+            elif message[0] == 'snapshot':
+                self.snapshot_requested.emit(*message[1:])
+
+        now = time.monotonic()
+        if now - self._last_stats_exchange >= STATS_INTERVAL:
+            self._last_stats_exchange = now
+            if self.gui_stats is not None:
+                self._send('stats', self.gui_stats.snapshot())
+
+            if not self.process.is_alive():
+                print(f"[GUI] Error: The ingest process exited (code {self.process.exitcode})")
+                self.poll_timer.stop()
+
+    def snapshot_finished(self, token, result):
+        """Same as PlotServicer.snapshot_finished(): sent to the ingest process."""
+        self._send('snapshot_finished', token, result)
+
+    def _send(self, *message):
+        with self._send_lock:
+            self._connection.send(message)
+
+    def stats_snapshot(self):
+        snapshot = dict(self._remote_stats)
+        if self.gui_stats is not None:
+            snapshot.update(self.gui_stats.snapshot())
+        return snapshot
+
+    def shutdown(self):
+        self.poll_timer.stop()
+        if self.process.is_alive():
+            # Let it close the capture file; force it only if it hangs
+            try:
+                self._send('stop')
+            except OSError:
+                pass
+            self.process.join(timeout=STOP_TIMEOUT)
+            if self.process.is_alive():
+                print("[GUI] Warning: The ingest process didn't stop, terminating it")
+                self.process.terminate()
+                self.process.join(timeout=2.0)
+        self.ingest_queue.close()
+        self.shm.unlink()
+        try:
+            self.shm.close()
+        except BufferError:
+            # A sample block view is still referenced somewhere; the
+            # mapping goes away with the process
+            pass
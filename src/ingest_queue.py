@@ -0,0 +1,209 @@
+import threading
+import time
+from collections import deque
+
+# --- Ingest Queue ---
+# Ordered hand-off between the gRPC threads (producers) and the GUI
+# thread (single consumer). Items are `(kind, payload)` tuples.
+#
+# Configuration items (axes, signals, clear) are never dropped and do not
+# count towards the capacity. Data items ('samples') are bounded
+# by `capacity` per producer session (see sessions.py); when a session
+# has that many queued, the overflow policy decides what happens to its
+# new data item:
+#   - 'block':       the producing stream waits until the GUI catches up
+#   - 'drop_oldest': the session's oldest queued data item is discarded
+#   - 'merge':       the item is folded into the session's newest queued
+#                    data item, so nothing is lost but the GUI gets
+#                    bigger batches
+# A chatty session therefore only ever drops or delays its own data.
+#
+# drain() hands out the data items of the sessions round-robin (each
+# session's items stay in order, and configuration items are barriers
+# nothing is moved across), optionally only up to a number of items:
+# every session then gets its share of each drain.
+DATA_KINDS = ('samples',)
+OVERFLOW_POLICIES = ('block', 'drop_oldest', 'merge')
+
+
+class IngestQueue:
+
+    def __init__(self, capacity=256, policy='drop_oldest'):
+        if capacity <= 0:
+            raise ValueError(f"Ingest queue capacity must be positive, got {capacity}")
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{policy}'. Expected one of {OVERFLOW_POLICIES}")
+
+        self.capacity = capacity
+        self.policy = policy
+
+        # (kind, payload, session, put time)
+        self._items = deque()
+        self._data_items = 0
+        # Queued data items per session
+        self._session_items = {}
+        self._lock = threading.Lock()
+        self._not_full = threading.Condition(self._lock)
+        self._not_empty = threading.Condition(self._lock)
+
+        # Counters (read through stats())
+        self._enqueued = 0
+        self._dropped = 0
+        self._merged = 0
+        self._max_depth = 0
+        # How long the oldest drained item had waited at the last drain
+        # (seconds)
+        self.last_drain_lag = 0.0
+
+    def put(self, kind, payload, timeout=None, session=''):
+        """
+        Queues an item of a producer session. Returns a tuple
+        (accepted, was_empty): `accepted` is False only when the 'block'
+        policy timed out, and `was_empty` tells the caller to notify the
+        consumer.
+        """
+        with self._lock:
+            if kind in DATA_KINDS and self._session_items.get(session, 0) >= self.capacity:
+                if self.policy == 'block':
+                    if not self._not_full.wait_for(
+                            lambda: self._session_items.get(session, 0) < self.capacity, timeout):
+                        return False, False
+
+                elif self.policy == 'drop_oldest':
+                    self._drop_oldest_data_item(session)
+
+                elif self._merge_into_last(kind, payload, session):
+                    self._merged += 1
+                    return True, False
+                # Otherwise (nothing to merge with) it is queued anyway,
+                # briefly going over capacity
+
+            was_empty = not self._items
+            if was_empty:
+                self._not_empty.notify()
+            self._items.append((kind, payload, session, time.monotonic()))
+            if kind in DATA_KINDS:
+                self._data_items += 1
+                self._session_items[session] = self._session_items.get(session, 0) + 1
+            self._enqueued += 1
+            self._max_depth = max(self._max_depth, len(self._items))
+            return True, was_empty
+
+    def drain(self, max_data_items=None):
+        """
+        Takes the queued items, all of them or until `max_data_items`
+        data items were taken, with the sessions' data items interleaved
+        (see above). Called from the GUI thread.
+        """
+        with self._lock:
+            if not self._items:
+                return deque()
+            self.last_drain_lag = time.monotonic() - self._items[0][3]
+
+            if len(self._session_items) <= 1 and (max_data_items is None or
+                                                  self._data_items <= max_data_items):
+                # A single producer, everything fits: in arrival order
+                items = deque((kind, payload) for kind, payload, _, _ in self._items)
+                self._items = deque()
+                self._data_items = 0
+                self._session_items = {}
+            else:
+                items = self._drain_round_robin(max_data_items)
+            self._not_full.notify_all()
+        return items
+
+    def wait(self, timeout=None):
+        """
+        Waits until the queue has items, for consumers without a Qt event
+        loop. Returns False on timeout.
+        """
+        with self._lock:
+            return self._not_empty.wait_for(lambda: self._items, timeout)
+
+    def depth(self):
+        return len(self._items)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'depth': len(self._items),
+                'capacity': self.capacity,
+                'policy': self.policy,
+                'enqueued': self._enqueued,
+                'dropped': self._dropped,
+                'merged': self._merged,
+                'max_depth': self._max_depth,
+            }
+
+    # --- Internal helpers (called with the lock held) ---
+
+    def _drain_round_robin(self, max_data_items):
+        items = deque()
+        taken = 0
+        while self._items and (max_data_items is None or taken < max_data_items):
+            kind, payload, session, _ = self._items[0]
+            if kind not in DATA_KINDS:
+                self._items.popleft()
+                items.append((kind, payload))
+                continue
+
+            # The data items up to the next configuration item, by session
+            by_session = {}
+            while self._items and self._items[0][0] in DATA_KINDS:
+                entry = self._items.popleft()
+                by_session.setdefault(entry[2], deque()).append(entry)
+
+            # One item of each session in turn
+            while by_session and (max_data_items is None or taken < max_data_items):
+                for session in list(by_session):
+                    entries = by_session[session]
+                    kind, payload, _, _ = entries.popleft()
+                    items.append((kind, payload))
+                    self._count_taken(session)
+                    taken += 1
+                    if not entries:
+                        del by_session[session]
+                    if max_data_items is not None and taken >= max_data_items:
+                        break
+
+            # What is left goes back to the front, in arrival order
+            if by_session:
+                left = sorted((entry for entries in by_session.values() for entry in entries),
+                              key=lambda entry: entry[3])
+                self._items.extendleft(reversed(left))
+        return items
+
+    def _count_taken(self, session):
+        self._data_items -= 1
+        count = self._session_items[session] - 1
+        if count:
+            self._session_items[session] = count
+        else:
+            del self._session_items[session]
+
+    def _drop_oldest_data_item(self, session):
+        for index, (kind, _, item_session, _) in enumerate(self._items):
+            if kind in DATA_KINDS and item_session == session:
+                del self._items[index]
+                self._count_taken(session)
+                self._dropped += 1
+                return
+
+    def _merge_into_last(self, kind, payload, session):
+        """
+        Folds `payload` into the session's newest item if it is of the
+        same kind. Data payloads are lists, applied in order by the
+        consumer, so concatenating them is lossless.
+        Returns False if that item can't absorb it. Configuration items
+        are queued without a session: whichever session sent them, the
+        samples must not be moved across them.
+        """
+        for last_kind, last_payload, item_session, _ in reversed(self._items):
+            if last_kind not in DATA_KINDS:
+                return False
+            if item_session == session:
+                if last_kind != kind:
+                    return False
+                last_payload.extend(payload)
+                return True
+        return False
@@ -1,11 +1,41 @@
+import threading
+import time
+
 import numpy as np
-from PyQt5 import QtWidgets, QtCore
+from PyQt5 import QtWidgets, QtCore, QtGui
 import pyqtgraph as pg
 
+from src.proto_gen import plot_pb2
+
+from .ring_buffer import RingBufferBank
+from .signal_index import SignalIndex
+from .sample_block import concatenate_blocks
+from .decimation import minmax_envelope, visible_slice, IncrementalEnvelope
+from .auto_range import AxisRange
+from .stats import GuiStats
+from .snapshot import Snapshot, snapshot_path
+from .trigger import AxisTrigger, ARMED, TRIGGERED, STOPPED
+from .spectrogram import AxisSpectrogram, SpectrogramWorker
+
+# Channels of the sample bank
+VALUES, TIMESTAMPS = 0, 1
+
 # --- 2. The PyQtGraph Main Window ---
 class MainWindow(QtWidgets.QMainWindow):
 
-    def __init__(self):
+    # Plot width assumed until the view has been laid out
+    DEFAULT_PLOT_WIDTH_PX = 1000
+
+    # Refresh period of the statistics overlay
+    HUD_INTERVAL_MS = 500
+
+    # Data items applied per drain of the ingest queue. The sessions
+    # share them round-robin, and what is left is drained on the next
+    # pass of the event loop, so frames still get rendered in between
+    DRAIN_BUDGET = 64
+
+    def __init__(self, target_fps=30, show_hud=False, history=None, axes_per_page=0,
+                 snapshot_dir='.'):
         super().__init__()
 
         self.setWindowTitle("gRPC Remote Plotter")
@@ -13,33 +43,161 @@ class MainWindow(QtWidgets.QMainWindow):
 
         # Use GraphicsLayoutWidget to dynamically add plots
         self.layoutWidget = pg.GraphicsLayoutWidget()
-        self.setCentralWidget(self.layoutWidget)
+
+        # --- Pages ---
+        # With `axes_per_page`, the axes are split into pages of that
+        # many plots, one page on screen at a time (selected with the tab
+        # bar or PageUp/PageDown). Only the current page's plots are in
+        # the layout.
+        self.axes_per_page = axes_per_page
+        self.axis_order = []
+        self.page = 0
+        if axes_per_page > 0:
+            self.page_tabs = QtWidgets.QTabBar()
+            self.page_tabs.currentChanged.connect(self.show_page)
+            central = QtWidgets.QWidget()
+            central_layout = QtWidgets.QVBoxLayout(central)
+            central_layout.setContentsMargins(0, 0, 0, 0)
+            central_layout.setSpacing(0)
+            central_layout.addWidget(self.page_tabs)
+            central_layout.addWidget(self.layoutWidget)
+            self.setCentralWidget(central)
+            QtWidgets.QShortcut(QtGui.QKeySequence('PgDown'), self, lambda: self.show_page(self.page + 1))
+            QtWidgets.QShortcut(QtGui.QKeySequence('PgUp'), self, lambda: self.show_page(self.page - 1))
+        else:
+            self.page_tabs = None
+            self.setCentralWidget(self.layoutWidget)
 
         self.plots = {}
         
         # Fast lookup map to find which axis a signal belongs to
         self.signal_to_axis_map = {}
+
+        # Dense slot index of all signals, used to apply batches
+        # with vectorized scatters into the sample bank
+        self.signal_index = SignalIndex()
+
+        # Samples of all signals: one row (values, timestamps) per slot
+        self.sample_bank = RingBufferBank(channels=2)
+
+        # Optional HistoryStore: everything received, for zooming out
+        # beyond the live windows
+        self.history = history
+
+        # AxisTrigger of the axes that show triggered frames instead of
+        # scrolling (see trigger.py). Ctrl+T re-arms them all.
+        self.triggers = {}
+
+        # AxisSpectrogram of the axes that show a waterfall instead of
+        # lines (see spectrogram.py), computed on the worker's thread
+        self.spectrograms = {}
+        self.spectrogram_worker = SpectrogramWorker()
         
         # We'll get this from the servicer
         self.servicer = None
 
+        # Simple color rotation for new plots
+        self.pens = [pg.mkPen('r'), pg.mkPen('g'), pg.mkPen('b'), 
+                     pg.mkPen('c'), pg.mkPen('m'), pg.mkPen('y')]
+        self.pen_index = 0
+
+        # --- Render scheduler ---
+        # Ingest only marks axes as dirty. The lines are pushed to
+        # pyqtgraph at most once per frame, at a fixed rate.
+        self.dirty_axes = set()
+        self.target_fps = target_fps
+        self.render_timer = QtCore.QTimer(self)
+        self.render_timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self.render_timer.timeout.connect(self.on_render_frame)
+        self.render_timer.start(max(1, int(round(1000.0 / target_fps))))
+
+        # --- Statistics ---
+        self.stats = GuiStats()
+        self._unknown_signals = set()
+        self._last_unknown_report = 0.0
+
+        # Overlay with the live statistics, toggled with F3
+        self.hud = QtWidgets.QLabel(self.layoutWidget)
+        self.hud.setStyleSheet("QLabel { background-color: rgba(30, 30, 30, 200); color: #0f0; "
+                               "font-family: monospace; font-size: 10pt; padding: 6px; }")
+        self.hud.move(10, 10)
+        self.hud.hide()
+        self.hud_timer = QtCore.QTimer(self)
+        self.hud_timer.timeout.connect(self.update_hud)
+        QtWidgets.QShortcut(QtGui.QKeySequence('F3'), self, self.toggle_hud)
+        if show_hud:
+            self.toggle_hud()
+
+        # --- Snapshots ---
+        # Ctrl+S (or the Snapshot RPC) exports the buffers to a file in
+        # `snapshot_dir` (see snapshot.py)
+        self.snapshot_dir = snapshot_dir
+        QtWidgets.QShortcut(QtGui.QKeySequence('Ctrl+S'), self, lambda: self.on_snapshot_requested(None, ''))
+        QtWidgets.QShortcut(QtGui.QKeySequence('Ctrl+T'), self,
+                            lambda: self.on_arm_trigger(plot_pb2.ArmTriggerRequest()))
+
+    def get_next_pen(self):
+        pen = self.pens[self.pen_index]
+        self.pen_index = (self.pen_index + 1) % len(self.pens)
+        return pen
+
     def set_servicer(self, servicer):
         """
         Connects the servicer's signals to this window's slots.
         """
         self.servicer = servicer
-        # Connect all signals
-        self.servicer.add_axis_signal.connect(self.on_add_axis)
-        self.servicer.remove_axis_signal.connect(self.on_remove_axis)
-        
-        # Connect to the new batch processing slot
-        self.servicer.add_point_signal.connect(self.on_add_point_batch) 
-        
-        self.servicer.add_signal_signal.connect(self.on_add_signal)
-        self.servicer.remove_signal_signal.connect(self.on_remove_signal)
+        self.servicer.gui_stats = self.stats
+
+        # Handlers for each kind of item on the ingest queue
+        self.ingest_handlers = {
+            'add_axis': self.on_add_axis,
+            'remove_axis': self.on_remove_axis,
+            'add_signal': self.on_add_signal,
+            'remove_signal': self.on_remove_signal,
+            'clear_all': lambda _: self.on_clear_all(),
+            'configure_dashboard': self.on_configure_dashboard,
+            'arm_trigger': self.on_arm_trigger,
+            'samples': self.on_add_sample_blocks,
+        }
+
+        # Woken up whenever the ingest queue has new items
+        self.servicer.ingest_ready_signal.connect(self.on_ingest_ready)
+        self.servicer.snapshot_requested.connect(self.on_snapshot_requested)
+
+        # The server may have been accepting before the window existed
+        if self.servicer.ingest_queue.depth():
+            QtCore.QTimer.singleShot(0, self.on_ingest_ready)
 
-        # Connect the clear all signal
-        self.servicer.clear_all_signal.connect(self.on_clear_all)
+    # --- Qt Slot ---
+    @QtCore.pyqtSlot()
+    def on_ingest_ready(self):
+        """
+        This function runs in the MAIN GUI THREAD.
+        It drains up to DRAIN_BUDGET data items from the ingest queue
+        (and the configuration items around them) and applies them in
+        order. If more are waiting, it runs again once the event loop
+        has handled what else is pending.
+        """
+        queue = self.servicer.ingest_queue
+        items = queue.drain(self.DRAIN_BUDGET)
+        if items:
+            self.stats.queue_lag_ms.record(queue.last_drain_lag * 1e3)
+        if queue.depth():
+            QtCore.QTimer.singleShot(0, self.on_ingest_ready)
+
+        # Consecutive sample items are joined and applied at once
+        pending_blocks = []
+        for kind, payload in items:
+            if kind == 'samples':
+                pending_blocks.extend(payload)
+                continue
+            if pending_blocks:
+                self.on_add_sample_blocks(pending_blocks)
+                pending_blocks = []
+            self.ingest_handlers[kind](payload)
+
+        if pending_blocks:
+            self.on_add_sample_blocks(pending_blocks)
 
 
     # --- Qt Slot ---
@@ -56,33 +214,64 @@ class MainWindow(QtWidgets.QMainWindow):
 
         print(f"[GUI] Adding axis: {axis_id} ('{request.plot_title}')")
         
-        # Add a new plot to the layout
-        plot_item = self.layoutWidget.addPlot(row=len(self.plots), col=0)
-        
+        # Create the plot; it goes below the others (on the last page)
+        plot_item = pg.PlotItem()
+
         # Configure the plot
-        # Increased title font size
-        plot_item.setTitle(request.plot_title, color='w', size="16pt") 
-        
-        # Set font size for axis labels
-        label_style = {'color': 'w', 'font-size': '12pt'}
-        plot_item.getAxis('left').setLabel(text=request.y_axis_title, **label_style)
-        plot_item.getAxis('bottom').setLabel(text=request.x_axis_title, **label_style)
+        self._set_axis_titles(plot_item, request)
         
         # Make sure axis text is visible
         plot_item.getAxis('left').setTextPen('w')
         plot_item.getAxis('bottom').setTextPen('w')
         
         plot_item.showGrid(x=True, y=True, alpha=0.3)
-        
+
+        # The window sets the ranges itself (see auto_range.py)
+        plot_item.disableAutoRange()
+
         # Increased legend font size for signal names
         plot_item.addLegend(brush=pg.mkBrush(50, 50, 50, 150), labelStyle={'color': 'w', 'font-size': '10pt'})
 
         # Store the plot info for later
         self.plots[axis_id] = {
             'plot': plot_item,
-            'number_of_samples': int(request.number_of_samples) if request.number_of_samples > 0 else 100,
-            'signals': {} # (NEW) This will hold the lines
+            'number_of_samples': self._axis_samples(request),
+            'time_origin': None, # x = 0, set by the first sample
+            'signals': {}, # (NEW) This will hold the lines
+            # The view follows the live window and the data until the
+            # user zooms or pans (the "A" button brings it back)
+            'follow_x': True,
+            'follow_y': True,
+            'y_range': AxisRange(request),
+            'image': None, # ImageItem of a spectrogram axis
         }
+        self._show_y_range(self.plots[axis_id])
+        self._set_trigger(axis_id, request)
+        self._set_spectrogram(axis_id, request)
+        self.signal_index.add_axis(axis_id)
+        self.axis_order.append(axis_id)
+        self._layout_axes()
+
+        # The decimated lines depend on the view: redo them when the
+        # plot is resized, zoomed or panned
+        view_box = plot_item.getViewBox()
+        view_box.sigResized.connect(lambda *_: self.mark_axis_dirty(axis_id))
+        view_box.sigXRangeChanged.connect(lambda *_: self._on_x_range_changed(axis_id))
+        view_box.sigRangeChangedManually.connect(lambda mask: self._on_manual_range(axis_id, mask))
+        view_box.sigStateChanged.connect(lambda *_: self._on_view_state(axis_id))
+
+    @staticmethod
+    def _axis_samples(request):
+        return int(request.number_of_samples) if request.number_of_samples > 0 else 100
+
+    def _set_axis_titles(self, plot_item, request):
+        # Increased title font size
+        plot_item.setTitle(request.plot_title, color='w', size="16pt") 
+        
+        # Set font size for axis labels
+        label_style = {'color': 'w', 'font-size': '12pt'}
+        plot_item.getAxis('left').setLabel(text=request.y_axis_title, **label_style)
+        plot_item.getAxis('bottom').setLabel(text=request.x_axis_title, **label_style)
 
     # --- Qt Slot ---
     @QtCore.pyqtSlot(object)
@@ -101,11 +290,20 @@ class MainWindow(QtWidgets.QMainWindow):
             # (NEW) Must also remove all signals from the lookup map
             for signal_id in plot_info['signals'].keys():
                 self.signal_to_axis_map.pop(signal_id, None)
+                if self.history is not None:
+                    self.history.remove(signal_id)
+            slots = self.signal_index.axis_slots(axis_id)
+            self.sample_bank.remove_rows(slots.start, slots.stop - slots.start)
+            self.signal_index.remove_axis(axis_id)
+            self.dirty_axes.discard(axis_id)
+            self.triggers.pop(axis_id, None)
+            self.spectrograms.pop(axis_id, None)
                 
             # Clear all lines from the plot
             plot_info['plot'].clear()
             # Remove the plot item from the layout
-            self.layoutWidget.removeItem(plot_info['plot'])
+            self.axis_order.remove(axis_id)
+            self._layout_axes()
         else:
             print(f"[GUI] Warning: Tried to remove non-existent axis {axis_id}")
 
@@ -133,39 +331,54 @@ class MainWindow(QtWidgets.QMainWindow):
              print(f"[GUI] Warning: Signal {signal_id} already in plot, but not in map. (State error)")
              # Continue anyway, overwrite
         
+        # Create the data buffer (a new row in the sample bank)
+        slot = self._add_signal_line(plot_info, request)
+        self.sample_bank.insert_row(slot, plot_info['number_of_samples'])
+
+    def _add_signal_line(self, plot_info, request):
+        """
+        Adds the line of a new signal to its plot and registers it in the
+        signal index. Returns its slot; the caller creates the bank row.
+        """
+        axis_id = request.axis_id
+        signal_id = request.signal_id
+
         # (MODIFIED) Updated print statement
         print(f"[GUI] Adding signal {signal_id} ({request.signal_name}) to axis {axis_id}")
 
         # Get the pen
         # (MODIFIED) Correctly check for optional field 'signal_color'
-        if request.HasField("signal_color") and request.signal_color:
+        color = request.signal_color if request.HasField("signal_color") and request.signal_color else None
+        if color is not None:
             try:
-                pen = pg.mkPen(request.signal_color)
+                pen = pg.mkPen(color)
             except Exception as e:
-                print(f"[GUI] Warning: Invalid color '{request.signal_color}'. Using random. Error: {e}")
-                pen = self.servicer.get_next_pen()
+                print(f"[GUI] Warning: Invalid color '{color}'. Using random. Error: {e}")
+                pen = self.get_next_pen()
         else:
-            pen = self.servicer.get_next_pen()
+            pen = self.get_next_pen()
 
-        # Create data buffer
-        buffer_size = plot_info['number_of_samples']
-        data_buffer = np.zeros(buffer_size)
+        row = len(plot_info['signals'])
+        slot = self.signal_index.add_signal(axis_id, signal_id)
         
         # (MODIFIED) Use the provided signal_name for the legend
         signal_name = request.signal_name if request.signal_name else f"Signal {signal_id}"
 
         # Add the line to the plot
-        plot_line = plot_info['plot'].plot(data_buffer, pen=pen, name=signal_name)
+        plot_line = plot_info['plot'].plot([], [], pen=pen, name=signal_name)
 
         # Store the signal info
         plot_info['signals'][signal_id] = {
             'line': plot_line,
-            'data': data_buffer
+            'row': row,
+            'color': color,
+            'envelope': IncrementalEnvelope(),
         }
         
         # Add to the fast lookup map
         self.signal_to_axis_map[signal_id] = axis_id
-        
+        return slot
+
 
     # --- (NEW) Qt Slot ---
     @QtCore.pyqtSlot(object)
@@ -191,6 +404,16 @@ It removes a single line (signal) from a plot.
         if signal_info:
             print(f"[GUI] Removing signal {signal_id} from axis {axis_id}")
             plot_info['plot'].removeItem(signal_info['line'])
+            if self.history is not None:
+                self.history.remove(signal_id)
+
+            # Drop its row: the signals below it move up by one
+            row = signal_info['row']
+            self.sample_bank.remove_rows(self.signal_index.axis_slots(axis_id).start + row)
+            self.signal_index.remove_signal(axis_id, row)
+            for other_info in plot_info['signals'].values():
+                if other_info['row'] > row:
+                    other_info['row'] -= 1
         else:
             print(f"[GUI] Warning: Signal {signal_id} was in map but not in plot signals dict.")
 
@@ -207,69 +430,678 @@ It removes a single line (signal) from a plot.
         # Iterate over a copy of the values() since we're modifying the dict
         for plot_info in list(self.plots.values()):
             plot_info['plot'].clear()
-            self.layoutWidget.removeItem(plot_info['plot'])
-            
+
         # Reset internal state
         self.plots = {}
+        self.axis_order = []
+        self._layout_axes()
         self.signal_to_axis_map = {}
+        self.signal_index.clear()
+        self.sample_bank.clear()
+        if self.history is not None:
+            self.history.clear()
+        self.dirty_axes = set()
+        self.triggers = {}
+        self.spectrograms = {}
 
 
-    # --- (MODIFIED) Qt Slot ---
+    # --- Qt Slot ---
     @QtCore.pyqtSlot(object)
-    def on_add_point_batch(self, batch): # Renamed from on_add_point
+    def on_configure_dashboard(self, spec):
         """
-This function runs in the MAIN GUI THREAD.
-It processes a BATCH of points.
-Signals that are not in the batch will be scrolled with a '0'.
-"""
-        
-        # 1. Create a dictionary of new values from the batch
-        #    (Assumes batch message has a 'points' field)
-        new_values = {}
-        for point in batch.points:
-            new_values[point.signal_id] = point.value
-
-        # 2. Get sets of signals
-        updated_signals = set(new_values.keys())
-        all_known_signals = set(self.signal_to_axis_map.keys())
-        
-        # 3. Find signals that were *not* updated
-        #    (No need for this set, we just check `if signal_id in updated_signals`)
-        
-        # 4. Check for points sent to unknown signals
-        unknown_signals = updated_signals - all_known_signals
-        for signal_id in unknown_signals:
-            print(f"[GUI] Warning: Received point for unknown signal ID {signal_id}")
-
-        # 5. Process ALL known signals to keep them in sync and scrolling
-        for signal_id in all_known_signals:
-            axis_id = self.signal_to_axis_map.get(signal_id)
-            
-            # This should not happen if map is correct, but good to check
-            if axis_id is None: 
-                continue 
-            
+        This function runs in the MAIN GUI THREAD.
+        It makes the window match a DashboardSpec (see plot.proto) with a
+        single layout pass: existing axes and signals keep their data.
+        """
+        print(f"[GUI] Configuring dashboard: {len(spec.axes)} axes, {len(spec.signals)} signals")
+        axes = {axis.axis_id: axis for axis in spec.axes}
+        signals = {signal.signal_id: signal for signal in spec.signals}
+
+        # Nothing is repainted until the whole dashboard is in place
+        self.layoutWidget.setUpdatesEnabled(False)
+        try:
+            # 1. Remove what is not in the spec. An axis whose size
+            #    changes is recreated, a signal that moves is re-added.
+            for axis_id, plot_info in list(self.plots.items()):
+                axis = axes.get(axis_id)
+                if axis is None or self._axis_samples(axis) != plot_info['number_of_samples']:
+                    self.on_remove_axis(plot_pb2.RemoveAxisRequest(axis_id=axis_id))
+                    continue
+                for signal_id in list(plot_info['signals']):
+                    signal = signals.get(signal_id)
+                    if signal is None or signal.axis_id != axis_id:
+                        self.on_remove_signal(plot_pb2.RemoveSignalRequest(signal_id=signal_id))
+
+            # 2. Add the new axes, retitle the others
+            for axis in spec.axes:
+                plot_info = self.plots.get(axis.axis_id)
+                if plot_info is None:
+                    self.on_add_axis(axis)
+                else:
+                    self._set_axis_titles(plot_info['plot'], axis)
+                    if not plot_info['y_range'].same_settings(axis):
+                        plot_info['y_range'] = AxisRange(axis)
+                        plot_info['follow_y'] = True
+                        self._show_y_range(plot_info)
+                        self.mark_axis_dirty(axis.axis_id)
+                    self._set_trigger(axis.axis_id, axis)
+                    self._set_spectrogram(axis.axis_id, axis)
+
+            # 3. Add the new signals, restyle the others. The bank rows
+            #    of all new signals are created with one reallocation.
+            new_signals = []
+            for signal in spec.signals:
+                plot_info = self.plots[signal.axis_id]
+                signal_info = plot_info['signals'].get(signal.signal_id)
+                if signal_info is None:
+                    self._add_signal_line(plot_info, signal)
+                    new_signals.append(signal)
+                else:
+                    self._update_signal_line(plot_info, signal_info, signal)
+
+            if new_signals:
+                slots = self.signal_index.lookup([signal.signal_id for signal in new_signals])
+                capacities = np.array([self.plots[signal.axis_id]['number_of_samples']
+                                       for signal in new_signals])
+                order = np.argsort(slots)
+                self.sample_bank.insert_rows(slots[order], capacities[order])
+
+            # 4. Put the plots in the order of the spec
+            self._layout_axes([axis.axis_id for axis in spec.axes])
+        finally:
+            self.layoutWidget.setUpdatesEnabled(True)
+
+    def _update_signal_line(self, plot_info, signal_info, request):
+        line = signal_info['line']
+
+        color = request.signal_color if request.HasField("signal_color") and request.signal_color else None
+        if color is not None and color != signal_info['color']:
             try:
-                plot_info = self.plots[axis_id]
-                signal_info = plot_info['signals'][signal_id]
-            except KeyError:
-                print(f"[GUI] Error: State inconsistency. Map has signal {signal_id} but plot {axis_id} does not.")
+                line.setPen(pg.mkPen(color))
+                signal_info['color'] = color
+            except Exception as e:
+                print(f"[GUI] Warning: Invalid color '{color}'. Keeping the current one. Error: {e}")
+
+        signal_name = request.signal_name if request.signal_name else f"Signal {request.signal_id}"
+        if signal_name != line.name():
+            line.opts['name'] = signal_name
+            legend = plot_info['plot'].legend
+            if legend is not None:
+                legend.removeItem(line)
+                legend.addItem(line, signal_name)
+
+    def _layout_axes(self, axis_order=None):
+        """
+        Places the plots of the current page one per row, in `axis_order`
+        (by default the current order), moving only those that are not
+        already in place. The other plots leave the layout.
+        """
+        if axis_order is not None:
+            self.axis_order = list(axis_order)
+        self._update_page_tabs()
+
+        layout = self.layoutWidget.ci
+        plot_items = [self.plots[axis_id]['plot'] for axis_id in self.page_axes()]
+        on_page = set(plot_items)
+        for plot_item in list(layout.items):
+            if plot_item not in on_page:
+                layout.removeItem(plot_item)
+
+        # Keep the plots in place up to the first one that is not
+        in_place = 0
+        while in_place < len(plot_items) and layout.items.get(plot_items[in_place]) == [(in_place, 0)]:
+            in_place += 1
+        for plot_item in plot_items[in_place:]:
+            if plot_item in layout.items:
+                layout.removeItem(plot_item)
+        for row, plot_item in enumerate(plot_items[in_place:], start=in_place):
+            layout.addItem(plot_item, row=row, col=0)
+
+    # --- Pages and visibility ---
+
+    def page_count(self):
+        if self.axes_per_page <= 0:
+            return 1
+        return max(1, -(-len(self.axis_order) // self.axes_per_page))
+
+    def page_axes(self):
+        """The axes of the current page, in layout order."""
+        if self.axes_per_page <= 0:
+            return self.axis_order
+        start = self.page * self.axes_per_page
+        return self.axis_order[start:start + self.axes_per_page]
+
+    @QtCore.pyqtSlot(int)
+    def show_page(self, page):
+        page = min(max(page, 0), self.page_count() - 1)
+        if page != self.page:
+            self.page = page
+            self._layout_axes()
+
+    def _update_page_tabs(self):
+        self.page = min(self.page, self.page_count() - 1)
+        if self.page_tabs is None:
+            return
+        self.page_tabs.blockSignals(True)
+        while self.page_tabs.count() > self.page_count():
+            self.page_tabs.removeTab(self.page_tabs.count() - 1)
+        while self.page_tabs.count() < self.page_count():
+            self.page_tabs.addTab(f"Page {self.page_tabs.count() + 1}")
+        self.page_tabs.setCurrentIndex(self.page)
+        self.page_tabs.blockSignals(False)
+
+    def visible_axes(self):
+        """
+        The axes whose plot is actually on screen: on the current page,
+        not collapsed or outside of the view, and the window not hidden
+        or minimized.
+        """
+        if not self.isVisible() or self.isMinimized():
+            return set()
+        view = self.layoutWidget
+        viewport = view.mapToScene(view.viewport().rect()).boundingRect()
+        visible = set()
+        for axis_id in self.page_axes():
+            rect = self.plots[axis_id]['plot'].sceneBoundingRect()
+            if rect.width() >= 1 and rect.height() >= 1 and rect.intersects(viewport):
+                visible.add(axis_id)
+        return visible
+
+    def on_add_sample_blocks(self, blocks):
+        """
+        This function runs in the MAIN GUI THREAD.
+        It appends the samples of one or more blocks (see SampleBlock)
+        to the signal buffers. Only signals that received samples advance.
+        """
+        start = time.perf_counter()
+        block = concatenate_blocks(blocks)
+        if not block.size:
+            return
+        index = self.signal_index
+
+        # 1. IDs -> slots
+        slots = index.lookup(block.signal_ids)
+        known = slots >= 0
+        signal_ids, lengths, values, timestamps = block.signal_ids, block.lengths, block.values, block.timestamps
+
+        # 2. Check for samples sent to unknown signals
+        if not known.all():
+            self._report_unknown_signals(signal_ids[~known], lengths[~known])
+            known_samples = np.repeat(known, lengths)
+            values, timestamps = values[known_samples], timestamps[known_samples]
+            signal_ids, slots, lengths = signal_ids[known], slots[known], lengths[known]
+
+        # 3. Append all runs with one scatter into the bank
+        self.sample_bank.extend_rows(slots, lengths, np.vstack((values, timestamps)))
+        if self.history is not None:
+            self.history.append_runs(signal_ids, lengths, timestamps, values)
+
+        # 4. Redraw the axes that received samples. Triggered axes are
+        #    only redrawn when they capture a new frame, spectrogram axes
+        #    when new spectra are ready.
+        if self.triggers:
+            self._run_triggers(signal_ids, lengths, values, timestamps)
+        if self.spectrograms:
+            self._feed_spectrograms(signal_ids, lengths, values, timestamps)
+        axis_positions, _ = index.locate(slots)
+        for axis_position in np.unique(axis_positions):
+            axis_id = index.axis_slices[axis_position][0]
+            if axis_id not in self.triggers and axis_id not in self.spectrograms:
+                self.dirty_axes.add(axis_id)
+
+            plot_info = self.plots[axis_id]
+            if plot_info['time_origin'] is None:
+                first = np.argmax(np.repeat(axis_positions, lengths) == axis_position)
+                plot_info['time_origin'] = float(timestamps[first])
+
+        self.stats.points_applied.add(len(values))
+        self.stats.apply_ms.record((time.perf_counter() - start) * 1e3)
+
+    # --- Triggers ---
+
+    def _set_trigger(self, axis_id, request):
+        """Sets up or removes the trigger of an axis, if its settings changed."""
+        settings = request.trigger if request.HasField('trigger') else None
+        if settings is None or settings.mode == plot_pb2.Trigger.OFF:
+            if self.triggers.pop(axis_id, None) is not None:
+                # Back to scrolling
+                self.mark_axis_dirty(axis_id)
+            return
+        trigger = self.triggers.get(axis_id)
+        if trigger is None or not trigger.same_settings(settings):
+            self.triggers[axis_id] = AxisTrigger(settings)
+            self.mark_axis_dirty(axis_id)
+
+    @staticmethod
+    def _source_samples(signal_id, signal_ids, lengths):
+        """
+        Index of the samples of one signal in a block: a slice if they are
+        one run, a mask otherwise. None if it has none.
+        """
+        runs = np.flatnonzero(signal_ids == signal_id)
+        if not len(runs):
+            return None
+        if len(runs) == 1:
+            end = int(lengths[:runs[0] + 1].sum())
+            return slice(end - int(lengths[runs[0]]), end)
+        return np.repeat(signal_ids == signal_id, lengths)
+
+    def _run_triggers(self, signal_ids, lengths, values, timestamps):
+        """
+        Gives the triggers the samples of their source in a block (just
+        written to the bank), and marks the axes with a new frame dirty.
+        """
+        for axis_id, trigger in self.triggers.items():
+            if trigger.state == STOPPED:
                 continue
+            source = self._source_samples(trigger.signal_id, signal_ids, lengths)
+            if source is None:
+                continue
+            if trigger.process(timestamps[source], values[source],
+                               lambda t0, t1: self._capture_frame(axis_id, t0, t1)):
+                self.dirty_axes.add(axis_id)
 
-            # Get the data buffer
-            data = signal_info['data']
-            
-            # Shift data to the left
-            data[:-1] = data[1:] 
-            
-            # Get the new value
-            if signal_id in updated_signals:
-                # Use the new value from the batch
-                data[-1] = new_values[signal_id]
-            else:
-                # Use 0.0 for missing signals to keep them scrolling
-                data[-1] = 0.0
-            
-            # Update the plot line
-            signal_info['line'].setData(data)
+    def _capture_frame(self, axis_id, t0, t1):
+        """Copies of the samples of an axis' signals between two times."""
+        bank = self.sample_bank
+        first_slot = self.signal_index.axis_slots(axis_id).start
+        signals = {}
+        for signal_id, signal_info in self.plots[axis_id]['signals'].items():
+            slot = first_slot + signal_info['row']
+            capacity = int(bank.capacity[slot])
+            count = min(int(bank.written[slot]), capacity)
+            t = bank.row_view(slot, TIMESTAMPS)[capacity - count:]
+            window = visible_slice(t, (t0, t1), margin=0)
+            signals[signal_id] = (t[window].copy(), bank.row_view(slot, VALUES)[capacity - count:][window].copy())
+        return signals
+
+    def _frame_line(self, plot_info, frame, signal_id):
+        """
+        Returns the (x, y) data to draw for one signal of a triggered
+        axis: its part of the frame on display, x in seconds from the
+        event, reduced to a min/max envelope like decimate() does.
+        """
+        if frame is None or signal_id not in frame.signals:
+            return np.zeros(0), np.zeros(0)
+        t, y = frame.signals[signal_id]
+        view_box = plot_info['plot'].getViewBox()
+        if not plot_info['follow_x']:
+            x_min, x_max = view_box.viewRange()[0]
+            window = visible_slice(t, (x_min + frame.trigger_time, x_max + frame.trigger_time))
+            t, y = t[window], y[window]
+        width = int(view_box.width()) or self.DEFAULT_PLOT_WIDTH_PX
+        t, y = minmax_envelope(t, y, 2 * width)
+        return t - frame.trigger_time, y
+
+    # --- Qt Slot ---
+    @QtCore.pyqtSlot(object)
+    def on_arm_trigger(self, request):
+        """
+        This function runs in the MAIN GUI THREAD.
+        It re-arms the triggers of the listed axes (all of them if none).
+        """
+        for axis_id in request.axis_ids or list(self.triggers):
+            trigger = self.triggers.get(axis_id)
+            if trigger is None:
+                print(f"[GUI] Warning: Axis {axis_id} has no trigger to arm")
+                continue
+            trigger.arm()
+            print(f"[GUI] Trigger of axis {axis_id} armed")
+
+    # --- Spectrograms ---
+
+    def _set_spectrogram(self, axis_id, request):
+        """Sets up or removes the spectrogram of an axis, if its settings changed."""
+        plot_info = self.plots[axis_id]
+        settings = request.spectrogram if request.HasField('spectrogram') else None
+        spectrogram = self.spectrograms.get(axis_id)
+        if settings is None:
+            if spectrogram is not None:
+                # Back to lines
+                del self.spectrograms[axis_id]
+                plot_info['plot'].removeItem(plot_info['image'])
+                plot_info['image'] = None
+                self.mark_axis_dirty(axis_id)
+            return
+        if spectrogram is not None and spectrogram.same_settings(settings):
+            return
+
+        spectrogram = self.spectrograms[axis_id] = AxisSpectrogram(settings)
+        if plot_info['image'] is None:
+            plot_info['image'] = pg.ImageItem()
+            plot_info['image'].setColorMap(pg.colormap.get('viridis'))
+            plot_info['plot'].addItem(plot_info['image'])
+        plot_info['image'].clear()
+        for signal_info in plot_info['signals'].values():
+            signal_info['line'].setData([], [])
+
+        # Start from what the source's buffer already holds
+        slot = int(self.signal_index.lookup([spectrogram.signal_id])[0])
+        if slot >= 0:
+            bank = self.sample_bank
+            capacity = int(bank.capacity[slot])
+            count = min(int(bank.written[slot]), capacity)
+            if count:
+                self.spectrogram_worker.submit(spectrogram, bank.row_view(slot, TIMESTAMPS)[capacity - count:].copy(),
+                                               bank.row_view(slot, VALUES)[capacity - count:].copy())
+
+    def _feed_spectrograms(self, signal_ids, lengths, values, timestamps):
+        """Hands the samples of the spectrograms' sources in a block to the worker."""
+        for spectrogram in self.spectrograms.values():
+            source = self._source_samples(spectrogram.signal_id, signal_ids, lengths)
+            if source is not None:
+                # Copies: the block's arrays may be views of the ingest ring
+                self.spectrogram_worker.submit(spectrogram, np.array(timestamps[source]),
+                                               np.array(values[source]))
+
+    def _draw_spectrogram(self, plot_info, spectrogram):
+        """
+        Moves the new spectra into the axis' image, x in seconds since
+        the axis' time origin and y in Hz.
+        """
+        spectrogram.update()
+        times, spectra = spectrogram.image()
+        rate = spectrogram.sample_rate
+        if not len(times) or not np.isfinite(rate):
+            return
+        if plot_info['time_origin'] is None:
+            plot_info['time_origin'] = float(times[0])
+        # One column per spectrum, every `hop` samples
+        step = (times[-1] - times[0]) / (len(times) - 1) if len(times) > 1 else spectrogram.hop / rate
+        x0 = times[0] - plot_info['time_origin'] - step / 2
+        image = plot_info['image']
+        image.setImage(spectra, autoLevels=False, levels=spectrogram.levels(spectra))
+        image.setRect(QtCore.QRectF(x0, 0, step * len(times), rate / 2))
+
+        view_box = plot_info['plot'].getViewBox()
+        if plot_info['follow_x']:
+            view_box.setXRange(x0, x0 + step * len(times), padding=0)
+        if plot_info['follow_y']:
+            view_box.setYRange(0, rate / 2, padding=0)
+
+    def _report_unknown_signals(self, signal_ids, lengths):
+        # Counted every time, printed at most once per second
+        self.stats.unknown_signal_hits += int(lengths.sum())
+        self._unknown_signals.update(signal_ids.tolist())
+
+        now = time.monotonic()
+        if now - self._last_unknown_report >= 1.0:
+            self._last_unknown_report = now
+            print(f"[GUI] Warning: Received samples for unknown signal IDs "
+                  f"{sorted(self._unknown_signals)} ({self.stats.unknown_signal_hits} samples so far)")
+            self._unknown_signals = set()
+
+    def mark_axis_dirty(self, axis_id):
+        if axis_id in self.plots:
+            self.dirty_axes.add(axis_id)
+
+    # --- View ranges ---
+
+    def _on_x_range_changed(self, axis_id):
+        # While following, the lines don't depend on the x range (and
+        # the window is the one changing it)
+        plot_info = self.plots.get(axis_id)
+        if plot_info is not None and not plot_info['follow_x']:
+            self.dirty_axes.add(axis_id)
+
+    def _on_manual_range(self, axis_id, mask):
+        plot_info = self.plots.get(axis_id)
+        if plot_info is None:
+            return
+        if mask[0]:
+            plot_info['follow_x'] = False
+        if mask[1]:
+            plot_info['follow_y'] = False
+        self.dirty_axes.add(axis_id)
+
+    def _on_view_state(self, axis_id):
+        # pyqtgraph's auto-range, turned back on by the "A" button or the
+        # context menu, means "follow the data" again
+        plot_info = self.plots.get(axis_id)
+        if plot_info is None:
+            return
+        view_box = plot_info['plot'].getViewBox()
+        x_auto, y_auto = view_box.autoRangeEnabled()
+        if not (x_auto or y_auto):
+            return
+        if x_auto:
+            plot_info['follow_x'] = True
+        if y_auto:
+            plot_info['follow_y'] = True
+        view_box.disableAutoRange()
+        self.dirty_axes.add(axis_id)
+
+    def _show_y_range(self, plot_info, lo=np.nan, hi=np.nan):
+        """Applies the axis' y range policy to the bounds of the data on screen."""
+        if not plot_info['follow_y']:
+            return
+        y_range = plot_info['y_range'].update(lo, hi)
+        if y_range is not None:
+            padding = 0 if plot_info['y_range'].policy == plot_pb2.AddAxisRequest.FIXED else None
+            plot_info['plot'].getViewBox().setYRange(*y_range, padding=padding)
+
+    def decimate(self, plot_info, slot, signal_id):
+        """
+        Returns the (x, y) data to draw for one signal (bank row `slot`):
+        the visible part of the window reduced to a min/max envelope at
+        the current pixel width of the plot. x is in seconds since the
+        axis' time origin. Views reaching back before the window are
+        drawn from the history, if enabled.
+        """
+        bank = self.sample_bank
+        written = int(bank.written[slot])
+        count = min(written, int(bank.capacity[slot]))
+        if not count:
+            return np.zeros(0), np.zeros(0)
+
+        # Only the samples received so far
+        t = bank.row_view(slot, TIMESTAMPS)[-count:]
+        y = bank.row_view(slot, VALUES)[-count:]
+        origin = plot_info['time_origin']
+        # Absolute index of the oldest sample in the window
+        phase = written - count
+
+        view_box = plot_info['plot'].getViewBox()
+        width = int(view_box.width()) or self.DEFAULT_PLOT_WIDTH_PX
 
+        # A full window that scrolls: only the new samples are decimated
+        if plot_info['follow_x'] and count == bank.capacity[slot]:
+            envelope = plot_info['signals'][signal_id]['envelope']
+            t, y = envelope.update(t, y, written, 2 * width)
+            return t - origin, y
+
+        # Once the user has zoomed or panned, only the visible range is
+        # drawn (at full pixel resolution)
+        if not plot_info['follow_x']:
+            x_min, x_max = view_box.viewRange()[0]
+            if self.history is not None and x_min + origin < t[0]:
+                history = self.history.get(signal_id)
+                if history is not None:
+                    return self._history_envelope(history, x_min + origin, x_max + origin, origin, width)
+            window = visible_slice(t, (x_min + origin, x_max + origin))
+            t, y = t[window], y[window]
+            phase += window.start
+
+        t, y = minmax_envelope(t, y, 2 * width, phase)
+        # Shift to the origin after decimation, on the few points left
+        return t - origin, y
+
+    @staticmethod
+    def _history_envelope(history, t0, t1, origin, width):
+        # One bucket (min and max) per pixel column
+        t, mins, maxs, _ = history.fetch(t0, t1, width)
+        y = np.empty(2 * len(t))
+        y[0::2] = mins
+        y[1::2] = maxs
+        return np.repeat(t - origin, 2), y
+
+    # --- Qt Slot ---
+    @QtCore.pyqtSlot()
+    def on_render_frame(self):
+        """
+        This function runs in the MAIN GUI THREAD, once per frame.
+        It pushes the data of every visible axis that changed since the
+        last frame to its plot lines. Hidden axes stay dirty until they
+        are shown: their buffers keep filling, but nothing is drawn.
+        """
+        for axis_id, spectrogram in self.spectrograms.items():
+            if spectrogram.has_new():
+                self.dirty_axes.add(axis_id)
+        if not self.dirty_axes:
+            return
+
+        start = time.perf_counter()
+        visible_axes = self.visible_axes()
+        dirty_axes = self.dirty_axes & visible_axes
+        if not dirty_axes:
+            return
+        self.dirty_axes -= dirty_axes
+
+        for axis_id in dirty_axes:
+            plot_info = self.plots.get(axis_id)
+            if plot_info is None:
+                continue
+
+            spectrogram = self.spectrograms.get(axis_id)
+            if spectrogram is not None:
+                self._draw_spectrogram(plot_info, spectrogram)
+                continue
+
+            # Update the plot lines with the decimated windows (or the
+            # trigger's frame), and the view with the bounds of what
+            # they draw
+            first_slot = self.signal_index.axis_slots(axis_id).start
+            trigger = self.triggers.get(axis_id)
+            frame = trigger.frame() if trigger is not None else None
+            x_min = y_min = np.inf
+            x_max = y_max = -np.inf
+            for signal_id, signal_info in plot_info['signals'].items():
+                if trigger is not None:
+                    x, y = self._frame_line(plot_info, frame, signal_id)
+                else:
+                    x, y = self.decimate(plot_info, first_slot + signal_info['row'], signal_id)
+                signal_info['line'].setData(x, y)
+                if len(x):
+                    x_min, x_max = min(x_min, x[0]), max(x_max, x[-1])
+                    # fmin/fmax skip NaN samples
+                    y_min, y_max = min(y_min, np.fmin.reduce(y)), max(y_max, np.fmax.reduce(y))
+
+            if plot_info['follow_x'] and trigger is not None:
+                plot_info['plot'].getViewBox().setXRange(-trigger.pre, trigger.post, padding=0)
+            elif plot_info['follow_x'] and x_min <= x_max:
+                plot_info['plot'].getViewBox().setXRange(x_min, x_max, padding=0)
+            self._show_y_range(plot_info, y_min, y_max)
+
+        self.stats.frames.add()
+        self.stats.frame_ms.record((time.perf_counter() - start) * 1e3)
+
+    # --- Snapshots ---
+
+    def take_snapshot(self):
+        """
+        A Snapshot of every signal's buffer as it is now. Only copies the
+        samples: the file is written later, by Snapshot.write().
+        """
+        bank = self.sample_bank
+        axes, signals, columns = [], [], {}
+        for axis_id in self.axis_order:
+            plot_info = self.plots[axis_id]
+            plot_item = plot_info['plot']
+            first_slot = self.signal_index.axis_slots(axis_id).start
+            axes.append({
+                'axis_id': axis_id,
+                'title': plot_item.titleLabel.text,
+                'x_title': plot_item.getAxis('bottom').labelText,
+                'y_title': plot_item.getAxis('left').labelText,
+                'number_of_samples': plot_info['number_of_samples'],
+                'signals': list(plot_info['signals']),
+            })
+            for signal_id, signal_info in plot_info['signals'].items():
+                slot = first_slot + signal_info['row']
+                written = int(bank.written[slot])
+                capacity = int(bank.capacity[slot])
+                count = min(written, capacity)
+                columns[f't_{signal_id}'] = bank.row_view(slot, TIMESTAMPS)[capacity - count:].copy()
+                columns[f'y_{signal_id}'] = bank.row_view(slot, VALUES)[capacity - count:].copy()
+                signals.append({
+                    'signal_id': signal_id,
+                    'axis_id': axis_id,
+                    'name': signal_info['line'].name(),
+                    'color': signal_info['color'],
+                    'samples': count,
+                    'written': written,
+                })
+        return Snapshot(axes, signals, columns)
+
+    # --- Qt Slot ---
+    @QtCore.pyqtSlot(object, str)
+    def on_snapshot_requested(self, token, name):
+        """
+        This function runs in the MAIN GUI THREAD.
+        It takes a snapshot and writes it on a background thread, then
+        hands the result to the servicer for the request `token` (None
+        for the hotkey).
+        """
+        try:
+            path = snapshot_path(self.snapshot_dir, name)
+        except ValueError as e:
+            print(f"[GUI] Error: {e}")
+            if token is not None:
+                self.servicer.snapshot_finished(token, e)
+            return
+        snapshot = self.take_snapshot()
+        threading.Thread(target=self._write_snapshot, args=(snapshot, path, token),
+                         name="snapshot", daemon=True).start()
+
+    def _write_snapshot(self, snapshot, path, token):
+        # Runs on its own thread
+        try:
+            result = snapshot.write(path)
+            print(f"[GUI] Snapshot of {result['signals']} signals ({result['samples']} samples) "
+                  f"written to {result['path']}")
+        except OSError as e:
+            print(f"[GUI] Error: Could not write snapshot {path}: {e}")
+            result = e
+        if token is not None:
+            self.servicer.snapshot_finished(token, result)
+
+    # --- Statistics overlay ---
+
+    def toggle_hud(self):
+        if self.hud.isVisible():
+            self.hud.hide()
+            self.hud_timer.stop()
+        else:
+            self.update_hud()
+            self.hud.show()
+            self.hud.raise_()
+            self.hud_timer.start(self.HUD_INTERVAL_MS)
+
+    @QtCore.pyqtSlot()
+    def update_hud(self):
+        """
+        This function runs in the MAIN GUI THREAD.
+        """
+        if self.servicer is None or self.isMinimized():
+            return
+        s = self.servicer.stats_snapshot()
+        frame, lag = s['frame_ms'], s['queue_lag_ms']
+        self.hud.setText(
+            f"{s['frames_per_sec']:5.1f} fps   frame p50 {frame['p50']:.1f} / p99 {frame['p99']:.1f} ms\n"
+            f"{s['points_per_sec'] / 1e3:8.1f} kpts/s  {s['batches_per_sec']:7.0f} batches/s  "
+            f"{len(s['streams'])} streams\n"
+            f"queue {s['queue_depth']}/{s['queue_capacity']}  lag p99 {lag['p99']:.1f} ms  "
+            f"dropped {s['queue_dropped']}  merged {s['queue_merged']}\n"
+            f"unknown signal samples {s['unknown_signal_hits']}  "
+            f"axes on screen {len(self.visible_axes())}/{len(self.plots)}")
+        if self.triggers:
+            states = [trigger.state for trigger in self.triggers.values()]
+            self.hud.setText(self.hud.text() +
+                f"\ntriggers {states.count(ARMED)} armed  {states.count(TRIGGERED)} triggered  "
+                f"{states.count(STOPPED)} stopped  "
+                f"{sum(trigger.captured for trigger in self.triggers.values())} frames")
+        if self.spectrograms:
+            self.hud.setText(self.hud.text() +
+                f"\nspectrograms {len(self.spectrograms)}  "
+                f"{sum(spectrogram.computed for spectrogram in self.spectrograms.values())} spectra")
+        self.hud.adjustSize()
@@ -1,10 +1,104 @@
 import grpc
+import itertools
+import math
+import threading
+import time
+from concurrent import futures
 from PyQt5 import QtCore
-import pyqtgraph as pg
 
 # Import the generated gRPC files
-from src.proto_gen import  plot_pb2_grpc
-from google.protobuf import empty_pb2
+from src.proto_gen import  plot_pb2, plot_pb2_grpc
+from google.protobuf import empty_pb2, message_factory
+
+from .ingest_queue import IngestQueue, DATA_KINDS
+from .sample_block import decode_point_batch, decode_packed_request
+from .derived_signals import DerivedSignals, make_transform
+from .auto_range import validate_axis_request
+from .stats import IngestStats
+from .sessions import SessionRegistry, session_name
+from .fanout import FanOut
+
+def validate_signal_request(request):
+    """
+    Checks the derived signal definition and the quantization of an
+    AddSignalRequest, if any. Raises ValueError if they are invalid.
+    """
+    if request.HasField('derived'):
+        if request.derived.source_signal_id == request.signal_id:
+            raise ValueError(f"signal {request.signal_id} can't be derived from itself")
+        make_transform(request.derived)
+    if request.HasField('quantization'):
+        q = request.quantization
+        if not (math.isfinite(q.min) and math.isfinite(q.max) and q.min < q.max):
+            raise ValueError(f"signal {request.signal_id}: quantization needs finite min < max, "
+                             f"got [{q.min}, {q.max}]")
+
+
+def validate_dashboard_spec(spec):
+    """
+    Checks that a DashboardSpec is consistent before it is queued.
+    Raises ValueError otherwise.
+    """
+    axis_ids = set()
+    for axis in spec.axes:
+        if axis.axis_id in axis_ids:
+            raise ValueError(f"axis {axis.axis_id} is listed twice")
+        axis_ids.add(axis.axis_id)
+
+        validate_axis_request(axis)
+
+    signal_ids = set()
+    for signal in spec.signals:
+        if signal.signal_id in signal_ids:
+            raise ValueError(f"signal {signal.signal_id} is listed twice")
+        if signal.axis_id not in axis_ids:
+            raise ValueError(f"signal {signal.signal_id} is attached to axis {signal.axis_id}, "
+                             f"which is not in the dashboard")
+        validate_signal_request(signal)
+        signal_ids.add(signal.signal_id)
+
+    # Derived signals are only computed from streamed ones
+    derived_ids = {signal.signal_id for signal in spec.signals if signal.HasField('derived')}
+    for signal in spec.signals:
+        if signal.HasField('derived') and signal.derived.source_signal_id in derived_ids:
+            raise ValueError(f"signal {signal.signal_id} is derived from signal "
+                             f"{signal.derived.source_signal_id}, which is derived itself")
+
+
+def snapshot_error_status(error):
+    """(status code, details) of a snapshot that failed with `error`."""
+    if isinstance(error, TimeoutError):
+        return grpc.StatusCode.UNAVAILABLE, "The window didn't take the snapshot in time"
+    if isinstance(error, ValueError):
+        return grpc.StatusCode.INVALID_ARGUMENT, str(error)
+    return grpc.StatusCode.INTERNAL, f"Could not write the snapshot: {error}"
+
+
+def add_to_server(servicer, server):
+    """
+    Registers `servicer` (sync or asyncio) on `server`, like
+    plot_pb2_grpc.add_PlotServiceServicer_to_server() except that
+    Subscribe yields messages that are already serialized (see
+    fanout.py).
+    """
+    handler_types = {
+        (False, False): grpc.unary_unary_rpc_method_handler,
+        (False, True): grpc.unary_stream_rpc_method_handler,
+        (True, False): grpc.stream_unary_rpc_method_handler,
+        (True, True): grpc.stream_stream_rpc_method_handler,
+    }
+    handlers = {}
+    for method in plot_pb2.DESCRIPTOR.services_by_name['PlotService'].methods:
+        request_class = message_factory.GetMessageClass(method.input_type)
+        response_class = message_factory.GetMessageClass(method.output_type)
+        serializer = bytes if method.name == 'Subscribe' else response_class.SerializeToString
+        handlers[method.name] = handler_types[method.client_streaming, method.server_streaming](
+            getattr(servicer, method.name),
+            request_deserializer=request_class.FromString,
+            response_serializer=serializer)
+    server.add_generic_rpc_handlers((grpc.method_handlers_generic_handler('PlotService', handlers),))
+    server.add_registered_method_handlers('PlotService', handlers)
+
 
 # --- 1. The gRPC Servicer ---
 # This class handles gRPC requests.
@@ -12,82 +106,368 @@ from google.protobuf import empty_pb2
 class PlotServicer(plot_pb2_grpc.PlotServiceServicer, QtCore.QObject):
     
     # --- Qt Signals ---
-    # These signals are the thread-safe way to send data
-    # from the gRPC thread to the main Qt GUI thread.
-    
-    add_axis_signal = QtCore.pyqtSignal(object)
-    remove_axis_signal = QtCore.pyqtSignal(object)
-    add_point_signal = QtCore.pyqtSignal(object) # Carries the batch
-    
-    add_signal_signal = QtCore.pyqtSignal(object)
-    remove_signal_signal = QtCore.pyqtSignal(object)
-    
-    # Signal to clear all plots
-    clear_all_signal = QtCore.pyqtSignal()
-    
+    # Every request is put on the ingest queue, in arrival order.
+    # This signal is the thread-safe way to wake up the main Qt GUI
+    # thread. It is only emitted when the queue goes from empty to
+    # non-empty: the GUI then drains everything queued in one go.
+    ingest_ready_signal = QtCore.pyqtSignal()
 
-    def __init__(self):
+    # Asks the window for a snapshot: (token, file name). The window
+    # answers with snapshot_finished(token, ...).
+    snapshot_requested = QtCore.pyqtSignal(object, str)
+
+    # How long a blocked stream waits before re-checking its context
+    BLOCK_POLL_INTERVAL = 0.1
+
+    # How long a Snapshot call waits for the file to be written
+    SNAPSHOT_TIMEOUT = 60.0
+
+    def __init__(self, queue_capacity=256, overflow_policy='drop_oldest', capture=None,
+                 session_quota=0):
         # We must initialize both parent classes
         plot_pb2_grpc.PlotServiceServicer.__init__(self)
         QtCore.QObject.__init__(self)
-        
-        # Simple color rotation for new plots
-        self.pens = [pg.mkPen('r'), pg.mkPen('g'), pg.mkPen('b'), 
-                     pg.mkPen('c'), pg.mkPen('m'), pg.mkPen('y')]
-        self.pen_index = 0
 
-    def get_next_pen(self):
-        pen = self.pens[self.pen_index]
-        self.pen_index = (self.pen_index + 1) % len(self.pens)
-        return pen
+        # Queue between the gRPC threads and the GUI thread
+        self.ingest_queue = IngestQueue(queue_capacity, overflow_policy)
+        self._last_drop_report = 0.0
+
+        # Optional CaptureWriter recording every queued item
+        self.capture = capture
+
+        # Producer sessions: ID namespaces, quotas and what each one
+        # declared (see sessions.py)
+        self.sessions = SessionRegistry(session_quota)
+
+        # Signals computed from the streamed ones, as blocks are decoded
+        self.derived_signals = DerivedSignals()
+
+        # Subscribe calls, fed with every decoded block
+        self.fanout = FanOut(self.sessions)
+
+        # Snapshot calls waiting for the window, by token
+        self._snapshots = {}
+        self._snapshot_tokens = itertools.count()
+        self._snapshot_lock = threading.Lock()
+
+        # Counters for GetStats. The GUI side (GuiStats) is set by the
+        # window in MainWindow.set_servicer()
+        self.stats = IngestStats()
+        self.gui_stats = None
+
+    def enqueue(self, kind, payload, context=None, session=''):
+        """
+        Puts an item of a session on the ingest queue and wakes up the
+        GUI if needed. With the 'block' policy this waits for room, for
+        as long as the calling stream is alive. Returns False if the item
+        was not queued.
+        """
+        record = self._capture_record(kind, payload)
+        while True:
+            accepted, was_empty = self.ingest_queue.put(
+                kind, payload, timeout=self.BLOCK_POLL_INTERVAL, session=session)
+            if accepted:
+                break
+            if context is not None and not context.is_active():
+                return False
+
+        self._after_enqueue(record, was_empty)
+        return True
+
+    def try_enqueue(self, kind, payload, session=''):
+        """
+        Same as enqueue(), but never waits: returns False right away if
+        the 'block' policy has no room. Used by the asyncio server.
+        """
+        record = self._capture_record(kind, payload)
+        accepted, was_empty = self.ingest_queue.put(kind, payload, timeout=0, session=session)
+        if accepted:
+            self._after_enqueue(record, was_empty)
+        return accepted
+
+    def _capture_record(self, kind, payload):
+        # Copied before queuing: with the 'merge' policy, later items
+        # can be folded into a queued data payload
+        if self.capture is None:
+            return None
+        return kind, list(payload) if kind in DATA_KINDS else payload
+
+    def _after_enqueue(self, record, was_empty):
+        if record is not None:
+            self.capture.write(*record)
+        if was_empty:
+            self.ingest_ready_signal.emit()
+        self._report_drops()
+
+    def session(self, context):
+        """
+        The Session of a call (see sessions.py). Raises ValueError if
+        it is a new one and there is no room for it.
+        """
+        return self.sessions.get(session_name(context))
+
+    def decode_points(self, batch, stream_id, session):
+        """
+        Decodes a streamPointRequest of a session into a block with
+        global IDs and its derived signals. Returns None if the session's
+        quota drops it.
+        """
+        start = time.perf_counter()
+        block = decode_point_batch(batch, time.time())
+        return self._admit(block, stream_id, session, start)
+
+    def decode_packed(self, request, stream_id, session):
+        """
+        Same as decode_points() for a streamPackedRequest. Also returns
+        None if it has no samples, raises ValueError if it is malformed.
+        """
+        start = time.perf_counter()
+        block = decode_packed_request(request, time.time(), session.last_sample_time,
+                                      session.quantizations)
+        if block is None:
+            return None
+        return self._admit(block, stream_id, session, start)
+
+    def _admit(self, block, stream_id, session, start):
+        points = block.size
+        if not session.admit(points):
+            return None
+        block = session.map_block(block)
+        self.stats.record_batch(stream_id, points, time.perf_counter() - start)
+        if not block.size:
+            return None
+        block = self.derived_signals.apply(block)
+        self.fanout.publish(block)
+        return block
+
+    def request_snapshot(self, name):
+        """
+        Asks the window to write a snapshot (see snapshot.py). Returns
+        (token, future of the SnapshotResponse fields).
+        """
+        print("[gRPC] Received Snapshot request.")
+        future = futures.Future()
+        with self._snapshot_lock:
+            token = next(self._snapshot_tokens)
+            self._snapshots[token] = future
+        self.snapshot_requested.emit(token, name)
+        return token, future
+
+    def snapshot_failed(self, token, error):
+        """
+        (status code, details) to abort a Snapshot call that failed with
+        `error`. A call that timed out gives up on its snapshot.
+        """
+        if isinstance(error, TimeoutError):
+            self.snapshot_finished(token, error)
+        return snapshot_error_status(error)
+
+    def snapshot_finished(self, token, result):
+        """
+        Called by the window (from any thread) with the SnapshotResponse
+        fields, or the exception the snapshot failed with.
+        """
+        with self._snapshot_lock:
+            future = self._snapshots.pop(token, None)
+        if future is None:
+            # The call gave up waiting
+            return
+        if isinstance(result, Exception):
+            future.set_exception(result)
+        else:
+            future.set_result(result)
+
+    def _report_drops(self):
+        # Rate-limited to one line per second
+        now = time.monotonic()
+        if now - self._last_drop_report < 1.0:
+            return
+        stats = self.ingest_queue.stats()
+        if stats['dropped']:
+            self._last_drop_report = now
+            print(f"[gRPC] Warning: Ingest queue full ({stats['depth']}/{stats['capacity']}), "
+                  f"{stats['dropped']} batches dropped so far")
+
+    # --- Configuration requests ---
+    # Shared by the gRPC handlers of both serving modes (see
+    # aio_server.py). They raise ValueError for an invalid request; the
+    # handler turns it into INVALID_ARGUMENT the way its mode can.
+
+    def add_axis(self, request, session):
+        print(f"[gRPC] Received AddAxis request for ID: {request.axis_id}")
+        with self.sessions.lock:
+            validate_axis_request(request)
+            request = session.axis_request(request)
+            session.declare_axis(request)
+            self.enqueue('add_axis', request)
+
+    def remove_axis(self, request, session):
+        print(f"[gRPC] Received RemoveAxis request for ID: {request.axis_id}")
+        with self.sessions.lock:
+            axis_id = session.axis_id(request.axis_id)
+            declared = set(session.signals)
+            session.forget_axis(axis_id)
+            self.fanout.forget(declared - set(session.signals))
+            self.enqueue('remove_axis', plot_pb2.RemoveAxisRequest(axis_id=axis_id))
+
+    def add_signal(self, request, session):
+        print(f"[gRPC] Received AddSignal request for ID: {request.signal_id} on Axis {request.axis_id}")
+        with self.sessions.lock:
+            validate_signal_request(request)
+            mapped = session.signal_request(request)
+            if mapped.HasField('derived'):
+                self.derived_signals.add(mapped.signal_id, mapped.derived)
+            session.declare_signal(mapped, request)
+            self.enqueue('add_signal', mapped)
+
+    def remove_signal(self, request, session):
+        print(f"[gRPC] Received RemoveSignal request for ID: {request.signal_id}")
+        with self.sessions.lock:
+            signal_id = session.signal_id(request.signal_id)
+            self.derived_signals.remove(signal_id)
+            session.forget_signal(signal_id)
+            self.fanout.forget({signal_id})
+            self.enqueue('remove_signal', plot_pb2.RemoveSignalRequest(signal_id=signal_id))
+
+    def clear_all(self, session):
+        print(f"[gRPC] Received clearAll request.")
+        with self.sessions.lock:
+            self.fanout.forget(set(session.signals))
+            session.clear()
+            if self.sessions.has_named_sessions():
+                # The other sessions' axes stay
+                spec = self.sessions.merged_spec()
+                self.derived_signals.configure(spec.signals)
+                self.enqueue('configure_dashboard', spec)
+            else:
+                self.derived_signals.clear()
+                self.enqueue('clear_all', None)
+
+    def configure_dashboard(self, request, session):
+        print(f"[gRPC] Received ConfigureDashboard request "
+              f"({len(request.axes)} axes, {len(request.signals)} signals).")
+        with self.sessions.lock:
+            validate_dashboard_spec(request)
+            axes = [session.axis_request(axis) for axis in request.axes]
+            signals = [session.signal_request(signal) for signal in request.signals]
+
+            # Only the calling session's dashboard is replaced
+            self.fanout.forget(set(session.signals) - {signal.signal_id for signal in signals})
+            session.clear()
+            for axis in axes:
+                session.declare_axis(axis)
+            for mapped, signal in zip(signals, request.signals):
+                session.declare_signal(mapped, signal)
+            if self.sessions.has_named_sessions():
+                request = self.sessions.merged_spec()
+            self.derived_signals.configure(request.signals)
+            self.enqueue('configure_dashboard', request)
+
+    def arm_trigger(self, request, session):
+        print(f"[gRPC] Received ArmTrigger request for axes: {list(request.axis_ids) or 'all'}")
+        with self.sessions.lock:
+            axis_ids = [session.axis_id(axis_id) for axis_id in request.axis_ids]
+            if not axis_ids and self.sessions.has_named_sessions():
+                # Only the session's own axes
+                axis_ids = list(session.axes)
+                if not axis_ids:
+                    return
+            self.enqueue('arm_trigger', plot_pb2.ArmTriggerRequest(axis_ids=axis_ids))
 
     # --- gRPC Method Implementation ---
-    
+
+    def _configure(self, method, request, context):
+        """Runs a configuration request, aborting the call if it is invalid."""
+        try:
+            method(request, self.session(context))
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        return empty_pb2.Empty()
+
     def AddAxis(self, request, context):
         """
         Called by a gRPC client to add a new plot.
         This runs in a gRPC thread.
         """
-        print(f"[gRPC] Received AddAxis request for ID: {request.axis_id}")
-        self.add_axis_signal.emit(request)
-        return empty_pb2.Empty()
+        return self._configure(self.add_axis, request, context)
 
     def RemoveAxis(self, request, context):
         """
         Called by a gRPC client to remove a plot.
         This runs in a gRPC thread.
         """
-        print(f"[gRPC] Received RemoveAxis request for ID: {request.axis_id}")
-        self.remove_axis_signal.emit(request)
-        return empty_pb2.Empty()
+        return self._configure(self.remove_axis, request, context)
 
     def AddSignal(self, request, context):
         """
         (NEW) Called by a gRPC client to add a line to a plot.
         This runs in a gRPC thread.
         """
-        print(f"[gRPC] Received AddSignal request for ID: {request.signal_id} on Axis {request.axis_id}")
-        self.add_signal_signal.emit(request)
-        return empty_pb2.Empty()
+        return self._configure(self.add_signal, request, context)
 
     def RemoveSignal(self, request, context):
         """
         (NEW) Called by a gRPC client to remove a line from a plot.
         This runs in a gRPC thread.
         """
-        print(f"[gRPC] Received RemoveSignal request for ID: {request.signal_id}")
-        self.remove_signal_signal.emit(request)
-        return empty_pb2.Empty()
+        return self._configure(self.remove_signal, request, context)
 
     # (NEW) gRPC Method for clearAll
     def clearAll(self, request, context):
         """
-        (NEW) Called by a gRPC client to remove ALL plots and signals.
+        (NEW) Called by a gRPC client to remove ALL plots and signals
+        (of its session, if other sessions exist).
         This runs in a gRPC thread.
         """
-        print(f"[gRPC] Received clearAll request.")
-        self.clear_all_signal.emit()
-        return empty_pb2.Empty()
+        return self._configure(lambda request, session: self.clear_all(session), request, context)
+
+    def ConfigureDashboard(self, request, context):
+        """
+        Called by a gRPC client to set up all axes and signals at once.
+        This runs in a gRPC thread.
+        """
+        return self._configure(self.configure_dashboard, request, context)
+
+    def ArmTrigger(self, request, context):
+        """
+        Called by a gRPC client to re-arm axis triggers (see trigger.py).
+        This runs in a gRPC thread.
+        """
+        return self._configure(self.arm_trigger, request, context)
+
+    def GetStats(self, request, context):
+        """
+        Called by a gRPC client to monitor the server.
+        This runs in a gRPC thread.
+        """
+        return plot_pb2.StatsResponse(**self.stats_snapshot())
+
+    def Snapshot(self, request, context):
+        """
+        Called by a gRPC client to export the buffers to a file.
+        Waits until the window has written it.
+        This runs in a gRPC thread.
+        """
+        token, future = self.request_snapshot(request.name)
+        try:
+            result = future.result(timeout=self.SNAPSHOT_TIMEOUT)
+        except (TimeoutError, OSError, ValueError) as e:
+            context.abort(*self.snapshot_failed(token, e))
+        return plot_pb2.SnapshotResponse(**result)
+
+    def stats_snapshot(self):
+        """
+        All the statistics as a dict, with the fields of StatsResponse.
+        """
+        snapshot = self.stats.snapshot()
+        for key, value in self.ingest_queue.stats().items():
+            if key not in ('policy', 'enqueued'):
+                snapshot[f'queue_{key}'] = value
+        snapshot['sessions'] = self.sessions.stats()
+        snapshot['subscribers'] = self.fanout.stats()
+        if self.gui_stats is not None:
+            snapshot.update(self.gui_stats.snapshot())
+        return snapshot
 
 
     def streamPlot(self, request_iterator, context):
@@ -97,12 +477,19 @@ class PlotServicer(plot_pb2_grpc.PlotServiceServicer, QtCore.QObject):
         This runs in a gRPC thread.
         """
         print("[gRPC] Client connected for streaming points...")
+        try:
+            session = self.session(context)
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        stream_id = self.stats.open_stream(context.peer())
         try:
             # request_iterator is a blocking generator.
             # The loop will run as long as the client is streaming.
             for batch in request_iterator:
-                # Emit the signal for each batch received
-                self.add_point_signal.emit(batch)
+                # Decode and queue each batch received
+                block = self.decode_points(batch, stream_id, session)
+                if block is not None and not self.enqueue('samples', [block], context, session.name):
+                    break
                 
             print("[gRPC] Client finished streaming.")
             
@@ -111,6 +498,62 @@ class PlotServicer(plot_pb2_grpc.PlotServiceServicer, QtCore.QObject):
                 print("[gRPC] Client cancelled stream.")
             else:
                 print(f"[gRPC] Stream error: {e}")
+        finally:
+            self.stats.close_stream(stream_id)
                 
         return empty_pb2.Empty()
 
+    def streamPlotPacked(self, request_iterator, context):
+        """
+        Called by a gRPC client to stream runs of samples per signal.
+        Each request is decoded into NumPy arrays here, so the GUI
+        thread only has to copy whole arrays into the buffers.
+        This runs in a gRPC thread.
+        """
+        print("[gRPC] Client connected for packed streaming...")
+        try:
+            session = self.session(context)
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        stream_id = self.stats.open_stream(context.peer())
+        try:
+            for request in request_iterator:
+                try:
+                    block = self.decode_packed(request, stream_id, session)
+                except ValueError as e:
+                    context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+
+                if block is not None and not self.enqueue('samples', [block], context, session.name):
+                    break
+
+            print("[gRPC] Client finished packed streaming.")
+
+        except grpc.RpcError as e:
+            if e.code() == grpc.StatusCode.CANCELLED:
+                print("[gRPC] Client cancelled packed stream.")
+            else:
+                print(f"[gRPC] Packed stream error: {e}")
+        finally:
+            self.stats.close_stream(stream_id)
+
+        return empty_pb2.Empty()
+
+
+    def Subscribe(self, request, context):
+        """
+        Called by a gRPC client to receive live data (see fanout.py).
+        Yields serialized streamPackedRequests.
+        This runs in a gRPC thread, for as long as the client listens.
+        """
+        print(f"[gRPC] Client subscribed to session '{request.session}' "
+              f"({len(request.signal_ids) or 'all'} signals)")
+        try:
+            subscriber = self.fanout.subscribe(request, context.peer())
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        try:
+            while context.is_active():
+                yield from subscriber.take(timeout=self.BLOCK_POLL_INTERVAL)
+        finally:
+            self.fanout.unsubscribe(subscriber)
+            print("[gRPC] Subscriber left.")
@@ -25,25 +25,67 @@ _sym_db = _symbol_database.Default()
 from google.protobuf import empty_pb2 as google_dot_protobuf_dot_empty__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x18src/proto_gen/plot.proto\x1a\x1bgoogle/protobuf/empty.proto\"|\n\x0e\x41\x64\x64\x41xisRequest\x12\x0f\n\x07\x61xis_id\x18\x01 \x01(\r\x12\x19\n\x11number_of_samples\x18\x02 \x01(\r\x12\x12\n\nplot_title\x18\x03 \x01(\t\x12\x14\n\x0cx_axis_title\x18\x04 \x01(\t\x12\x14\n\x0cy_axis_title\x18\x05 \x01(\t\"$\n\x11RemoveAxisRequest\x12\x0f\n\x07\x61xis_id\x18\x01 \x01(\r\"w\n\x10\x41\x64\x64SignalRequest\x12\x0f\n\x07\x61xis_id\x18\x01 \x01(\r\x12\x11\n\tsignal_id\x18\x02 \x01(\r\x12\x13\n\x0bsignal_name\x18\x03 \x01(\t\x12\x19\n\x0csignal_color\x18\x04 \x01(\tH\x00\x88\x01\x01\x42\x0f\n\r_signal_color\"(\n\x13RemoveSignalRequest\x12\x11\n\tsignal_id\x18\x01 \x01(\r\"/\n\x0bstreamPoint\x12\x11\n\tsignal_id\x18\x01 \x01(\r\x12\r\n\x05value\x18\x03 \x01(\x02\"2\n\x12streamPointRequest\x12\x1c\n\x06points\x18\x01 \x03(\x0b\x32\x0c.streamPoint2\xea\x02\n\x0bPlotService\x12\x32\n\x07\x41\x64\x64\x41xis\x12\x0f.AddAxisRequest\x1a\x16.google.protobuf.Empty\x12\x38\n\nRemoveAxis\x12\x12.RemoveAxisRequest\x1a\x16.google.protobuf.Empty\x12\x36\n\tAddSignal\x12\x11.AddSignalRequest\x1a\x16.google.protobuf.Empty\x12<\n\x0cRemoveSignal\x12\x14.RemoveSignalRequest\x1a\x16.google.protobuf.Empty\x12:\n\x08\x63learAll\x12\x16.google.protobuf.Empty\x1a\x16.google.protobuf.Empty\x12;\n\nstreamPlot\x12\x13.streamPointRequest\x1a\x16.google.protobuf.Empty(\x01\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x18src/proto_gen/plot.proto\x1a\x1bgoogle/protobuf/empty.proto\"\xb1\x02\n\x07Trigger\x12\x1b\n\x04mode\x18\x01 \x01(\x0e\x32\r.Trigger.Mode\x12\x11\n\tsignal_id\x18\x02 \x01(\r\x12%\n\tcondition\x18\x03 \x01(\x0e\x32\x12.Trigger.Condition\x12\r\n\x05level\x18\x04 \x01(\x01\x12\x0b\n\x03low\x18\x05 \x01(\x01\x12\x0c\n\x04high\x18\x06 \x01(\x01\x12\x13\n\x0bpre_trigger\x18\x07 \x01(\x01\x12\x14\n\x0cpost_trigger\x18\x08 \x01(\x01\x12\x14\n\x0c\x61uto_timeout\x18\t \x01(\x01\"1\n\x04Mode\x12\x07\n\x03OFF\x10\x00\x12\n\n\x06NORMAL\x10\x01\x12\x08\n\x04\x41UTO\x10\x02\x12\n\n\x06SINGLE\x10\x03\"1\n\tCondition\x12\n\n\x06RISING\x10\x00\x12\x0b\n\x07\x46\x41LLING\x10\x01\x12\x0b\n\x07OUTSIDE\x10\x02\"\x81\x02\n\x0bSpectrogram\x12\x11\n\tsignal_id\x18\x01 \x01(\r\x12\x10\n\x08\x66\x66t_size\x18\x02 \x01(\r\x12\x0b\n\x03hop\x18\x03 \x01(\r\x12#\n\x06window\x18\x04 \x01(\x0e\x32\x13.Spectrogram.Window\x12\x0f\n\x07\x63olumns\x18\x05 \x01(\r\x12\x16\n\tmin_level\x18\x06 \x01(\x01H\x00\x88\x01\x01\x12\x16\n\tmax_level\x18\x07 \x01(\x01H\x01\x88\x01\x01\">\n\x06Window\x12\x08\n\x04HANN\x10\x00\x12\x0b\n\x07HAMMING\x10\x01\x12\x0c\n\x08\x42LACKMAN\x10\x02\x12\x0f\n\x0bRECTANGULAR\x10\x03\x42\x0c\n\n_min_levelB\x0c\n\n_max_level\"\xf1\x02\n\x0e\x41\x64\x64\x41xisRequest\x12\x0f\n\x07\x61xis_id\x18\x01 \x01(\r\x12\x19\n\x11number_of_samples\x18\x02 \x01(\r\x12\x12\n\nplot_title\x18\x03 \x01(\t\x12\x14\n\x0cx_axis_title\x18\x04 \x01(\t\x12\x14\n\x0cy_axis_title\x18\x05 \x01(\t\x12\x33\n\x0ey_range_policy\x18\x06 \x01(\x0e\x32\x1b.AddAxisRequest.RangePolicy\x12\r\n\x05y_min\x18\x07 \x01(\x01\x12\r\n\x05y_max\x18\x08 \x01(\x01\x12\x1e\n\x07trigger\x18\t \x01(\x0b\x32\x08.TriggerH\x00\x88\x01\x01\x12&\n\x0bspectrogram\x18\n \x01(\x0b\x32\x0c.SpectrogramH\x01\x88\x01\x01\"<\n\x0bRangePolicy\x12\x08\n\x04\x41UTO\x10\x00\x12\t\n\x05\x46IXED\x10\x01\x12\x08\n\x04GROW\x10\x02\x12\x0e\n\nHYSTERESIS\x10\x03\x42\n\n\x08_triggerB\x0e\n\x0c_spectrogram\"$\n\x11RemoveAxisRequest\x12\x0f\n\x07\x61xis_id\x18\x01 \x01(\r\"%\n\x11\x41rmTriggerRequest\x12\x10\n\x08\x61xis_ids\x18\x01 \x03(\r\"\xd0\x01\n\rDerivedSignal\x12\x18\n\x10source_signal_id\x18\x01 \x01(\r\x12+\n\ttransform\x18\x02 \x01(\x0e\x32\x18.DerivedSignal.Transform\x12\r\n\x05\x61lpha\x18\x03 \x01(\x01\x12\x0c\n\x04taps\x18\x04 \x03(\x01\x12\x0e\n\x06window\x18\x05 \x01(\r\"K\n\tTransform\x12\x19\n\x15TRANSFORM_UNSPECIFIED\x10\x00\x12\x07\n\x03\x45MA\x10\x01\x12\x07\n\x03\x46IR\x10\x02\x12\x08\n\x04\x44IFF\x10\x03\x12\x07\n\x03RMS\x10\x04\"(\n\x0cQuantization\x12\x0b\n\x03min\x18\x01 \x01(\x01\x12\x0b\n\x03max\x18\x02 \x01(\x01\"\xe4\x01\n\x10\x41\x64\x64SignalRequest\x12\x0f\n\x07\x61xis_id\x18\x01 \x01(\r\x12\x11\n\tsignal_id\x18\x02 \x01(\r\x12\x13\n\x0bsignal_name\x18\x03 \x01(\t\x12\x19\n\x0csignal_color\x18\x04 \x01(\tH\x00\x88\x01\x01\x12$\n\x07\x64\x65rived\x18\x05 \x01(\x0b\x32\x0e.DerivedSignalH\x01\x88\x01\x01\x12(\n\x0cquantization\x18\x06 \x01(\x0b\x32\r.QuantizationH\x02\x88\x01\x01\x42\x0f\n\r_signal_colorB\n\n\x08_derivedB\x0f\n\r_quantization\"(\n\x13RemoveSignalRequest\x12\x11\n\tsignal_id\x18\x01 \x01(\r\"R\n\rDashboardSpec\x12\x1d\n\x04\x61xes\x18\x01 \x03(\x0b\x32\x0f.AddAxisRequest\x12\"\n\x07signals\x18\x02 \x03(\x0b\x32\x11.AddSignalRequest\"B\n\x0bstreamPoint\x12\x11\n\tsignal_id\x18\x01 \x01(\r\x12\r\n\x05value\x18\x03 \x01(\x02\x12\x11\n\ttimestamp\x18\x04 \x01(\x01\"E\n\x12streamPointRequest\x12\x1c\n\x06points\x18\x01 \x03(\x0b\x32\x0c.streamPoint\x12\x11\n\ttimestamp\x18\x02 \x01(\x01\"\xb7\x01\n\rpackedSamples\x12\x11\n\tsignal_id\x18\x01 \x01(\r\x12\x0e\n\x06values\x18\x02 \x03(\x02\x12\x12\n\nraw_values\x18\x03 \x01(\x0c\x12\x12\n\ntimestamps\x18\x04 \x03(\x01\x12\x16\n\x0eraw_timestamps\x18\x05 \x01(\x0c\x12\x12\n\nstart_time\x18\x06 \x01(\x01\x12\x15\n\rsample_period\x18\x07 \x01(\x01\x12\x18\n\x10quantized_values\x18\x08 \x01(\x0c\"6\n\x13streamPackedRequest\x12\x1f\n\x07signals\x18\x01 \x03(\x0b\x32\x0e.packedSamples\"I\n\x10SubscribeRequest\x12\x0f\n\x07session\x18\x01 \x01(\t\x12\x12\n\nsignal_ids\x18\x02 \x03(\r\x12\x10\n\x08max_rate\x18\x03 \x01(\x01\"\x1f\n\x0fSnapshotRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\"Q\n\x10SnapshotResponse\x12\x0c\n\x04path\x18\x01 \x01(\t\x12\x0f\n\x07signals\x18\x02 \x01(\r\x12\x0f\n\x07samples\x18\x03 \x01(\x04\x12\r\n\x05\x62ytes\x18\x04 \x01(\x04\"c\n\x10HistogramSummary\x12\r\n\x05\x63ount\x18\x01 \x01(\x04\x12\x0c\n\x04mean\x18\x02 \x01(\x01\x12\x0b\n\x03p50\x18\x03 \x01(\x01\x12\x0b\n\x03p90\x18\x04 \x01(\x01\x12\x0b\n\x03p99\x18\x05 \x01(\x01\x12\x0b\n\x03max\x18\x06 \x01(\x01\"x\n\x0bStreamStats\x12\x11\n\tstream_id\x18\x01 \x01(\x04\x12\x0c\n\x04peer\x18\x02 \x01(\t\x12\x0f\n\x07seconds\x18\x03 \x01(\x01\x12\x0f\n\x07\x62\x61tches\x18\x04 \x01(\x04\x12\x0e\n\x06points\x18\x05 \x01(\x04\x12\x16\n\x0epoints_per_sec\x18\x06 \x01(\x01\"\x93\x01\n\x0cSessionStats\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0c\n\x04\x61xes\x18\x02 \x01(\r\x12\x0f\n\x07signals\x18\x03 \x01(\r\x12\x0e\n\x06points\x18\x04 \x01(\x04\x12\x16\n\x0epoints_per_sec\x18\x05 \x01(\x01\x12\x16\n\x0e\x64ropped_points\x18\x06 \x01(\x04\x12\x16\n\x0eunknown_points\x18\x07 \x01(\x04\"\x94\x01\n\x0fSubscriberStats\x12\x0c\n\x04peer\x18\x01 \x01(\t\x12\x0f\n\x07session\x18\x02 \x01(\t\x12\x0f\n\x07signals\x18\x03 \x01(\r\x12\x10\n\x08max_rate\x18\x04 \x01(\x01\x12\x15\n\rmessages_sent\x18\x05 \x01(\x04\x12\x18\n\x10messages_dropped\x18\x06 \x01(\x04\x12\x0e\n\x06queued\x18\x07 \x01(\r\"\x90\x05\n\rStatsResponse\x12\x10\n\x08uptime_s\x18\x01 \x01(\x01\x12\x18\n\x10\x62\x61tches_received\x18\x02 \x01(\x04\x12\x17\n\x0fpoints_received\x18\x03 \x01(\x04\x12\x17\n\x0f\x62\x61tches_per_sec\x18\x04 \x01(\x01\x12\x16\n\x0epoints_per_sec\x18\x05 \x01(\x01\x12$\n\tdecode_us\x18\x06 \x01(\x0b\x32\x11.HistogramSummary\x12\x1d\n\x07streams\x18\x07 \x03(\x0b\x32\x0c.StreamStats\x12\x13\n\x0bqueue_depth\x18\x08 \x01(\r\x12\x16\n\x0equeue_capacity\x18\t \x01(\r\x12\x17\n\x0fqueue_max_depth\x18\n \x01(\r\x12\x15\n\rqueue_dropped\x18\x0b \x01(\x04\x12\x14\n\x0cqueue_merged\x18\x0c \x01(\x04\x12\'\n\x0cqueue_lag_ms\x18\r \x01(\x0b\x32\x11.HistogramSummary\x12\x0e\n\x06\x66rames\x18\x0e \x01(\x04\x12\x16\n\x0e\x66rames_per_sec\x18\x0f \x01(\x01\x12#\n\x08\x66rame_ms\x18\x10 \x01(\x0b\x32\x11.HistogramSummary\x12#\n\x08\x61pply_ms\x18\x11 \x01(\x0b\x32\x11.HistogramSummary\x12\x16\n\x0epoints_applied\x18\x12 \x01(\x04\x12\x1b\n\x13unknown_signal_hits\x18\x13 \x01(\x04\x12\x1f\n\x08sessions\x18\x14 \x03(\x0b\x32\r.SessionStats\x12%\n\x0bsubscribers\x18\x15 \x03(\x0b\x32\x10.SubscriberStats\x12\x19\n\x11startup_accept_ms\x18\x16 \x01(\x01\x12\x1e\n\x16startup_first_frame_ms\x18\x17 \x01(\x01\x32\xc3\x05\n\x0bPlotService\x12\x32\n\x07\x41\x64\x64\x41xis\x12\x0f.AddAxisRequest\x1a\x16.google.protobuf.Empty\x12\x38\n\nRemoveAxis\x12\x12.RemoveAxisRequest\x1a\x16.google.protobuf.Empty\x12\x36\n\tAddSignal\x12\x11.AddSignalRequest\x1a\x16.google.protobuf.Empty\x12<\n\x0cRemoveSignal\x12\x14.RemoveSignalRequest\x1a\x16.google.protobuf.Empty\x12:\n\x08\x63learAll\x12\x16.google.protobuf.Empty\x1a\x16.google.protobuf.Empty\x12<\n\x12\x43onfigureDashboard\x12\x0e.DashboardSpec\x1a\x16.google.protobuf.Empty\x12\x38\n\nArmTrigger\x12\x12.ArmTriggerRequest\x1a\x16.google.protobuf.Empty\x12\x32\n\x08GetStats\x12\x16.google.protobuf.Empty\x1a\x0e.StatsResponse\x12/\n\x08Snapshot\x12\x10.SnapshotRequest\x1a\x11.SnapshotResponse\x12;\n\nstreamPlot\x12\x13.streamPointRequest\x1a\x16.google.protobuf.Empty(\x01\x12\x42\n\x10streamPlotPacked\x12\x14.streamPackedRequest\x1a\x16.google.protobuf.Empty(\x01\x12\x36\n\tSubscribe\x12\x11.SubscribeRequest\x1a\x14.streamPackedRequest0\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'src.proto_gen.plot_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
-  _globals['_ADDAXISREQUEST']._serialized_start=57
-  _globals['_ADDAXISREQUEST']._serialized_end=181
-  _globals['_REMOVEAXISREQUEST']._serialized_start=183
-  _globals['_REMOVEAXISREQUEST']._serialized_end=219
-  _globals['_ADDSIGNALREQUEST']._serialized_start=221
-  _globals['_ADDSIGNALREQUEST']._serialized_end=340
-  _globals['_REMOVESIGNALREQUEST']._serialized_start=342
-  _globals['_REMOVESIGNALREQUEST']._serialized_end=382
-  _globals['_STREAMPOINT']._serialized_start=384
-  _globals['_STREAMPOINT']._serialized_end=431
-  _globals['_STREAMPOINTREQUEST']._serialized_start=433
-  _globals['_STREAMPOINTREQUEST']._serialized_end=483
-  _globals['_PLOTSERVICE']._serialized_start=486
-  _globals['_PLOTSERVICE']._serialized_end=848
+  _globals['_TRIGGER']._serialized_start=58
+  _globals['_TRIGGER']._serialized_end=363
+  _globals['_TRIGGER_MODE']._serialized_start=263
+  _globals['_TRIGGER_MODE']._serialized_end=312
+  _globals['_TRIGGER_CONDITION']._serialized_start=314
+  _globals['_TRIGGER_CONDITION']._serialized_end=363
+  _globals['_SPECTROGRAM']._serialized_start=366
+  _globals['_SPECTROGRAM']._serialized_end=623
+  _globals['_SPECTROGRAM_WINDOW']._serialized_start=533
+  _globals['_SPECTROGRAM_WINDOW']._serialized_end=595
+  _globals['_ADDAXISREQUEST']._serialized_start=626
+  _globals['_ADDAXISREQUEST']._serialized_end=995
+  _globals['_ADDAXISREQUEST_RANGEPOLICY']._serialized_start=907
+  _globals['_ADDAXISREQUEST_RANGEPOLICY']._serialized_end=967
+  _globals['_REMOVEAXISREQUEST']._serialized_start=997
+  _globals['_REMOVEAXISREQUEST']._serialized_end=1033
+  _globals['_ARMTRIGGERREQUEST']._serialized_start=1035
+  _globals['_ARMTRIGGERREQUEST']._serialized_end=1072
+  _globals['_DERIVEDSIGNAL']._serialized_start=1075
+  _globals['_DERIVEDSIGNAL']._serialized_end=1283
+  _globals['_DERIVEDSIGNAL_TRANSFORM']._serialized_start=1208
+  _globals['_DERIVEDSIGNAL_TRANSFORM']._serialized_end=1283
+  _globals['_QUANTIZATION']._serialized_start=1285
+  _globals['_QUANTIZATION']._serialized_end=1325
+  _globals['_ADDSIGNALREQUEST']._serialized_start=1328
+  _globals['_ADDSIGNALREQUEST']._serialized_end=1556
+  _globals['_REMOVESIGNALREQUEST']._serialized_start=1558
+  _globals['_REMOVESIGNALREQUEST']._serialized_end=1598
+  _globals['_DASHBOARDSPEC']._serialized_start=1600
+  _globals['_DASHBOARDSPEC']._serialized_end=1682
+  _globals['_STREAMPOINT']._serialized_start=1684
+  _globals['_STREAMPOINT']._serialized_end=1750
+  _globals['_STREAMPOINTREQUEST']._serialized_start=1752
+  _globals['_STREAMPOINTREQUEST']._serialized_end=1821
+  _globals['_PACKEDSAMPLES']._serialized_start=1824
+  _globals['_PACKEDSAMPLES']._serialized_end=2007
+  _globals['_STREAMPACKEDREQUEST']._serialized_start=2009
+  _globals['_STREAMPACKEDREQUEST']._serialized_end=2063
+  _globals['_SUBSCRIBEREQUEST']._serialized_start=2065
+  _globals['_SUBSCRIBEREQUEST']._serialized_end=2138
+  _globals['_SNAPSHOTREQUEST']._serialized_start=2140
+  _globals['_SNAPSHOTREQUEST']._serialized_end=2171
+  _globals['_SNAPSHOTRESPONSE']._serialized_start=2173
+  _globals['_SNAPSHOTRESPONSE']._serialized_end=2254
+  _globals['_HISTOGRAMSUMMARY']._serialized_start=2256
+  _globals['_HISTOGRAMSUMMARY']._serialized_end=2355
+  _globals['_STREAMSTATS']._serialized_start=2357
+  _globals['_STREAMSTATS']._serialized_end=2477
+  _globals['_SESSIONSTATS']._serialized_start=2480
+  _globals['_SESSIONSTATS']._serialized_end=2627
+  _globals['_SUBSCRIBERSTATS']._serialized_start=2630
+  _globals['_SUBSCRIBERSTATS']._serialized_end=2778
+  _globals['_STATSRESPONSE']._serialized_start=2781
+  _globals['_STATSRESPONSE']._serialized_end=3437
+  _globals['_PLOTSERVICE']._serialized_start=3440
+  _globals['_PLOTSERVICE']._serialized_end=4147
 # @@protoc_insertion_point(module_scope)
@@ -1,24 +1,113 @@
 from google.protobuf import empty_pb2 as _empty_pb2
 from google.protobuf.internal import containers as _containers
+from google.protobuf.internal import enum_type_wrapper as _enum_type_wrapper
 from google.protobuf import descriptor as _descriptor
 from google.protobuf import message as _message
 from typing import ClassVar as _ClassVar, Iterable as _Iterable, Mapping as _Mapping, Optional as _Optional, Union as _Union
 
 DESCRIPTOR: _descriptor.FileDescriptor
 
+class Trigger(_message.Message):
+    __slots__ = ("mode", "signal_id", "condition", "level", "low", "high", "pre_trigger", "post_trigger", "auto_timeout")
+    class Mode(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
+        __slots__ = ()
+        OFF: _ClassVar[Trigger.Mode]
+        NORMAL: _ClassVar[Trigger.Mode]
+        AUTO: _ClassVar[Trigger.Mode]
+        SINGLE: _ClassVar[Trigger.Mode]
+    OFF: Trigger.Mode
+    NORMAL: Trigger.Mode
+    AUTO: Trigger.Mode
+    SINGLE: Trigger.Mode
+    class Condition(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
+        __slots__ = ()
+        RISING: _ClassVar[Trigger.Condition]
+        FALLING: _ClassVar[Trigger.Condition]
+        OUTSIDE: _ClassVar[Trigger.Condition]
+    RISING: Trigger.Condition
+    FALLING: Trigger.Condition
+    OUTSIDE: Trigger.Condition
+    MODE_FIELD_NUMBER: _ClassVar[int]
+    SIGNAL_ID_FIELD_NUMBER: _ClassVar[int]
+    CONDITION_FIELD_NUMBER: _ClassVar[int]
+    LEVEL_FIELD_NUMBER: _ClassVar[int]
+    LOW_FIELD_NUMBER: _ClassVar[int]
+    HIGH_FIELD_NUMBER: _ClassVar[int]
+    PRE_TRIGGER_FIELD_NUMBER: _ClassVar[int]
+    POST_TRIGGER_FIELD_NUMBER: _ClassVar[int]
+    AUTO_TIMEOUT_FIELD_NUMBER: _ClassVar[int]
+    mode: Trigger.Mode
+    signal_id: int
+    condition: Trigger.Condition
+    level: float
+    low: float
+    high: float
+    pre_trigger: float
+    post_trigger: float
+    auto_timeout: float
+    def __init__(self, mode: _Optional[_Union[Trigger.Mode, str]] = ..., signal_id: _Optional[int] = ..., condition: _Optional[_Union[Trigger.Condition, str]] = ..., level: _Optional[float] = ..., low: _Optional[float] = ..., high: _Optional[float] = ..., pre_trigger: _Optional[float] = ..., post_trigger: _Optional[float] = ..., auto_timeout: _Optional[float] = ...) -> None: ...
+
+class Spectrogram(_message.Message):
+    __slots__ = ("signal_id", "fft_size", "hop", "window", "columns", "min_level", "max_level")
+    class Window(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
+        __slots__ = ()
+        HANN: _ClassVar[Spectrogram.Window]
+        HAMMING: _ClassVar[Spectrogram.Window]
+        BLACKMAN: _ClassVar[Spectrogram.Window]
+        RECTANGULAR: _ClassVar[Spectrogram.Window]
+    HANN: Spectrogram.Window
+    HAMMING: Spectrogram.Window
+    BLACKMAN: Spectrogram.Window
+    RECTANGULAR: Spectrogram.Window
+    SIGNAL_ID_FIELD_NUMBER: _ClassVar[int]
+    FFT_SIZE_FIELD_NUMBER: _ClassVar[int]
+    HOP_FIELD_NUMBER: _ClassVar[int]
+    WINDOW_FIELD_NUMBER: _ClassVar[int]
+    COLUMNS_FIELD_NUMBER: _ClassVar[int]
+    MIN_LEVEL_FIELD_NUMBER: _ClassVar[int]
+    MAX_LEVEL_FIELD_NUMBER: _ClassVar[int]
+    signal_id: int
+    fft_size: int
+    hop: int
+    window: Spectrogram.Window
+    columns: int
+    min_level: float
+    max_level: float
+    def __init__(self, signal_id: _Optional[int] = ..., fft_size: _Optional[int] = ..., hop: _Optional[int] = ..., window: _Optional[_Union[Spectrogram.Window, str]] = ..., columns: _Optional[int] = ..., min_level: _Optional[float] = ..., max_level: _Optional[float] = ...) -> None: ...
+
 class AddAxisRequest(_message.Message):
-    __slots__ = ("axis_id", "number_of_samples", "plot_title", "x_axis_title", "y_axis_title")
+    __slots__ = ("axis_id", "number_of_samples", "plot_title", "x_axis_title", "y_axis_title", "y_range_policy", "y_min", "y_max", "trigger", "spectrogram")
+    class RangePolicy(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
+        __slots__ = ()
+        AUTO: _ClassVar[AddAxisRequest.RangePolicy]
+        FIXED: _ClassVar[AddAxisRequest.RangePolicy]
+        GROW: _ClassVar[AddAxisRequest.RangePolicy]
+        HYSTERESIS: _ClassVar[AddAxisRequest.RangePolicy]
+    AUTO: AddAxisRequest.RangePolicy
+    FIXED: AddAxisRequest.RangePolicy
+    GROW: AddAxisRequest.RangePolicy
+    HYSTERESIS: AddAxisRequest.RangePolicy
     AXIS_ID_FIELD_NUMBER: _ClassVar[int]
     NUMBER_OF_SAMPLES_FIELD_NUMBER: _ClassVar[int]
     PLOT_TITLE_FIELD_NUMBER: _ClassVar[int]
     X_AXIS_TITLE_FIELD_NUMBER: _ClassVar[int]
     Y_AXIS_TITLE_FIELD_NUMBER: _ClassVar[int]
+    Y_RANGE_POLICY_FIELD_NUMBER: _ClassVar[int]
+    Y_MIN_FIELD_NUMBER: _ClassVar[int]
+    Y_MAX_FIELD_NUMBER: _ClassVar[int]
+    TRIGGER_FIELD_NUMBER: _ClassVar[int]
+    SPECTROGRAM_FIELD_NUMBER: _ClassVar[int]
     axis_id: int
     number_of_samples: int
     plot_title: str
     x_axis_title: str
     y_axis_title: str
-    def __init__(self, axis_id: _Optional[int] = ..., number_of_samples: _Optional[int] = ..., plot_title: _Optional[str] = ..., x_axis_title: _Optional[str] = ..., y_axis_title: _Optional[str] = ...) -> None: ...
+    y_range_policy: AddAxisRequest.RangePolicy
+    y_min: float
+    y_max: float
+    trigger: Trigger
+    spectrogram: Spectrogram
+    def __init__(self, axis_id: _Optional[int] = ..., number_of_samples: _Optional[int] = ..., plot_title: _Optional[str] = ..., x_axis_title: _Optional[str] = ..., y_axis_title: _Optional[str] = ..., y_range_policy: _Optional[_Union[AddAxisRequest.RangePolicy, str]] = ..., y_min: _Optional[float] = ..., y_max: _Optional[float] = ..., trigger: _Optional[_Union[Trigger, _Mapping]] = ..., spectrogram: _Optional[_Union[Spectrogram, _Mapping]] = ...) -> None: ...
 
 class RemoveAxisRequest(_message.Message):
     __slots__ = ("axis_id",)
@@ -26,17 +115,61 @@ class RemoveAxisRequest(_message.Message):
     axis_id: int
     def __init__(self, axis_id: _Optional[int] = ...) -> None: ...
 
+class ArmTriggerRequest(_message.Message):
+    __slots__ = ("axis_ids",)
+    AXIS_IDS_FIELD_NUMBER: _ClassVar[int]
+    axis_ids: _containers.RepeatedScalarFieldContainer[int]
+    def __init__(self, axis_ids: _Optional[_Iterable[int]] = ...) -> None: ...
+
+class DerivedSignal(_message.Message):
+    __slots__ = ("source_signal_id", "transform", "alpha", "taps", "window")
+    class Transform(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
+        __slots__ = ()
+        TRANSFORM_UNSPECIFIED: _ClassVar[DerivedSignal.Transform]
+        EMA: _ClassVar[DerivedSignal.Transform]
+        FIR: _ClassVar[DerivedSignal.Transform]
+        DIFF: _ClassVar[DerivedSignal.Transform]
+        RMS: _ClassVar[DerivedSignal.Transform]
+    TRANSFORM_UNSPECIFIED: DerivedSignal.Transform
+    EMA: DerivedSignal.Transform
+    FIR: DerivedSignal.Transform
+    DIFF: DerivedSignal.Transform
+    RMS: DerivedSignal.Transform
+    SOURCE_SIGNAL_ID_FIELD_NUMBER: _ClassVar[int]
+    TRANSFORM_FIELD_NUMBER: _ClassVar[int]
+    ALPHA_FIELD_NUMBER: _ClassVar[int]
+    TAPS_FIELD_NUMBER: _ClassVar[int]
+    WINDOW_FIELD_NUMBER: _ClassVar[int]
+    source_signal_id: int
+    transform: DerivedSignal.Transform
+    alpha: float
+    taps: _containers.RepeatedScalarFieldContainer[float]
+    window: int
+    def __init__(self, source_signal_id: _Optional[int] = ..., transform: _Optional[_Union[DerivedSignal.Transform, str]] = ..., alpha: _Optional[float] = ..., taps: _Optional[_Iterable[float]] = ..., window: _Optional[int] = ...) -> None: ...
+
+class Quantization(_message.Message):
+    __slots__ = ("min", "max")
+    MIN_FIELD_NUMBER: _ClassVar[int]
+    MAX_FIELD_NUMBER: _ClassVar[int]
+    min: float
+    max: float
+    def __init__(self, min: _Optional[float] = ..., max: _Optional[float] = ...) -> None: ...
+
 class AddSignalRequest(_message.Message):
-    __slots__ = ("axis_id", "signal_id", "signal_name", "signal_color")
+    __slots__ = ("axis_id", "signal_id", "signal_name", "signal_color", "derived", "quantization")
     AXIS_ID_FIELD_NUMBER: _ClassVar[int]
     SIGNAL_ID_FIELD_NUMBER: _ClassVar[int]
     SIGNAL_NAME_FIELD_NUMBER: _ClassVar[int]
     SIGNAL_COLOR_FIELD_NUMBER: _ClassVar[int]
+    DERIVED_FIELD_NUMBER: _ClassVar[int]
+    QUANTIZATION_FIELD_NUMBER: _ClassVar[int]
     axis_id: int
     signal_id: int
     signal_name: str
     signal_color: str
-    def __init__(self, axis_id: _Optional[int] = ..., signal_id: _Optional[int] = ..., signal_name: _Optional[str] = ..., signal_color: _Optional[str] = ...) -> None: ...
+    derived: DerivedSignal
+    quantization: Quantization
+    def __init__(self, axis_id: _Optional[int] = ..., signal_id: _Optional[int] = ..., signal_name: _Optional[str] = ..., signal_color: _Optional[str] = ..., derived: _Optional[_Union[DerivedSignal, _Mapping]] = ..., quantization: _Optional[_Union[Quantization, _Mapping]] = ...) -> None: ...
 
 class RemoveSignalRequest(_message.Message):
     __slots__ = ("signal_id",)
@@ -44,16 +177,200 @@ class RemoveSignalRequest(_message.Message):
     signal_id: int
     def __init__(self, signal_id: _Optional[int] = ...) -> None: ...
 
+class DashboardSpec(_message.Message):
+    __slots__ = ("axes", "signals")
+    AXES_FIELD_NUMBER: _ClassVar[int]
+    SIGNALS_FIELD_NUMBER: _ClassVar[int]
+    axes: _containers.RepeatedCompositeFieldContainer[AddAxisRequest]
+    signals: _containers.RepeatedCompositeFieldContainer[AddSignalRequest]
+    def __init__(self, axes: _Optional[_Iterable[_Union[AddAxisRequest, _Mapping]]] = ..., signals: _Optional[_Iterable[_Union[AddSignalRequest, _Mapping]]] = ...) -> None: ...
+
 class streamPoint(_message.Message):
-    __slots__ = ("signal_id", "value")
+    __slots__ = ("signal_id", "value", "timestamp")
     SIGNAL_ID_FIELD_NUMBER: _ClassVar[int]
     VALUE_FIELD_NUMBER: _ClassVar[int]
+    TIMESTAMP_FIELD_NUMBER: _ClassVar[int]
     signal_id: int
     value: float
-    def __init__(self, signal_id: _Optional[int] = ..., value: _Optional[float] = ...) -> None: ...
+    timestamp: float
+    def __init__(self, signal_id: _Optional[int] = ..., value: _Optional[float] = ..., timestamp: _Optional[float] = ...) -> None: ...
 
 class streamPointRequest(_message.Message):
-    __slots__ = ("points",)
+    __slots__ = ("points", "timestamp")
     POINTS_FIELD_NUMBER: _ClassVar[int]
+    TIMESTAMP_FIELD_NUMBER: _ClassVar[int]
     points: _containers.RepeatedCompositeFieldContainer[streamPoint]
-    def __init__(self, points: _Optional[_Iterable[_Union[streamPoint, _Mapping]]] = ...) -> None: ...
+    timestamp: float
+    def __init__(self, points: _Optional[_Iterable[_Union[streamPoint, _Mapping]]] = ..., timestamp: _Optional[float] = ...) -> None: ...
+
+class packedSamples(_message.Message):
+    __slots__ = ("signal_id", "values", "raw_values", "timestamps", "raw_timestamps", "start_time", "sample_period", "quantized_values")
+    SIGNAL_ID_FIELD_NUMBER: _ClassVar[int]
+    VALUES_FIELD_NUMBER: _ClassVar[int]
+    RAW_VALUES_FIELD_NUMBER: _ClassVar[int]
+    TIMESTAMPS_FIELD_NUMBER: _ClassVar[int]
+    RAW_TIMESTAMPS_FIELD_NUMBER: _ClassVar[int]
+    START_TIME_FIELD_NUMBER: _ClassVar[int]
+    SAMPLE_PERIOD_FIELD_NUMBER: _ClassVar[int]
+    QUANTIZED_VALUES_FIELD_NUMBER: _ClassVar[int]
+    signal_id: int
+    values: _containers.RepeatedScalarFieldContainer[float]
+    raw_values: bytes
+    timestamps: _containers.RepeatedScalarFieldContainer[float]
+    raw_timestamps: bytes
+    start_time: float
+    sample_period: float
+    quantized_values: bytes
+    def __init__(self, signal_id: _Optional[int] = ..., values: _Optional[_Iterable[float]] = ..., raw_values: _Optional[bytes] = ..., timestamps: _Optional[_Iterable[float]] = ..., raw_timestamps: _Optional[bytes] = ..., start_time: _Optional[float] = ..., sample_period: _Optional[float] = ..., quantized_values: _Optional[bytes] = ...) -> None: ...
+
+class streamPackedRequest(_message.Message):
+    __slots__ = ("signals",)
+    SIGNALS_FIELD_NUMBER: _ClassVar[int]
+    signals: _containers.RepeatedCompositeFieldContainer[packedSamples]
+    def __init__(self, signals: _Optional[_Iterable[_Union[packedSamples, _Mapping]]] = ...) -> None: ...
+
+class SubscribeRequest(_message.Message):
+    __slots__ = ("session", "signal_ids", "max_rate")
+    SESSION_FIELD_NUMBER: _ClassVar[int]
+    SIGNAL_IDS_FIELD_NUMBER: _ClassVar[int]
+    MAX_RATE_FIELD_NUMBER: _ClassVar[int]
+    session: str
+    signal_ids: _containers.RepeatedScalarFieldContainer[int]
+    max_rate: float
+    def __init__(self, session: _Optional[str] = ..., signal_ids: _Optional[_Iterable[int]] = ..., max_rate: _Optional[float] = ...) -> None: ...
+
+class SnapshotRequest(_message.Message):
+    __slots__ = ("name",)
+    NAME_FIELD_NUMBER: _ClassVar[int]
+    name: str
+    def __init__(self, name: _Optional[str] = ...) -> None: ...
+
+class SnapshotResponse(_message.Message):
+    __slots__ = ("path", "signals", "samples", "bytes")
+    PATH_FIELD_NUMBER: _ClassVar[int]
+    SIGNALS_FIELD_NUMBER: _ClassVar[int]
+    SAMPLES_FIELD_NUMBER: _ClassVar[int]
+    BYTES_FIELD_NUMBER: _ClassVar[int]
+    path: str
+    signals: int
+    samples: int
+    bytes: int
+    def __init__(self, path: _Optional[str] = ..., signals: _Optional[int] = ..., samples: _Optional[int] = ..., bytes: _Optional[int] = ...) -> None: ...
+
+class HistogramSummary(_message.Message):
+    __slots__ = ("count", "mean", "p50", "p90", "p99", "max")
+    COUNT_FIELD_NUMBER: _ClassVar[int]
+    MEAN_FIELD_NUMBER: _ClassVar[int]
+    P50_FIELD_NUMBER: _ClassVar[int]
+    P90_FIELD_NUMBER: _ClassVar[int]
+    P99_FIELD_NUMBER: _ClassVar[int]
+    MAX_FIELD_NUMBER: _ClassVar[int]
+    count: int
+    mean: float
+    p50: float
+    p90: float
+    p99: float
+    max: float
+    def __init__(self, count: _Optional[int] = ..., mean: _Optional[float] = ..., p50: _Optional[float] = ..., p90: _Optional[float] = ..., p99: _Optional[float] = ..., max: _Optional[float] = ...) -> None: ...
+
+class StreamStats(_message.Message):
+    __slots__ = ("stream_id", "peer", "seconds", "batches", "points", "points_per_sec")
+    STREAM_ID_FIELD_NUMBER: _ClassVar[int]
+    PEER_FIELD_NUMBER: _ClassVar[int]
+    SECONDS_FIELD_NUMBER: _ClassVar[int]
+    BATCHES_FIELD_NUMBER: _ClassVar[int]
+    POINTS_FIELD_NUMBER: _ClassVar[int]
+    POINTS_PER_SEC_FIELD_NUMBER: _ClassVar[int]
+    stream_id: int
+    peer: str
+    seconds: float
+    batches: int
+    points: int
+    points_per_sec: float
+    def __init__(self, stream_id: _Optional[int] = ..., peer: _Optional[str] = ..., seconds: _Optional[float] = ..., batches: _Optional[int] = ..., points: _Optional[int] = ..., points_per_sec: _Optional[float] = ...) -> None: ...
+
+class SessionStats(_message.Message):
+    __slots__ = ("name", "axes", "signals", "points", "points_per_sec", "dropped_points", "unknown_points")
+    NAME_FIELD_NUMBER: _ClassVar[int]
+    AXES_FIELD_NUMBER: _ClassVar[int]
+    SIGNALS_FIELD_NUMBER: _ClassVar[int]
+    POINTS_FIELD_NUMBER: _ClassVar[int]
+    POINTS_PER_SEC_FIELD_NUMBER: _ClassVar[int]
+    DROPPED_POINTS_FIELD_NUMBER: _ClassVar[int]
+    UNKNOWN_POINTS_FIELD_NUMBER: _ClassVar[int]
+    name: str
+    axes: int
+    signals: int
+    points: int
+    points_per_sec: float
+    dropped_points: int
+    unknown_points: int
+    def __init__(self, name: _Optional[str] = ..., axes: _Optional[int] = ..., signals: _Optional[int] = ..., points: _Optional[int] = ..., points_per_sec: _Optional[float] = ..., dropped_points: _Optional[int] = ..., unknown_points: _Optional[int] = ...) -> None: ...
+
+class SubscriberStats(_message.Message):
+    __slots__ = ("peer", "session", "signals", "max_rate", "messages_sent", "messages_dropped", "queued")
+    PEER_FIELD_NUMBER: _ClassVar[int]
+    SESSION_FIELD_NUMBER: _ClassVar[int]
+    SIGNALS_FIELD_NUMBER: _ClassVar[int]
+    MAX_RATE_FIELD_NUMBER: _ClassVar[int]
+    MESSAGES_SENT_FIELD_NUMBER: _ClassVar[int]
+    MESSAGES_DROPPED_FIELD_NUMBER: _ClassVar[int]
+    QUEUED_FIELD_NUMBER: _ClassVar[int]
+    peer: str
+    session: str
+    signals: int
+    max_rate: float
+    messages_sent: int
+    messages_dropped: int
+    queued: int
+    def __init__(self, peer: _Optional[str] = ..., session: _Optional[str] = ..., signals: _Optional[int] = ..., max_rate: _Optional[float] = ..., messages_sent: _Optional[int] = ..., messages_dropped: _Optional[int] = ..., queued: _Optional[int] = ...) -> None: ...
+
+class StatsResponse(_message.Message):
+    __slots__ = ("uptime_s", "batches_received", "points_received", "batches_per_sec", "points_per_sec", "decode_us", "streams", "queue_depth", "queue_capacity", "queue_max_depth", "queue_dropped", "queue_merged", "queue_lag_ms", "frames", "frames_per_sec", "frame_ms", "apply_ms", "points_applied", "unknown_signal_hits", "sessions", "subscribers", "startup_accept_ms", "startup_first_frame_ms")
+    UPTIME_S_FIELD_NUMBER: _ClassVar[int]
+    BATCHES_RECEIVED_FIELD_NUMBER: _ClassVar[int]
+    POINTS_RECEIVED_FIELD_NUMBER: _ClassVar[int]
+    BATCHES_PER_SEC_FIELD_NUMBER: _ClassVar[int]
+    POINTS_PER_SEC_FIELD_NUMBER: _ClassVar[int]
+    DECODE_US_FIELD_NUMBER: _ClassVar[int]
+    STREAMS_FIELD_NUMBER: _ClassVar[int]
+    QUEUE_DEPTH_FIELD_NUMBER: _ClassVar[int]
+    QUEUE_CAPACITY_FIELD_NUMBER: _ClassVar[int]
+    QUEUE_MAX_DEPTH_FIELD_NUMBER: _ClassVar[int]
+    QUEUE_DROPPED_FIELD_NUMBER: _ClassVar[int]
+    QUEUE_MERGED_FIELD_NUMBER: _ClassVar[int]
+    QUEUE_LAG_MS_FIELD_NUMBER: _ClassVar[int]
+    FRAMES_FIELD_NUMBER: _ClassVar[int]
+    FRAMES_PER_SEC_FIELD_NUMBER: _ClassVar[int]
+    FRAME_MS_FIELD_NUMBER: _ClassVar[int]
+    APPLY_MS_FIELD_NUMBER: _ClassVar[int]
+    POINTS_APPLIED_FIELD_NUMBER: _ClassVar[int]
+    UNKNOWN_SIGNAL_HITS_FIELD_NUMBER: _ClassVar[int]
+    SESSIONS_FIELD_NUMBER: _ClassVar[int]
+    SUBSCRIBERS_FIELD_NUMBER: _ClassVar[int]
+    STARTUP_ACCEPT_MS_FIELD_NUMBER: _ClassVar[int]
+    STARTUP_FIRST_FRAME_MS_FIELD_NUMBER: _ClassVar[int]
+    uptime_s: float
+    batches_received: int
+    points_received: int
+    batches_per_sec: float
+    points_per_sec: float
+    decode_us: HistogramSummary
+    streams: _containers.RepeatedCompositeFieldContainer[StreamStats]
+    queue_depth: int
+    queue_capacity: int
+    queue_max_depth: int
+    queue_dropped: int
+    queue_merged: int
+    queue_lag_ms: HistogramSummary
+    frames: int
+    frames_per_sec: float
+    frame_ms: HistogramSummary
+    apply_ms: HistogramSummary
+    points_applied: int
+    unknown_signal_hits: int
+    sessions: _containers.RepeatedCompositeFieldContainer[SessionStats]
+    subscribers: _containers.RepeatedCompositeFieldContainer[SubscriberStats]
+    startup_accept_ms: float
+    startup_first_frame_ms: float
+    def __init__(self, uptime_s: _Optional[float] = ..., batches_received: _Optional[int] = ..., points_received: _Optional[int] = ..., batches_per_sec: _Optional[float] = ..., points_per_sec: _Optional[float] = ..., decode_us: _Optional[_Union[HistogramSummary, _Mapping]] = ..., streams: _Optional[_Iterable[_Union[StreamStats, _Mapping]]] = ..., queue_depth: _Optional[int] = ..., queue_capacity: _Optional[int] = ..., queue_max_depth: _Optional[int] = ..., queue_dropped: _Optional[int] = ..., queue_merged: _Optional[int] = ..., queue_lag_ms: _Optional[_Union[HistogramSummary, _Mapping]] = ..., frames: _Optional[int] = ..., frames_per_sec: _Optional[float] = ..., frame_ms: _Optional[_Union[HistogramSummary, _Mapping]] = ..., apply_ms: _Optional[_Union[HistogramSummary, _Mapping]] = ..., points_applied: _Optional[int] = ..., unknown_signal_hits: _Optional[int] = ..., sessions: _Optional[_Iterable[_Union[SessionStats, _Mapping]]] = ..., subscribers: _Optional[_Iterable[_Union[SubscriberStats, _Mapping]]] = ..., startup_accept_ms: _Optional[float] = ..., startup_first_frame_ms: _Optional[float] = ...) -> None: ...
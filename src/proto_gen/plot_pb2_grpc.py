@@ -27,8 +27,12 @@ if _version_not_supported:
 
 
 class PlotServiceStub(object):
-    """
-
+    """Calls can carry a `session-id` metadata entry, naming the producer
+    session they belong to. Each named session has its own axis and
+    signal IDs (two sessions can both use signal 10), its own ingest
+    quota and share of the ingest queue, and ConfigureDashboard and
+    clearAll only replace or clear its own axes. Calls without it are in
+    the default session, whose IDs must be below 2^31.
     """
 
     def __init__(self, channel):
@@ -62,16 +66,50 @@ class PlotServiceStub(object):
                 request_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
                 response_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
                 _registered_method=True)
+        self.ConfigureDashboard = channel.unary_unary(
+                '/PlotService/ConfigureDashboard',
+                request_serializer=src_dot_proto__gen_dot_plot__pb2.DashboardSpec.SerializeToString,
+                response_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+                _registered_method=True)
+        self.ArmTrigger = channel.unary_unary(
+                '/PlotService/ArmTrigger',
+                request_serializer=src_dot_proto__gen_dot_plot__pb2.ArmTriggerRequest.SerializeToString,
+                response_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+                _registered_method=True)
+        self.GetStats = channel.unary_unary(
+                '/PlotService/GetStats',
+                request_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+                response_deserializer=src_dot_proto__gen_dot_plot__pb2.StatsResponse.FromString,
+                _registered_method=True)
+        self.Snapshot = channel.unary_unary(
+                '/PlotService/Snapshot',
+                request_serializer=src_dot_proto__gen_dot_plot__pb2.SnapshotRequest.SerializeToString,
+                response_deserializer=src_dot_proto__gen_dot_plot__pb2.SnapshotResponse.FromString,
+                _registered_method=True)
         self.streamPlot = channel.stream_unary(
                 '/PlotService/streamPlot',
                 request_serializer=src_dot_proto__gen_dot_plot__pb2.streamPointRequest.SerializeToString,
                 response_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
                 _registered_method=True)
+        self.streamPlotPacked = channel.stream_unary(
+                '/PlotService/streamPlotPacked',
+                request_serializer=src_dot_proto__gen_dot_plot__pb2.streamPackedRequest.SerializeToString,
+                response_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+                _registered_method=True)
+        self.Subscribe = channel.unary_stream(
+                '/PlotService/Subscribe',
+                request_serializer=src_dot_proto__gen_dot_plot__pb2.SubscribeRequest.SerializeToString,
+                response_deserializer=src_dot_proto__gen_dot_plot__pb2.streamPackedRequest.FromString,
+                _registered_method=True)
 
 
 class PlotServiceServicer(object):
-    """
-
+    """Calls can carry a `session-id` metadata entry, naming the producer
+    session they belong to. Each named session has its own axis and
+    signal IDs (two sessions can both use signal 10), its own ingest
+    quota and share of the ingest queue, and ConfigureDashboard and
+    clearAll only replace or clear its own axes. Calls without it are in
+    the default session, whose IDs must be below 2^31.
     """
 
     def AddAxis(self, request, context):
@@ -105,8 +143,51 @@ class PlotServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def ConfigureDashboard(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ArmTrigger(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetStats(self, request, context):
+        """Monitor
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Snapshot(self, request, context):
+        """Export the buffers to a file (returns once it is written)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def streamPlot(self, request_iterator, context):
         """Stream
+        Both streams accept gRPC message compression (e.g. gzip): set it on
+        the client's channel or call, the server negotiates it.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def streamPlotPacked(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Subscribe(self, request, context):
+        """Fan-out: receive the live data of some signals. A subscriber that
+        reads too slowly loses its oldest messages; it never slows down the
+        producers or the window.
         """
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
@@ -140,11 +221,41 @@ def add_PlotServiceServicer_to_server(servicer, server):
                     request_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
                     response_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
             ),
+            'ConfigureDashboard': grpc.unary_unary_rpc_method_handler(
+                    servicer.ConfigureDashboard,
+                    request_deserializer=src_dot_proto__gen_dot_plot__pb2.DashboardSpec.FromString,
+                    response_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+            ),
+            'ArmTrigger': grpc.unary_unary_rpc_method_handler(
+                    servicer.ArmTrigger,
+                    request_deserializer=src_dot_proto__gen_dot_plot__pb2.ArmTriggerRequest.FromString,
+                    response_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+            ),
+            'GetStats': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetStats,
+                    request_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+                    response_serializer=src_dot_proto__gen_dot_plot__pb2.StatsResponse.SerializeToString,
+            ),
+            'Snapshot': grpc.unary_unary_rpc_method_handler(
+                    servicer.Snapshot,
+                    request_deserializer=src_dot_proto__gen_dot_plot__pb2.SnapshotRequest.FromString,
+                    response_serializer=src_dot_proto__gen_dot_plot__pb2.SnapshotResponse.SerializeToString,
+            ),
             'streamPlot': grpc.stream_unary_rpc_method_handler(
                     servicer.streamPlot,
                     request_deserializer=src_dot_proto__gen_dot_plot__pb2.streamPointRequest.FromString,
                     response_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
             ),
+            'streamPlotPacked': grpc.stream_unary_rpc_method_handler(
+                    servicer.streamPlotPacked,
+                    request_deserializer=src_dot_proto__gen_dot_plot__pb2.streamPackedRequest.FromString,
+                    response_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+            ),
+            'Subscribe': grpc.unary_stream_rpc_method_handler(
+                    servicer.Subscribe,
+                    request_deserializer=src_dot_proto__gen_dot_plot__pb2.SubscribeRequest.FromString,
+                    response_serializer=src_dot_proto__gen_dot_plot__pb2.streamPackedRequest.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'PlotService', rpc_method_handlers)
@@ -154,8 +265,12 @@ def add_PlotServiceServicer_to_server(servicer, server):
 
  # This class is part of an EXPERIMENTAL API.
 class PlotService(object):
-    """
-
+    """Calls can carry a `session-id` metadata entry, naming the producer
+    session they belong to. Each named session has its own axis and
+    signal IDs (two sessions can both use signal 10), its own ingest
+    quota and share of the ingest queue, and ConfigureDashboard and
+    clearAll only replace or clear its own axes. Calls without it are in
+    the default session, whose IDs must be below 2^31.
     """
 
     @staticmethod
@@ -293,6 +408,114 @@ class PlotService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def ConfigureDashboard(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/PlotService/ConfigureDashboard',
+            src_dot_proto__gen_dot_plot__pb2.DashboardSpec.SerializeToString,
+            google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ArmTrigger(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/PlotService/ArmTrigger',
+            src_dot_proto__gen_dot_plot__pb2.ArmTriggerRequest.SerializeToString,
+            google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetStats(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/PlotService/GetStats',
+            google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+            src_dot_proto__gen_dot_plot__pb2.StatsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Snapshot(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/PlotService/Snapshot',
+            src_dot_proto__gen_dot_plot__pb2.SnapshotRequest.SerializeToString,
+            src_dot_proto__gen_dot_plot__pb2.SnapshotResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def streamPlot(request_iterator,
             target,
@@ -319,3 +542,57 @@ class PlotService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def streamPlotPacked(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/PlotService/streamPlotPacked',
+            src_dot_proto__gen_dot_plot__pb2.streamPackedRequest.SerializeToString,
+            google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Subscribe(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/PlotService/Subscribe',
+            src_dot_proto__gen_dot_plot__pb2.SubscribeRequest.SerializeToString,
+            src_dot_proto__gen_dot_plot__pb2.streamPackedRequest.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -0,0 +1,170 @@
+import numpy as np
+
+# --- Ring Buffer Bank ---
+# Fixed-size scrolling buffers of samples, one row per signal, each row
+# with its own capacity and write index, all in one flat array. Since
+# all rows share the backing array, runs of samples for any number of
+# rows are appended with a single fancy-index scatter.
+#
+# Every sample is written twice (at `i` and `i + capacity` of its row),
+# so the samples of a row in chronological order are always available
+# as one contiguous slice and reading the window never copies.
+#
+# A bank can hold several parallel channels (e.g. values and their
+# timestamps) that share the rows and write indices.
+class RingBufferBank:
+
+    def __init__(self, channels=1, dtype=np.float64):
+        self.channels = int(channels)
+        # Row `i` owns data[:, offset[i]:offset[i] + 2 * capacity[i]]
+        self._data = np.zeros((self.channels, 0), dtype=dtype)
+        self._offset = np.zeros(0, dtype=np.int64)
+        self.capacity = np.zeros(0, dtype=np.int64)
+
+        # Per-row index of the oldest sample (and next slot to be written)
+        self._head = np.zeros(0, dtype=np.int64)
+        # Per-row total number of samples ever written
+        self.written = np.zeros(0, dtype=np.int64)
+
+    @property
+    def rows(self):
+        return len(self._head)
+
+    def insert_row(self, row, capacity):
+        """
+        Inserts an empty (zero-filled) row before `row` (or at the end if
+        `row` == rows). The rows after it move down by one.
+        """
+        self.insert_rows([row], [capacity])
+
+    def insert_rows(self, rows, capacities):
+        """
+        Inserts several empty rows at once, with a single reallocation.
+        `rows` are the (distinct) indices the new rows will have once
+        inserted; the existing rows keep their order around them.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        capacities = np.asarray(capacities, dtype=np.int64)
+        if not len(rows):
+            return
+        if capacities.min() <= 0:
+            raise ValueError(f"RingBufferBank row capacity must be positive, got {capacities.min()}")
+
+        is_new = np.zeros(self.rows + len(rows), dtype=bool)
+        is_new[rows] = True
+        capacity = np.empty(len(is_new), dtype=np.int64)
+        capacity[is_new] = capacities
+        capacity[~is_new] = self.capacity
+
+        sizes = 2 * capacity
+        offset = np.cumsum(sizes) - sizes
+
+        # Move every existing row to its new offset with one scatter
+        data = np.zeros((self.channels, int(sizes.sum())), dtype=self._data.dtype)
+        shift = offset[~is_new] - self._offset
+        data[:, np.arange(self._data.shape[1]) + np.repeat(shift, 2 * self.capacity)] = self._data
+
+        head = np.zeros(len(is_new), dtype=np.int64)
+        head[~is_new] = self._head
+        written = np.zeros(len(is_new), dtype=np.int64)
+        written[~is_new] = self.written
+
+        self._data = data
+        self._offset = offset
+        self.capacity = capacity
+        self._head = head
+        self.written = written
+
+    def remove_rows(self, row, count=1):
+        """
+        Deletes `count` rows starting at `row`. The rows after them move up.
+        """
+        if count <= 0:
+            return
+        start = self._offset[row]
+        end = self._offset[row + count - 1] + 2 * self.capacity[row + count - 1]
+        self._data = np.concatenate((self._data[:, :start], self._data[:, end:]), axis=1)
+
+        removed = slice(row, row + count)
+        self._offset[row + count:] -= end - start
+        self._offset = np.delete(self._offset, removed)
+        self.capacity = np.delete(self.capacity, removed)
+        self._head = np.delete(self._head, removed)
+        self.written = np.delete(self.written, removed)
+
+    def extend_rows(self, rows, lengths, values):
+        """
+        Appends runs of samples to some rows.
+        `values` is the concatenation of the runs (shape (n,), or
+        (channels, n) for a multi-channel bank), run `i` being
+        `lengths[i]` samples long and going to row `rows[i]`. A row may
+        appear several times; its runs are appended in order.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        lengths = np.asarray(lengths, dtype=np.int64)
+        if not len(rows):
+            return
+        values = np.asarray(values).reshape(self.channels, -1)
+
+        # Total appended per row
+        totals = np.bincount(rows, weights=lengths, minlength=self.rows).astype(np.int64)
+        unique_rows = len(rows) == 1 or np.bincount(rows).max() == 1
+
+        if unique_rows and len(rows) == values.shape[1] and lengths.min() == 1:
+            # Fast path: a single sample per row
+            sample_rows = rows
+            position = self._offset[rows] + self._head[rows]
+        else:
+            # Rank of every sample within everything appended to its row
+            sample_rows = np.repeat(rows, lengths)
+            run_starts = np.cumsum(lengths) - lengths
+            if unique_rows:
+                run_offset = 0
+            else:
+                run_offset = self._run_offsets(rows, lengths)
+            rank = np.arange(len(sample_rows)) - np.repeat(run_starts - run_offset, lengths)
+
+            # Only the newest `capacity` samples of each row survive
+            capacity = self.capacity[sample_rows]
+            if (totals > self.capacity).any():
+                keep = rank >= totals[sample_rows] - capacity
+                sample_rows, rank, capacity, values = (
+                    sample_rows[keep], rank[keep], capacity[keep], values[:, keep])
+
+            position = self._offset[sample_rows] + (self._head[sample_rows] + rank) % capacity
+
+        self._data[:, position] = values
+        self._data[:, position + self.capacity[sample_rows]] = values
+
+        self._head += totals
+        self._head %= self.capacity
+        self.written += totals
+
+    @staticmethod
+    def _run_offsets(rows, lengths):
+        """
+        For each run, the number of samples of earlier runs to the same row.
+        """
+        order = np.argsort(rows, kind='stable')
+        sorted_rows = rows[order]
+        sorted_lengths = lengths[order]
+        starts = np.cumsum(sorted_lengths) - sorted_lengths
+        group_start = np.r_[True, sorted_rows[1:] != sorted_rows[:-1]]
+        group_base = np.maximum.accumulate(np.where(group_start, starts, 0))
+        run_offset = np.empty_like(lengths)
+        run_offset[order] = starts - group_base
+        return run_offset
+
+    def row_view(self, row, channel=0):
+        """
+        Returns the window of one row, oldest sample first, as a
+        zero-copy view (valid until the next write).
+        """
+        start = self._offset[row] + self._head[row]
+        return self._data[channel, start:start + self.capacity[row]]
+
+    def clear(self):
+        """
+        Removes all rows.
+        """
+        self.remove_rows(0, self.rows)
@@ -0,0 +1,154 @@
+from typing import NamedTuple
+
+import numpy as np
+
+# --- Sample Blocks ---
+# Columnar form of everything that is streamed in. Both streaming RPCs
+# are decoded into SampleBlocks on the gRPC threads, so the GUI thread
+# only deals with NumPy arrays.
+#
+# A block is a list of runs: run `i` is `lengths[i]` consecutive samples
+# of signal `signal_ids[i]`. `values` and `timestamps` hold the samples
+# of all runs back to back.
+class SampleBlock(NamedTuple):
+    signal_ids: np.ndarray  # int64, one per run
+    lengths: np.ndarray     # int64, one per run
+    values: np.ndarray      # float64, one per sample
+    timestamps: np.ndarray  # float64 (seconds), one per sample
+
+    @property
+    def size(self):
+        """Number of samples in the block."""
+        return len(self.values)
+
+
+def concatenate_blocks(blocks):
+    """
+    Joins blocks into one, keeping their order.
+    """
+    if len(blocks) == 1:
+        return blocks[0]
+    return SampleBlock(*(np.concatenate(columns) for columns in zip(*blocks)))
+
+
+def decode_point_batch(batch, receive_time):
+    """
+    Converts a streamPointRequest into a block of runs of length 1.
+    Points without a timestamp get the request's, or else `receive_time`.
+    """
+    points = batch.points
+    signal_ids = np.array([point.signal_id for point in points], dtype=np.int64)
+    values = np.array([point.value for point in points], dtype=np.float64)
+    timestamps = np.array([point.timestamp for point in points], dtype=np.float64)
+
+    timestamps[timestamps == 0] = batch.timestamp or receive_time
+
+    return SampleBlock(signal_ids, np.ones(len(points), dtype=np.int64), values, timestamps)
+
+
+# Largest 16-bit quantization code
+QUANTIZATION_LEVELS = 65535
+
+
+def quantization_scale(quantization):
+    """
+    (offset, step) of a Quantization message: code c stands for
+    offset + c * step.
+    """
+    return quantization.min, (quantization.max - quantization.min) / QUANTIZATION_LEVELS
+
+
+def quantize_values(values, offset, step):
+    """
+    Encodes values as the `quantized_values` bytes of a packedSamples
+    message. Values are clamped to the range; NaN is sent as its top.
+    """
+    codes = np.rint((np.asarray(values, dtype=np.float64) - offset) / step)
+    # fmin/fmax, unlike clip, turn NaN into a valid code
+    codes = np.fmax(np.fmin(codes, QUANTIZATION_LEVELS), 0).astype('<u2')
+    # uint16 arithmetic: the differences wrap modulo 65536
+    return np.diff(codes, prepend=np.zeros(1, '<u2')).tobytes()
+
+
+def decode_quantized_values(data, offset, step):
+    """Inverse of quantize_values()."""
+    codes = np.cumsum(np.frombuffer(data, dtype='<u2'), dtype=np.uint16)
+    return offset + codes * step
+
+
+def decode_packed_values(samples, quantizations=None):
+    """
+    Converts the values of a packedSamples message into a NumPy array.
+    `raw_values` is read zero-copy, `quantized_values` is decoded with
+    the signal's (offset, step) from `quantizations`; `values` is used
+    otherwise.
+    """
+    if samples.raw_values:
+        return np.frombuffer(samples.raw_values, dtype='<f4')
+    if samples.quantized_values:
+        scale = quantizations.get(samples.signal_id) if quantizations is not None else None
+        if scale is None:
+            raise ValueError(f"signal {samples.signal_id} sent quantized values "
+                             f"but was declared without a quantization")
+        return decode_quantized_values(samples.quantized_values, *scale)
+    return np.array(samples.values, dtype=np.float32)
+
+
+def decode_packed_timestamps(samples, n, receive_time, previous_time):
+    """
+    Returns the `n` timestamps of a packedSamples message (see the
+    precedence rules in plot.proto). `previous_time` is the timestamp of
+    the last sample received for the signal, or None.
+    """
+    if samples.raw_timestamps:
+        timestamps = np.frombuffer(samples.raw_timestamps, dtype='<f8')
+    elif len(samples.timestamps):
+        timestamps = np.array(samples.timestamps, dtype=np.float64)
+    else:
+        timestamps = None
+
+    if timestamps is not None:
+        if len(timestamps) != n:
+            raise ValueError(f"signal {samples.signal_id} has {n} values but {len(timestamps)} timestamps")
+        return timestamps
+
+    if samples.sample_period > 0:
+        start = samples.start_time or receive_time - (n - 1) * samples.sample_period
+        return start + np.arange(n) * samples.sample_period
+
+    if previous_time is None or previous_time >= receive_time:
+        return np.full(n, receive_time)
+    return np.linspace(previous_time, receive_time, n + 1)[1:]
+
+
+def decode_packed_request(request, receive_time, last_sample_time, quantizations=None):
+    """
+    Converts a streamPackedRequest into a block.
+    `last_sample_time` maps signal IDs to the timestamp of their latest
+    sample. It is read and updated here. `quantizations` maps the IDs of
+    quantized signals to their (offset, step).
+    """
+    signal_ids, lengths, values, timestamps = [], [], [], []
+    for samples in request.signals:
+        run_values = decode_packed_values(samples, quantizations)
+        n = len(run_values)
+        if not n:
+            continue
+        run_timestamps = decode_packed_timestamps(
+            samples, n, receive_time, last_sample_time.get(samples.signal_id))
+        last_sample_time[samples.signal_id] = float(run_timestamps[-1])
+
+        signal_ids.append(samples.signal_id)
+        lengths.append(n)
+        values.append(run_values)
+        timestamps.append(run_timestamps)
+
+    if not signal_ids:
+        return None
+
+    return SampleBlock(
+        np.array(signal_ids, dtype=np.int64),
+        np.array(lengths, dtype=np.int64),
+        np.concatenate(values).astype(np.float64, copy=False),
+        np.concatenate(timestamps).astype(np.float64, copy=False),
+    )
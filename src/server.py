@@ -0,0 +1,64 @@
+import threading
+import time
+from concurrent import futures
+
+import grpc
+
+from .plot_servicer import PlotServicer, add_to_server
+from .aio_server import start_aio_server
+from .capture import CaptureWriter, replay_capture
+
+# --- Ingest side of the application ---
+# Everything that receives data: the servicer, the gRPC server, capture
+# and replay. Runs in the GUI process, or on its own in the ingest
+# process (see ingest_process.py). `args` are the parsed command line
+# options of src.app.
+
+
+def create_servicer(args):
+    capture = CaptureWriter(args.record) if args.record else None
+    return PlotServicer(queue_capacity=args.queue_capacity,
+                        overflow_policy=args.overflow_policy,
+                        capture=capture,
+                        session_quota=args.session_quota)
+
+
+def start_serving(servicer, args):
+    """
+    Starts the gRPC server (and the replay, if any) in the background.
+    It doesn't need to be connected to its consumer yet: requests wait
+    in the ingest queue (see MainWindow.set_servicer()). Returns the
+    threaded server, which the caller must keep a reference to (None
+    with --aio: that one lives in its event loop thread).
+    """
+    port = args.port
+    server = None
+    if args.aio:
+        start_aio_server(servicer, f'[::]:{port}')
+        print(f"--- gRPC Plot Server (asyncio) running in background on port {port} ---")
+    else:
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=args.max_workers))
+        add_to_server(servicer, server)
+
+        # (MODIFIED) Use the port from argparse
+        server.add_insecure_port(f'[::]:{port}')
+
+        # Doesn't block: the server runs on its own threads
+        server.start()
+
+        # (MODIFIED) Print the port being used
+        print(f"--- gRPC Plot Server running in background on port {port} ---")
+
+    # Accepting from here on
+    launch_time = getattr(args, 'launch_time', None)
+    if launch_time is not None:
+        servicer.stats.accept_ms = (time.time() - launch_time) * 1e3
+        print(f"[Startup] Accepting connections {servicer.stats.accept_ms:.0f} ms after launch")
+
+    # Replayed requests go through the same queue as the live ones
+    if args.replay:
+        replay_thread = threading.Thread(
+            target=replay_capture, args=(args.replay, servicer, args.replay_speed), daemon=True)
+        replay_thread.start()
+
+    return server
@@ -0,0 +1,421 @@
+import itertools
+import threading
+import time
+
+import numpy as np
+
+from src.proto_gen import plot_pb2
+
+from .sample_block import SampleBlock, quantization_scale
+from .stats import RateMeter
+
+# --- Producer sessions ---
+# Every RPC belongs to a session, named by the `session-id` metadata of
+# the call (see plot.proto). Calls without it are in the default
+# session, whose IDs are used as they are: a single producer doesn't
+# have to know about sessions.
+#
+# A named session has its own namespace: its axis and signal IDs are
+# mapped to global IDs, allocated from GLOBAL_ID_BASE upwards, before
+# the requests reach the ingest queue. Two producers can then both use
+# signal 10. The window, the capture files and the shared ring only
+# ever see global IDs.
+#
+# The servicer also keeps what each session declared, so that
+# ConfigureDashboard and clearAll only replace or clear the calling
+# session's axes and signals: the window is sent the dashboards of all
+# sessions merged into one.
+#
+# Only declared IDs (and the sources their declarations refer to) get a
+# global ID, at most MAX_SESSION_IDS of each kind per session, and there
+# are at most MAX_SESSIONS named sessions: an idle one (nothing declared,
+# no recent calls) is dropped with its mappings to make room for a new
+# one. Its global IDs are never handed out again, so a stream or
+# subscription still holding them can't reach another session's signals. Samples a
+# named session sends for other signals, and those the default session
+# sends for IDs in the range of the global ones, are dropped and counted.
+
+SESSION_METADATA_KEY = 'session-id'
+
+# Global IDs of named sessions. The default session must stay below.
+GLOBAL_ID_BASE = 1 << 31
+
+# Axis (and signal) IDs a named session can map
+MAX_SESSION_IDS = 65536
+
+# Named sessions kept at once. When a new one would go over, the idle
+# ones are dropped first
+MAX_SESSIONS = 256
+
+# A named session with nothing declared is idle after this many seconds
+# without calls or samples
+SESSION_IDLE_TIMEOUT = 60.0
+
+
+def session_name(context):
+    """Session of a call, from its metadata ('' for the default one)."""
+    if context is None:
+        return ''
+    for key, value in context.invocation_metadata() or ():
+        if key == SESSION_METADATA_KEY:
+            return value
+    return ''
+
+
+def axis_source_ids(request):
+    """The signal IDs an AddAxisRequest refers to (trigger, spectrogram)."""
+    return [getattr(request, field).signal_id for field in ('trigger', 'spectrogram')
+            if request.HasField(field)]
+
+
+def validate_session_ids(name, axis_ids=(), signal_ids=()):
+    """
+    Checks that IDs sent in session `name` are not in the range of the
+    global IDs. Raises ValueError otherwise.
+    """
+    if name:
+        return
+    for what, ids in (('axis', axis_ids), ('signal', signal_ids)):
+        for local_id in ids:
+            if local_id >= GLOBAL_ID_BASE:
+                raise ValueError(f"{what} ID {local_id} is reserved for sessions "
+                                 f"(must be below {GLOBAL_ID_BASE})")
+
+
+class Quota:
+    """
+    Token bucket: `rate` points per second, with bursts of up to one
+    second's worth. A batch is admitted while there are tokens left and
+    may overdraw them, so batches larger than the bucket still get
+    through, just less often. A rate of 0 admits everything.
+    """
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.tokens = rate
+        self.last = time.monotonic()
+
+    def admit(self, points):
+        """Takes `points` tokens if there are enough. Not thread-safe."""
+        if not self.rate:
+            return True
+        now = time.monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+        if self.tokens <= 0:
+            return False
+        self.tokens -= points
+        return True
+
+
+class Session:
+    """
+    One producer's namespace, quota and declared dashboard. The request
+    mapping methods return the requests with global IDs.
+    """
+
+    def __init__(self, registry, name, index, quota):
+        self.registry = registry
+        self.name = name
+        # Position in the merged dashboard
+        self.index = index
+        self.quota = Quota(quota)
+        self.last_active = time.monotonic()
+        self._lock = threading.Lock()
+        self._last_quota_report = 0.0
+
+        # Local -> global IDs (named sessions only)
+        self._axis_ids = {}
+        self._signal_ids = {}
+        # Sorted local signal IDs and their global IDs, for map_block()
+        self._local_sorted = np.zeros(0, dtype=np.int64)
+        self._global_sorted = np.zeros(0, dtype=np.int64)
+
+        # Declared axes and signals, with global IDs, in order
+        self.axes = {}
+        self.signals = {}
+
+        # Read by the decoding streams (keyed by local IDs). The
+        # quantizations ((offset, step) of the quantized signals) are
+        # replaced as a whole, never modified in place
+        self.quantizations = {}
+        self.last_sample_time = {}
+
+        self.points = RateMeter()
+        self.dropped = 0
+        # Samples for signals the session never declared (or can't use)
+        self.unknown = 0
+        self._last_unknown_report = 0.0
+
+    @property
+    def is_default(self):
+        return not self.name
+
+    @property
+    def label(self):
+        return f"'{self.name}'" if self.name else "(default)"
+
+    def admit(self, points):
+        """
+        Counts a decoded batch against the session's quota. Returns
+        False if it must be dropped.
+        """
+        self.last_active = time.monotonic()
+        with self._lock:
+            if self.quota.admit(points):
+                self.points.add(points)
+                return True
+            self.dropped += points
+
+            # Rate-limited to one line per second
+            now = time.monotonic()
+            if now - self._last_quota_report >= 1.0:
+                self._last_quota_report = now
+                print(f"[gRPC] Warning: Session {self.label} is over its quota of "
+                      f"{self.quota.rate:g} points/s, {self.dropped} points dropped so far")
+            return False
+
+    # --- ID mapping ---
+
+    def axis_id(self, local_id):
+        if self.is_default:
+            validate_session_ids(self.name, axis_ids=[local_id])
+            return local_id
+        global_id = self._axis_ids.get(local_id)
+        if global_id is None:
+            self._check_room(self._axis_ids, 'axis')
+            global_id = self._axis_ids[local_id] = self.registry.allocate('axis')
+        return global_id
+
+    def signal_id(self, local_id):
+        if self.is_default:
+            validate_session_ids(self.name, signal_ids=[local_id])
+            return local_id
+        global_id = self._signal_ids.get(local_id)
+        if global_id is None:
+            self._check_room(self._signal_ids, 'signal')
+            global_id = self._signal_ids[local_id] = self.registry.allocate('signal')
+            self.registry.owners[global_id] = (self.name, local_id)
+            local = np.fromiter(self._signal_ids, dtype=np.int64, count=len(self._signal_ids))
+            order = np.argsort(local)
+            self._local_sorted = local[order]
+            self._global_sorted = np.fromiter(self._signal_ids.values(), dtype=np.int64,
+                                              count=len(self._signal_ids))[order]
+        return global_id
+
+    def lookup_signal_id(self, local_id):
+        """
+        Global ID of a signal the session has a mapping for, or None.
+        Unlike signal_id(), never allocates one.
+        """
+        if self.is_default:
+            return local_id if local_id < GLOBAL_ID_BASE else None
+        return self._signal_ids.get(local_id)
+
+    def _check_room(self, ids, kind):
+        if len(ids) >= MAX_SESSION_IDS:
+            raise ValueError(f"Session {self.label} can't use more than {MAX_SESSION_IDS} {kind} IDs")
+
+    def axis_request(self, request):
+        if self.is_default:
+            validate_session_ids(self.name, axis_ids=[request.axis_id], signal_ids=axis_source_ids(request))
+            return request
+        mapped = plot_pb2.AddAxisRequest()
+        mapped.CopyFrom(request)
+        mapped.axis_id = self.axis_id(request.axis_id)
+        mapped.plot_title = f"[{self.name}] {request.plot_title}" if request.plot_title else f"[{self.name}]"
+        if request.HasField('trigger'):
+            mapped.trigger.signal_id = self.signal_id(request.trigger.signal_id)
+        if request.HasField('spectrogram'):
+            mapped.spectrogram.signal_id = self.signal_id(request.spectrogram.signal_id)
+        return mapped
+
+    def signal_request(self, request):
+        if self.is_default:
+            validate_session_ids(self.name, signal_ids=[request.signal_id])
+            return request
+        mapped = plot_pb2.AddSignalRequest()
+        mapped.CopyFrom(request)
+        mapped.axis_id = self.axis_id(request.axis_id)
+        mapped.signal_id = self.signal_id(request.signal_id)
+        if request.HasField('derived'):
+            mapped.derived.source_signal_id = self.signal_id(request.derived.source_signal_id)
+        return mapped
+
+    def map_block(self, block):
+        """
+        The block with its signal IDs made global. Samples for signals
+        the session never declared (or, in the default session, in the
+        range of the global IDs) are dropped (and counted).
+        """
+        ids = block.signal_ids
+        if self.is_default:
+            if not len(ids) or ids.max() < GLOBAL_ID_BASE:
+                return block
+            known = ids < GLOBAL_ID_BASE
+            global_ids = ids[known]
+        else:
+            known, global_ids = self._map_ids(ids)
+        if known.all():
+            return SampleBlock(global_ids, block.lengths, block.values, block.timestamps)
+
+        self._report_unknown(ids[~known], block.lengths[~known])
+        samples = np.repeat(known, block.lengths)
+        return SampleBlock(global_ids, block.lengths[known], block.values[samples], block.timestamps[samples])
+
+    def _map_ids(self, ids):
+        """(mask of the declared local IDs, their global IDs)"""
+        with self.registry.lock:
+            positions = np.minimum(np.searchsorted(self._local_sorted, ids), len(self._local_sorted) - 1)
+            if not len(self._local_sorted):
+                known = np.zeros(len(ids), dtype=bool)
+            else:
+                known = self._local_sorted[positions] == ids
+            global_ids = self._global_sorted[positions[known]] if known.any() else positions[:0]
+        return known, global_ids
+
+    def _report_unknown(self, ids, lengths):
+        with self._lock:
+            self.unknown += int(lengths.sum())
+            # Rate-limited to one line per second
+            now = time.monotonic()
+            if now - self._last_unknown_report >= 1.0:
+                self._last_unknown_report = now
+                print(f"[gRPC] Warning: Session {self.label} sent samples for unknown signal IDs "
+                      f"{sorted(set(ids.tolist()))}, {self.unknown} samples dropped so far")
+
+    # --- Declared dashboard (requests with global IDs) ---
+
+    def declare_axis(self, request):
+        self.axes[request.axis_id] = request
+
+    def forget_axis(self, axis_id):
+        self.axes.pop(axis_id, None)
+        for signal_id in [signal_id for signal_id, signal in self.signals.items()
+                          if signal.axis_id == axis_id]:
+            self.forget_signal(signal_id)
+
+    def declare_signal(self, request, local_request):
+        self.signals[request.signal_id] = request
+        quantizations = dict(self.quantizations)
+        if local_request.HasField('quantization'):
+            quantizations[local_request.signal_id] = quantization_scale(local_request.quantization)
+        else:
+            quantizations.pop(local_request.signal_id, None)
+        self.quantizations = quantizations
+
+    def forget_signal(self, signal_id):
+        self.signals.pop(signal_id, None)
+        self.quantizations = {local_id: scale for local_id, scale in self.quantizations.items()
+                              if self.signal_id(local_id) != signal_id}
+
+    def clear(self):
+        self.axes = {}
+        self.signals = {}
+        self.quantizations = {}
+
+    def is_idle(self, now):
+        return (not self.axes and not self.signals and
+                now - self.last_active >= SESSION_IDLE_TIMEOUT)
+
+    def forget_ids(self):
+        """Drops the ID mappings: the session's samples are then all unknown."""
+        for global_id in self._signal_ids.values():
+            self.registry.owners.pop(global_id, None)
+        self._axis_ids = {}
+        self._signal_ids = {}
+        self._local_sorted = np.zeros(0, dtype=np.int64)
+        self._global_sorted = np.zeros(0, dtype=np.int64)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'name': self.name,
+                'axes': len(self.axes),
+                'signals': len(self.signals),
+                'points': self.points.total,
+                'points_per_sec': self.points.rate(),
+                'dropped_points': self.dropped,
+                'unknown_points': self.unknown,
+            }
+
+
+class SessionRegistry:
+    """
+    All the sessions seen so far, by name. Thread-safe: shared by all
+    the gRPC calls, which hold `lock` while they use a session's
+    declarations or mappings.
+    """
+
+    def __init__(self, quota=0):
+        # Points per second admitted per session (0: no limit)
+        self.quota = quota
+        self.lock = threading.RLock()
+        self.sessions = {}
+        self._next_ids = {'axis': GLOBAL_ID_BASE, 'signal': GLOBAL_ID_BASE}
+        # Global signal ID -> (session name, local ID), named sessions only
+        self.owners = {}
+        # Position of each new session in the merged dashboard
+        self._indices = itertools.count()
+        self.get('')
+
+    def get(self, name):
+        """
+        The session `name`, created if needed. Raises ValueError if there
+        is no room for a new one.
+        """
+        session = self.sessions.get(name)
+        if session is None:
+            with self.lock:
+                session = self.sessions.get(name)
+                if session is None:
+                    if len(self.sessions) > MAX_SESSIONS:
+                        self._expire_idle()
+                    if len(self.sessions) > MAX_SESSIONS:
+                        raise ValueError(f"Too many sessions (at most {MAX_SESSIONS}), "
+                                         f"can't open session '{name}'")
+                    session = Session(self, name, next(self._indices), self.quota)
+                    self.sessions[name] = session
+                    if name:
+                        print(f"[gRPC] New session '{name}'")
+        session.last_active = time.monotonic()
+        return session
+
+    def _expire_idle(self):
+        now = time.monotonic()
+        for name, session in list(self.sessions.items()):
+            if name and session.is_idle(now):
+                del self.sessions[name]
+                session.forget_ids()
+                print(f"[gRPC] Dropped idle session '{name}'")
+
+    def allocate(self, kind):
+        global_id = self._next_ids[kind]
+        if global_id > 0xFFFFFFFF:
+            raise ValueError(f"No {kind} IDs left for sessions")
+        self._next_ids[kind] += 1
+        return global_id
+
+    def owner(self, signal_id):
+        """(session name, local ID) of a global signal ID."""
+        if signal_id < GLOBAL_ID_BASE:
+            return '', signal_id
+        return self.owners.get(signal_id, (None, signal_id))
+
+    def has_named_sessions(self):
+        return len(self.sessions) > 1
+
+    def merged_spec(self):
+        """The dashboards of all sessions as one DashboardSpec, session by session."""
+        sessions = sorted(self.sessions.values(), key=lambda session: session.index)
+        return plot_pb2.DashboardSpec(
+            axes=[axis for session in sessions for axis in session.axes.values()],
+            signals=[signal for session in sessions for signal in session.signals.values()
+                     if signal.axis_id in session.axes])
+
+    def clear(self):
+        for session in self.sessions.values():
+            session.clear()
+
+    def stats(self):
+        return [session.stats() for session in self.sessions.values()]
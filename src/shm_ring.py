@@ -0,0 +1,152 @@
+import time
+from collections import deque
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .capture import RECORD_HEADER, item_records, record_size, write_record, read_record
+
+# --- Shared memory ring ---
+# Single-producer, single-consumer ring of ingest queue items between
+# the ingest process (producer) and the GUI process (consumer), in a
+# multiprocessing.shared_memory block. Items are stored as capture file
+# records (see capture.py), so sample blocks are plain columns that the
+# GUI reads in place.
+#
+# Layout: the write and read positions (int64, ever increasing, on their
+# own cache lines), then `capacity` bytes of records. A record never
+# wraps: when it doesn't fit before the end of the buffer, the writer
+# leaves a WRAP marker (if there is room for one) and starts again at 0.
+WRITE_POSITION = 0
+READ_POSITION = 64
+DATA_START = 128
+WRAP = 255
+
+
+def create_ring(capacity):
+    """
+    Creates the shared memory block of a ring with `capacity` bytes of
+    records. The creator owns it: call close() and unlink() when done.
+    """
+    capacity = (int(capacity) + 7) & ~7
+    shm = shared_memory.SharedMemory(create=True, size=DATA_START + capacity)
+    np.frombuffer(shm.buf, np.int64, 1, WRITE_POSITION)[0] = 0
+    np.frombuffer(shm.buf, np.int64, 1, READ_POSITION)[0] = 0
+    return shm
+
+
+class _SharedRing:
+
+    def __init__(self, shm):
+        self.shm = shm
+        self.capacity = shm.size - DATA_START
+        self._data = shm.buf[DATA_START:]
+        self._write_position = np.frombuffer(shm.buf, np.int64, 1, WRITE_POSITION)
+        self._read_position = np.frombuffer(shm.buf, np.int64, 1, READ_POSITION)
+
+    def used(self):
+        return int(self._write_position[0] - self._read_position[0])
+
+    def close(self):
+        """Drops the views of the shared memory (before closing it)."""
+        self._data.release()
+        del self._write_position, self._read_position
+
+
+class SharedRingWriter(_SharedRing):
+    """
+    Producer side, in the ingest process.
+    """
+
+    # How long to wait before re-checking a full ring
+    FULL_POLL_INTERVAL = 0.0005
+
+    def write(self, kind, payload, capture_time=None, stopping=None):
+        """
+        Appends a queue item, waiting while the ring is full. Once the
+        `stopping` event (if any) is set, the GUI won't drain the ring
+        any more: the rest of the item is dropped instead of waited for.
+        Returns False if it was.
+        """
+        if capture_time is None:
+            capture_time = time.time()
+
+        for code, data in item_records(kind, payload):
+            size = record_size(data)
+            if size > self.capacity:
+                print(f"[Ingest] Warning: Dropping a {size} byte record, larger than the "
+                      f"{self.capacity} byte shared ring")
+                continue
+
+            write = int(self._write_position[0])
+            start = write % self.capacity
+            # Bytes skipped at the end of the buffer when the record doesn't fit
+            skip = self.capacity - start if start + size > self.capacity else 0
+
+            while self.capacity - (write - int(self._read_position[0])) < skip + size:
+                if stopping is not None and stopping.is_set():
+                    return False
+                time.sleep(self.FULL_POLL_INTERVAL)
+
+            if skip:
+                if skip >= RECORD_HEADER.size:
+                    self._data[start] = WRAP
+                start = 0
+            end = write_record(self._data, start, code, capture_time, data)
+
+            # Publish the record only once it is complete
+            self._write_position[0] = write + skip + (end - start)
+        return True
+
+
+class SharedRingReader(_SharedRing):
+    """
+    Consumer side, in the GUI process. Has the same drain() interface as
+    IngestQueue.
+    """
+
+    def __init__(self, shm):
+        super().__init__(shm)
+        # End of the records returned by the last drain(), released (and
+        # so made writable again) on the next one
+        self._pending_release = int(self._read_position[0])
+        self.last_drain_lag = 0.0
+        self.drained = 0
+
+    def drain(self, max_data_items=None):
+        """
+        Takes every available item, in order. Sample blocks are views of
+        the shared memory: they are only valid until the next drain() or
+        release(). `max_data_items` is ignored: the ingest process has
+        already interleaved the sessions.
+        """
+        self.release()
+        read = self._pending_release
+        write = int(self._write_position[0])
+
+        items = deque()
+        oldest_time = None
+        while read < write:
+            start = read % self.capacity
+            if (self.capacity - start < RECORD_HEADER.size or self._data[start] == WRAP):
+                read += self.capacity - start
+                continue
+            kind, payload, capture_time, end = read_record(self._data, start)
+            items.append((kind, payload))
+            if oldest_time is None:
+                oldest_time = capture_time
+            read += end - start
+
+        self._pending_release = read
+        self.drained += len(items)
+        if oldest_time is not None:
+            self.last_drain_lag = max(0.0, time.time() - oldest_time)
+        return items
+
+    def release(self):
+        """Gives the space of the items drained so far back to the writer."""
+        self._read_position[0] = self._pending_release
+
+    def depth(self):
+        """Bytes waiting in the ring (not items, unlike IngestQueue)."""
+        return int(self._write_position[0]) - self._pending_release
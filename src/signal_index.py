@@ -0,0 +1,120 @@
+import numpy as np
+
+# --- Signal Index ---
+# Maps signal IDs to dense "slots" so a batch can be applied with NumPy
+# fancy indexing instead of per-signal dict lookups. Slots double as the
+# rows of the window's RingBufferBank.
+#
+# Slots are laid out axis by axis, in axis creation order, and within an
+# axis in signal creation order ("row" of the signal in its axis). The
+# slots of an axis are therefore contiguous.
+class SignalIndex:
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.size = 0
+        # Sorted signal IDs, and the slot of each one
+        self._sorted_ids = np.zeros(0, dtype=np.int64)
+        self._sorted_slots = np.zeros(0, dtype=np.int64)
+        # Axes in layout order, with their number of rows
+        self._axis_order = []
+        self._axis_rows = {}
+        self._refresh_axes()
+
+    # --- Incremental updates ---
+
+    def add_axis(self, axis_id):
+        self._axis_order.append(axis_id)
+        self._axis_rows[axis_id] = 0
+        self._refresh_axes()
+
+    def remove_axis(self, axis_id):
+        start, rows = self._axis_start[axis_id], self._axis_rows[axis_id]
+        if rows:
+            self._delete_slots(start, rows)
+        self._axis_order.remove(axis_id)
+        del self._axis_rows[axis_id]
+        self._refresh_axes()
+
+    def add_signal(self, axis_id, signal_id):
+        """
+        Registers a signal as the new last row of its axis.
+        Returns its slot; the slots from there on move down by one.
+        """
+        slot = self._axis_start[axis_id] + self._axis_rows[axis_id]
+
+        # Make room: every slot from here on moves one place down
+        self._sorted_slots[self._sorted_slots >= slot] += 1
+
+        position = np.searchsorted(self._sorted_ids, signal_id)
+        self._sorted_ids = np.insert(self._sorted_ids, position, signal_id)
+        self._sorted_slots = np.insert(self._sorted_slots, position, slot)
+
+        self._axis_rows[axis_id] += 1
+        self.size += 1
+        self._refresh_axes()
+        return slot
+
+    def remove_signal(self, axis_id, row):
+        """
+        Unregisters the signal at `row` of an axis. The rows (and slots)
+        after it move up by one, like in RingBufferBank.remove_rows().
+        """
+        self._delete_slots(self._axis_start[axis_id] + row, 1)
+        self._axis_rows[axis_id] -= 1
+        self._refresh_axes()
+
+    # --- Lookups ---
+
+    def lookup(self, signal_ids):
+        """
+        Returns the slot of every ID in `signal_ids`, or -1 for unknown IDs.
+        """
+        signal_ids = np.asarray(signal_ids, dtype=np.int64)
+        if not self.size:
+            return np.full(len(signal_ids), -1, dtype=np.int64)
+
+        position = np.searchsorted(self._sorted_ids, signal_ids)
+        position = np.minimum(position, self.size - 1)
+        found = self._sorted_ids[position] == signal_ids
+        return np.where(found, self._sorted_slots[position], -1)
+
+    def axis_slots(self, axis_id):
+        """
+        Returns the slice of slots used by an axis.
+        """
+        start = self._axis_start[axis_id]
+        return slice(start, start + self._axis_rows[axis_id])
+
+    def locate(self, slots):
+        """
+        Splits slots into (axis position in `axis_slices`, row in that axis).
+        """
+        axis_position = np.searchsorted(self._starts, slots, side='right') - 1
+        return axis_position, slots - self._starts[axis_position]
+
+    # --- Internal helpers ---
+
+    def _delete_slots(self, start, count):
+        removed = (self._sorted_slots >= start) & (self._sorted_slots < start + count)
+        self._sorted_ids = self._sorted_ids[~removed]
+        self._sorted_slots = self._sorted_slots[~removed]
+        self._sorted_slots[self._sorted_slots >= start + count] -= count
+        self.size -= count
+
+    def _refresh_axes(self):
+        """
+        Recomputes the (small) per-axis layout after a change.
+        `axis_slices` lists (axis_id, slice of slots) in layout order.
+        """
+        self._axis_start = {}
+        self.axis_slices = []
+        start = 0
+        for axis_id in self._axis_order:
+            rows = self._axis_rows[axis_id]
+            self._axis_start[axis_id] = start
+            self.axis_slices.append((axis_id, slice(start, start + rows)))
+            start += rows
+        self._starts = np.array([s.start for _, s in self.axis_slices], dtype=np.int64)
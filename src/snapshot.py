@@ -0,0 +1,91 @@
+import json
+import os
+import time
+
+import numpy as np
+
+# --- Snapshots ---
+# Export of the window's signal buffers to a .npz file, to get at the
+# numbers behind what is on screen (Ctrl+S in the window, or the
+# Snapshot RPC).
+#
+# Taking a snapshot, in the GUI thread, only copies the samples held by
+# each signal (its ring buffer window, which is contiguous) and the axis
+# and signal metadata: that is the point-in-time state, and the window
+# carries on right away. The file is written on a background thread.
+#
+# File contents, for a signal of ID <id> (its samples oldest first):
+#   t_<id>     timestamps (float64, seconds since the epoch)
+#   y_<id>     values (float64)
+# and `metadata`, a JSON string:
+#   {"time": ..., "axes": [{"axis_id", "title", "x_title", "y_title",
+#                           "number_of_samples", "signals": [IDs]}, ...],
+#    "signals": [{"signal_id", "axis_id", "name", "color", "samples",
+#                 "written"}, ...]}
+# where "written" counts every sample the signal ever received.
+
+
+def snapshot_path(directory, name=''):
+    """
+    Path of a snapshot file named `name` in `directory`, by default named
+    after the current time. Raises ValueError if `name` is not a plain
+    file name.
+    """
+    if not name:
+        now = time.time()
+        name = time.strftime('snapshot-%Y%m%d-%H%M%S', time.localtime(now)) + f'-{int(now * 1e3) % 1000:03d}'
+    if os.path.basename(name) != name or name in ('.', '..'):
+        raise ValueError(f"snapshot name must be a file name, got '{name}'")
+    if not name.endswith('.npz'):
+        name += '.npz'
+    return os.path.join(directory, name)
+
+
+def read_snapshot(path):
+    """
+    Reads a snapshot file. Returns (metadata, {signal_id: (t, y)}).
+    """
+    with np.load(path) as data:
+        metadata = json.loads(str(data['metadata']))
+        signals = {signal['signal_id']: (data[f"t_{signal['signal_id']}"], data[f"y_{signal['signal_id']}"])
+                   for signal in metadata['signals']}
+    return metadata, signals
+
+
+class Snapshot:
+    """
+    Point-in-time copy of the window's buffers. Created in the GUI
+    thread (see MainWindow.take_snapshot()), written from any thread.
+    """
+
+    def __init__(self, axes, signals, columns):
+        # Metadata dicts, in display order
+        self.axes = axes
+        self.signals = signals
+        # t_<id> and y_<id> arrays, copied out of the sample bank
+        self.columns = columns
+        self.time = time.time()
+
+    def write(self, path):
+        """
+        Writes the snapshot to `path`, through a temporary file so that a
+        partial file is never left under that name. Returns the fields of
+        a SnapshotResponse.
+        """
+        metadata = json.dumps({'time': self.time, 'axes': self.axes, 'signals': self.signals})
+        partial = path + '.part'
+        try:
+            with open(partial, 'wb') as f:
+                np.savez(f, metadata=np.array(metadata), **self.columns)
+            os.replace(partial, path)
+        except OSError:
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
+
+        return {
+            'path': os.path.abspath(path),
+            'signals': len(self.signals),
+            'samples': sum(signal['samples'] for signal in self.signals),
+            'bytes': os.path.getsize(path),
+        }
@@ -0,0 +1,224 @@
+import queue
+import threading
+
+import numpy as np
+
+from src.proto_gen import plot_pb2
+
+# --- Spectrograms ---
+# An axis with a Spectrogram (see plot.proto) shows a scrolling
+# waterfall of the spectrum of its source signal instead of lines.
+#
+# The window hands the source samples of each applied block to the
+# SpectrogramWorker, whose thread computes the spectra: every window of
+# `fft_size` samples that is complete (they overlap by fft_size - hop
+# samples) goes through one batched rfft, and the samples of a window
+# that isn't complete yet wait for the next block. So each spectrum is
+# computed once, off the GUI thread. The GUI takes the new spectra once
+# per frame into a preallocated ring of `columns` spectra, written twice
+# like the rows of a RingBufferBank so that the image is always one
+# contiguous slice, and only redraws the axis when there are new ones.
+#
+# Spectra are placed at the timestamp of the middle of their window, and
+# the frequency axis comes from the sample rate of the source's
+# timestamps.
+
+Spectrogram = plot_pb2.Spectrogram
+
+DEFAULT_FFT_SIZE = 256
+DEFAULT_COLUMNS = 256
+MAX_FFT_SIZE = 65536
+MAX_COLUMNS = 4096
+
+# Default color scale: this many dB below the strongest bin on screen
+DYNAMIC_RANGE_DB = 80.0
+# Keeps log10() finite on silent bins (-240 dB)
+AMPLITUDE_FLOOR = 1e-12
+
+WINDOWS = {
+    Spectrogram.HANN: np.hanning,
+    Spectrogram.HAMMING: np.hamming,
+    Spectrogram.BLACKMAN: np.blackman,
+    Spectrogram.RECTANGULAR: np.ones,
+}
+
+
+def validate_spectrogram(request):
+    """
+    Checks the spectrogram settings of an AddAxisRequest, if any.
+    Raises ValueError if they are invalid.
+    """
+    if not request.HasField('spectrogram'):
+        return
+    settings = request.spectrogram
+    if request.HasField('trigger') and request.trigger.mode != plot_pb2.Trigger.OFF:
+        raise ValueError(f"axis {request.axis_id}: an axis can't have both a trigger and a spectrogram")
+    if settings.fft_size and not 8 <= settings.fft_size <= MAX_FFT_SIZE:
+        raise ValueError(f"axis {request.axis_id}: spectrogram fft_size must be between 8 and "
+                         f"{MAX_FFT_SIZE}, got {settings.fft_size}")
+    if settings.columns > MAX_COLUMNS:
+        raise ValueError(f"axis {request.axis_id}: spectrogram columns can't be more than "
+                         f"{MAX_COLUMNS}, got {settings.columns}")
+    if settings.window not in WINDOWS:
+        raise ValueError(f"axis {request.axis_id}: unknown spectrogram window {settings.window}")
+    if (settings.HasField('min_level') and settings.HasField('max_level') and
+            not settings.min_level < settings.max_level):
+        raise ValueError(f"axis {request.axis_id}: a spectrogram needs min_level < max_level, "
+                         f"got [{settings.min_level}, {settings.max_level}]")
+
+
+class AxisSpectrogram:
+    """
+    Spectra of the source signal of one axis. feed() runs on the
+    worker thread, update() and the properties in the GUI thread.
+    """
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.signal_id = settings.signal_id
+        self.fft_size = settings.fft_size or DEFAULT_FFT_SIZE
+        self.hop = settings.hop or max(1, self.fft_size // 2)
+        self.columns = settings.columns or DEFAULT_COLUMNS
+        self.bins = self.fft_size // 2 + 1
+        # Scaled so that a sine of amplitude A reads A (-> 20 log10(A) dB)
+        window = WINDOWS[settings.window](self.fft_size)
+        self._window = window * (2.0 / window.sum())
+
+        # --- Worker side ---
+        # Samples of the window that isn't complete yet
+        self._pending_t = np.zeros(0)
+        self._pending_y = np.zeros(0)
+        # Samples to drop before the next window (hop > fft_size)
+        self._skip = 0
+        # Spectra computed since the last update(): [(times, spectra)]
+        self._lock = threading.Lock()
+        self._new = []
+        self._sample_rate = np.nan
+        self.computed = 0
+
+        # --- GUI side ---
+        # Ring of spectra in dB, one row per spectrum, and their times
+        self._image = np.zeros((2 * self.columns, self.bins), dtype=np.float32)
+        self._times = np.zeros(2 * self.columns)
+        self._head = 0
+        self.count = 0
+        self.sample_rate = np.nan
+
+    def same_settings(self, settings):
+        return self.settings == settings
+
+    def feed(self, t, y):
+        """Computes the spectra of the windows completed by new samples."""
+        if self._skip:
+            dropped = min(self._skip, len(y))
+            t, y = t[dropped:], y[dropped:]
+            self._skip -= dropped
+        t = np.concatenate((self._pending_t, t))
+        y = np.concatenate((self._pending_y, y))
+        n = len(y)
+        if n < self.fft_size:
+            self._pending_t, self._pending_y = t, y
+            return
+
+        # Windows start every `hop` samples; only the newest `columns`
+        # spectra can be shown, so a backlog skips the older ones
+        windows = 1 + (n - self.fft_size) // self.hop
+        first = max(0, windows - self.columns)
+        frames = np.lib.stride_tricks.sliding_window_view(y, self.fft_size)[first * self.hop::self.hop]
+        amplitude = np.abs(np.fft.rfft(frames * self._window, axis=1))
+        spectra = (20 * np.log10(amplitude + AMPLITUDE_FLOOR)).astype(np.float32)
+        times = t[np.arange(first, windows) * self.hop + self.fft_size // 2]
+        sample_rate = (n - 1) / (t[-1] - t[0]) if t[-1] > t[0] else np.nan
+
+        consumed = windows * self.hop
+        self._pending_t, self._pending_y = t[consumed:], y[consumed:]
+        self._skip = max(0, consumed - n)
+
+        with self._lock:
+            self._new.append((times, spectra))
+            # While the axis isn't drawn, only the newest `columns` are kept
+            while sum(len(times) for times, _ in self._new[1:]) >= self.columns:
+                self._new.pop(0)
+            if np.isfinite(sample_rate):
+                self._sample_rate = sample_rate
+            self.computed += windows - first
+
+    def has_new(self):
+        return bool(self._new)
+
+    def update(self):
+        """
+        Moves the spectra computed since the last call into the ring.
+        Returns False if there were none.
+        """
+        with self._lock:
+            new, self._new = self._new, []
+            self.sample_rate = self._sample_rate
+        if not new:
+            return False
+        times = np.concatenate([times for times, _ in new])[-self.columns:]
+        spectra = np.concatenate([spectra for _, spectra in new])[-self.columns:]
+
+        # Written twice, like RingBufferBank.extend_rows()
+        cap = self.columns
+        n = len(times)
+        rows = (self._head + np.arange(n)) % cap
+        for offset in (0, cap):
+            self._image[rows + offset] = spectra
+            self._times[rows + offset] = times
+        self._head = (self._head + n) % cap
+        self.count = min(self.count + n, cap)
+        return True
+
+    def image(self):
+        """
+        The spectra in the ring, oldest first, as (times, spectra) views
+        (valid until the next update()).
+        """
+        end = self._head + self.columns
+        return self._times[end - self.count:end], self._image[end - self.count:end]
+
+    def levels(self, spectra):
+        """The color scale, in dB, for the spectra on screen."""
+        settings = self.settings
+        top = settings.max_level if settings.HasField('max_level') else float(spectra.max())
+        bottom = settings.min_level if settings.HasField('min_level') else top - DYNAMIC_RANGE_DB
+        return bottom, max(top, bottom + 1e-6)
+
+
+class SpectrogramWorker:
+    """
+    Background thread computing the spectra of all the window's
+    spectrograms. submit() is called from the GUI thread.
+    """
+
+    def __init__(self):
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+
+    def submit(self, spectrogram, t, y):
+        """Queues source samples (copies: the block may be reused)."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="spectrogram", daemon=True)
+            self._thread.start()
+        self._queue.put((spectrogram, t, y))
+
+    def _run(self):
+        while True:
+            items = [self._queue.get()]
+            # Everything queued meanwhile, joined per spectrogram: one
+            # batch of FFTs each
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            batches = {}
+            for spectrogram, t, y in items:
+                batches.setdefault(spectrogram, []).append((t, y))
+            for spectrogram, runs in batches.items():
+                try:
+                    spectrogram.feed(np.concatenate([t for t, _ in runs]),
+                                     np.concatenate([y for _, y in runs]))
+                except Exception as e:
+                    print(f"[GUI] Error: Spectrogram of signal {spectrogram.signal_id} failed: {e}")
@@ -0,0 +1,185 @@
+import bisect
+import itertools
+import threading
+import time
+
+# --- Runtime statistics ---
+# Counters and histograms updated on the hot paths, read by the GetStats
+# RPC and the HUD. Recording is a few integer operations: histograms
+# have fixed buckets, and rates are only computed when they are read.
+
+
+def _log_bounds(start, stop, per_decade=4):
+    """Bucket upper bounds from `start` to `stop`, evenly spaced in log scale."""
+    bounds = []
+    value = start
+    step = 10 ** (1.0 / per_decade)
+    while value < stop * 1.0001:
+        bounds.append(value)
+        value *= step
+    return bounds
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram. `bounds` are the bucket upper bounds; values
+    above the last one go in an overflow bucket.
+    """
+
+    def __init__(self, bounds):
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, p):
+        """Upper bound of the bucket holding the p-th percentile."""
+        if not self.count:
+            return 0.0
+        rank = p / 100.0 * self.count
+        seen = 0
+        for bound, count in zip(self.bounds + [self.max], self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'max': self.max,
+        }
+
+
+class RateMeter:
+    """
+    Counts events and reports their rate over the last `window` seconds
+    or so (the rate is refreshed when read, at most once per window).
+    """
+
+    def __init__(self, window=1.0):
+        self.window = window
+        self.total = 0
+        self._last_total = 0
+        self._last_time = time.monotonic()
+        self._rate = 0.0
+
+    def add(self, n=1):
+        self.total += n
+
+    def rate(self):
+        now = time.monotonic()
+        elapsed = now - self._last_time
+        if elapsed >= self.window:
+            self._rate = (self.total - self._last_total) / elapsed
+            self._last_total = self.total
+            self._last_time = now
+        return self._rate
+
+
+class IngestStats:
+    """
+    Ingest side, recorded by the gRPC streams (PlotServicer).
+    """
+
+    def __init__(self):
+        self.start_time = time.monotonic()
+        self._lock = threading.Lock()
+        self._stream_ids = itertools.count(1)
+        self.batches = RateMeter()
+        self.points = RateMeter()
+        # Time to decode a request into a block, in microseconds
+        self.decode_us = Histogram(_log_bounds(1, 100_000))
+        # Open streams: id -> per-stream counters
+        self.streams = {}
+        # Launch to accepting connections (see app.py), if measured
+        self.accept_ms = 0.0
+
+    def open_stream(self, peer):
+        stream_id = next(self._stream_ids)
+        with self._lock:
+            self.streams[stream_id] = {
+                'peer': peer,
+                'start_time': time.monotonic(),
+                'batches': 0,
+                'points': RateMeter(),
+            }
+        return stream_id
+
+    def close_stream(self, stream_id):
+        with self._lock:
+            self.streams.pop(stream_id, None)
+
+    def record_batch(self, stream_id, points, decode_seconds):
+        with self._lock:
+            self.batches.add()
+            self.points.add(points)
+            self.decode_us.record(decode_seconds * 1e6)
+            stream = self.streams.get(stream_id)
+            if stream is not None:
+                stream['batches'] += 1
+                stream['points'].add(points)
+
+    def snapshot(self):
+        now = time.monotonic()
+        with self._lock:
+            streams = [{
+                'stream_id': stream_id,
+                'peer': stream['peer'],
+                'seconds': now - stream['start_time'],
+                'batches': stream['batches'],
+                'points': stream['points'].total,
+                'points_per_sec': stream['points'].rate(),
+            } for stream_id, stream in self.streams.items()]
+            return {
+                'uptime_s': now - self.start_time,
+                'batches_received': self.batches.total,
+                'points_received': self.points.total,
+                'batches_per_sec': self.batches.rate(),
+                'points_per_sec': self.points.rate(),
+                'decode_us': self.decode_us.summary(),
+                'streams': streams,
+                'startup_accept_ms': self.accept_ms,
+            }
+
+
+class GuiStats:
+    """
+    GUI side, recorded by MainWindow in the GUI thread.
+    """
+
+    def __init__(self):
+        self.frames = RateMeter()
+        self.frame_ms = Histogram(_log_bounds(0.1, 1000))
+        # Time spent applying samples to the buffers, per drain
+        self.apply_ms = Histogram(_log_bounds(0.01, 1000))
+        # Age of the oldest queued item when the GUI drains the queue
+        self.queue_lag_ms = Histogram(_log_bounds(0.1, 10_000))
+        self.points_applied = RateMeter()
+        self.unknown_signal_hits = 0
+        # Launch to the first frame (see app.py), if measured
+        self.first_frame_ms = 0.0
+
+    def snapshot(self):
+        return {
+            'frames': self.frames.total,
+            'frames_per_sec': self.frames.rate(),
+            'frame_ms': self.frame_ms.summary(),
+            'apply_ms': self.apply_ms.summary(),
+            'queue_lag_ms': self.queue_lag_ms.summary(),
+            'points_applied': self.points_applied.total,
+            'unknown_signal_hits': self.unknown_signal_hits,
+            'startup_first_frame_ms': self.first_frame_ms,
+        }
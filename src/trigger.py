@@ -0,0 +1,158 @@
+import math
+from collections import deque
+
+import numpy as np
+
+from src.proto_gen import plot_pb2
+
+# --- Triggers ---
+# An axis with a Trigger (see plot.proto) works like an oscilloscope:
+# the window looks for events in the samples of the trigger's source
+# signal as blocks are applied, and the plot shows frames of all the
+# axis' signals around the last event instead of the scrolling window.
+#
+# Events are found vectorized over each block's run of source samples
+# (the last value of the previous block is kept, so crossings between
+# blocks count too). Once an event is found, the frame is taken as soon
+# as the source's samples reach `post_trigger` seconds after it, from
+# the ring buffers (which must be long enough to still hold the
+# `pre_trigger` part). Events during a frame are ignored.
+#
+# Axes without a trigger cost nothing: the window only looks at blocks
+# for the axes in its `triggers` dict.
+
+Trigger = plot_pb2.Trigger
+
+# Captured frames kept per axis
+TRIGGER_FRAMES = 16
+
+# States
+ARMED, TRIGGERED, STOPPED = 'armed', 'triggered', 'stopped'
+
+
+def validate_trigger(request):
+    """
+    Checks the trigger settings of an AddAxisRequest, if any.
+    Raises ValueError if they are invalid.
+    """
+    if not request.HasField('trigger'):
+        return
+    trigger = request.trigger
+    values = (trigger.level, trigger.low, trigger.high,
+              trigger.pre_trigger, trigger.post_trigger, trigger.auto_timeout)
+    if not all(math.isfinite(value) for value in values):
+        raise ValueError(f"axis {request.axis_id}: trigger settings must be finite")
+    if trigger.pre_trigger < 0 or trigger.post_trigger < 0 or trigger.auto_timeout < 0:
+        raise ValueError(f"axis {request.axis_id}: trigger times can't be negative")
+    if trigger.mode != Trigger.OFF and trigger.pre_trigger + trigger.post_trigger <= 0:
+        raise ValueError(f"axis {request.axis_id}: a trigger needs pre_trigger + post_trigger > 0")
+    if trigger.condition == Trigger.OUTSIDE and not trigger.low < trigger.high:
+        raise ValueError(f"axis {request.axis_id}: an OUTSIDE trigger needs low < high, "
+                         f"got [{trigger.low}, {trigger.high}]")
+
+
+class Frame:
+    """A captured frame: the (t, y) of each signal of the axis."""
+
+    def __init__(self, trigger_time, signals, forced=False):
+        self.trigger_time = trigger_time
+        # {signal_id: (t, y)}
+        self.signals = signals
+        # Taken by AUTO mode without an event
+        self.forced = forced
+
+
+class AxisTrigger:
+    """
+    Trigger state of one axis. process() is given the source samples of
+    each block, after they were written to the buffers.
+    """
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.signal_id = settings.signal_id
+        self.pre = settings.pre_trigger
+        self.post = settings.post_trigger
+        self.auto_timeout = settings.auto_timeout or (self.pre + self.post)
+
+        self.frames = deque(maxlen=TRIGGER_FRAMES)
+        self.captured = 0
+        self.arm()
+
+    def same_settings(self, settings):
+        return self.settings == settings
+
+    def arm(self):
+        self.state = ARMED
+        # Last source value seen, for crossings between blocks
+        self._previous = np.nan
+        # Events before this time are ignored (they were in a frame)
+        self._not_before = -np.inf
+        self._trigger_time = None
+        self._last_frame_end = -np.inf
+
+    def process(self, t, y, capture):
+        """
+        Looks for events in the source samples (t, y) of a block.
+        `capture(t0, t1)` returns the signals' samples between two times.
+        Returns True if a new frame was captured.
+        """
+        if self.state == STOPPED or not len(t):
+            return False
+        events = t[self._events(y)]
+
+        captured = False
+        while True:
+            if self.state == TRIGGERED:
+                end = self._trigger_time + self.post
+                if t[-1] < end:
+                    break
+                self._add_frame(Frame(self._trigger_time, capture(self._trigger_time - self.pre, end)))
+                captured = True
+                if self.settings.mode == Trigger.SINGLE:
+                    self.state = STOPPED
+                    break
+                self.state = ARMED
+                self._not_before = end
+
+            elif self.state == ARMED:
+                index = np.searchsorted(events, self._not_before)
+                if index < len(events):
+                    self._trigger_time = float(events[index])
+                    self.state = TRIGGERED
+                    continue
+                if self.settings.mode == Trigger.AUTO and t[-1] - self._last_frame_end >= self.auto_timeout:
+                    # No event for a while: show what there is
+                    now = float(t[-1])
+                    self._add_frame(Frame(now - self.post, capture(now - self.post - self.pre, now), forced=True))
+                    self._not_before = now
+                    captured = True
+                break
+            else:
+                break
+        return captured
+
+    def _events(self, y):
+        """Mask of the samples of `y` where the condition becomes true."""
+        settings = self.settings
+        previous = np.empty(len(y))
+        previous[0] = self._previous
+        previous[1:] = y[:-1]
+        self._previous = y[-1]
+
+        if settings.condition == Trigger.RISING:
+            return (previous < settings.level) & (y >= settings.level)
+        if settings.condition == Trigger.FALLING:
+            return (previous > settings.level) & (y <= settings.level)
+        # OUTSIDE: inside the band, then out of it
+        was_inside = (previous >= settings.low) & (previous <= settings.high)
+        return was_inside & ((y < settings.low) | (y > settings.high))
+
+    def _add_frame(self, frame):
+        self.frames.append(frame)
+        self.captured += 1
+        self._last_frame_end = frame.trigger_time + self.post
+
+    def frame(self):
+        """The frame on display, or None."""
+        return self.frames[-1] if self.frames else None
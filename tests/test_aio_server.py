@@ -0,0 +1,50 @@
+import asyncio
+
+import grpc
+import numpy as np
+
+from src.aio_server import start_aio_server
+from src.plot_servicer import PlotServicer
+from src.proto_gen import plot_pb2, plot_pb2_grpc
+
+STREAMS = 64
+
+
+async def stream(stub, signal_id, stop):
+    async def requests():
+        values = np.full(4, signal_id, dtype='<f4')
+        while not stop.is_set():
+            yield plot_pb2.streamPackedRequest(signals=[
+                plot_pb2.packedSamples(signal_id=signal_id, raw_values=values.tobytes())])
+            await asyncio.sleep(0.01)
+
+    await stub.streamPlotPacked(requests())
+
+
+async def run_clients(port):
+    async with grpc.aio.insecure_channel(f'127.0.0.1:{port}') as channel:
+        stub = plot_pb2_grpc.PlotServiceStub(channel)
+        stop = asyncio.Event()
+        streams = [asyncio.ensure_future(stream(stub, signal_id, stop)) for signal_id in range(STREAMS)]
+        # Let every stream open
+        await asyncio.sleep(0.5)
+        assert not any(task.done() for task in streams)
+
+        # A unary call still gets through while they are all open
+        await stub.AddAxis(plot_pb2.AddAxisRequest(axis_id=1, number_of_samples=10), timeout=5)
+
+        stop.set()
+        await asyncio.wait_for(asyncio.gather(*streams), timeout=5)
+
+
+def test_unary_calls_go_through_many_open_streams():
+    servicer = PlotServicer(queue_capacity=1_000_000)
+    port = start_aio_server(servicer, '127.0.0.1:0')
+    asyncio.run(run_clients(port))
+
+    items = servicer.ingest_queue.drain()
+    assert [payload.axis_id for kind, payload in items if kind == 'add_axis'] == [1]
+    streamed = {int(signal_id) for kind, payload in items if kind == 'samples'
+                for block in payload for signal_id in block.signal_ids}
+    assert streamed == set(range(STREAMS))
+    assert servicer.stats.streams == {}
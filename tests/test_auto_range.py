@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from src.auto_range import AxisRange, Policy, validate_axis_request
+from src.decimation import IncrementalEnvelope, minmax_envelope
+from src.proto_gen import plot_pb2
+
+
+def axis(policy, y_min=0.0, y_max=0.0):
+    return plot_pb2.AddAxisRequest(axis_id=1, y_range_policy=policy, y_min=y_min, y_max=y_max)
+
+
+# --- validate_axis_request ---
+
+def test_fixed_range_needs_increasing_bounds():
+    validate_axis_request(axis(Policy.FIXED, -1, 1))
+    for bounds in ((0, 0), (1, -1)):
+        with pytest.raises(ValueError):
+            validate_axis_request(axis(Policy.FIXED, *bounds))
+    # The other policies don't need bounds
+    validate_axis_request(axis(Policy.GROW))
+
+
+# --- AxisRange policies ---
+
+def test_auto_fits_the_data():
+    y_range = AxisRange(axis(Policy.AUTO))
+    assert y_range.update(-1, 1) == (-1, 1)
+    assert y_range.update(2, 3) == (2, 3)
+    # No data: the range stays
+    assert y_range.update(np.nan, np.nan) == (2, 3)
+
+
+def test_fixed_ignores_the_data():
+    y_range = AxisRange(axis(Policy.FIXED, -5, 5))
+    assert y_range.update(-100, 100) == (-5, 5)
+    assert y_range.update(0, 1) == (-5, 5)
+
+
+def test_grow_only_expands_from_the_requested_bounds():
+    y_range = AxisRange(axis(Policy.GROW, -1, 1))
+    assert y_range.update(0, 0.5) == (-1, 1)
+    assert y_range.update(0, 3) == (-1, 3)
+    assert y_range.update(-2, 0) == (-2, 3)
+    assert y_range.update(0, 0.1) == (-2, 3)
+
+    # Without bounds, from the first data
+    y_range = AxisRange(axis(Policy.GROW))
+    assert y_range.update(1, 2) == (1, 2)
+    assert y_range.update(0, 1.5) == (0, 2)
+
+
+def test_hysteresis_adds_headroom_and_shrinks_late():
+    y_range = AxisRange(axis(Policy.HYSTERESIS))
+    assert y_range.update(0, 10) == (-1, 11)
+    # Inside, and still using most of the range
+    assert y_range.update(2, 8) == (-1, 11)
+    # Above
+    assert y_range.update(0, 20) == (-2, 22)
+    # Much smaller than the range
+    assert y_range.update(5, 10) == (4.5, 10.5)
+
+
+@pytest.mark.parametrize('policy', [Policy.FIXED, Policy.GROW])
+def test_same_settings_compares_the_requested_bounds(policy):
+    y_range = AxisRange(axis(policy, -1, 1))
+    y_range.update(-10, 10)
+    assert y_range.same_settings(axis(policy, -1, 1))
+    assert not y_range.same_settings(axis(policy, -1, 2))
+    assert not y_range.same_settings(axis(Policy.AUTO, -1, 1))
+
+
+def test_same_settings_ignores_bounds_of_other_policies():
+    y_range = AxisRange(axis(Policy.HYSTERESIS))
+    assert y_range.same_settings(axis(Policy.HYSTERESIS, -1, 1))
+
+
+# --- IncrementalEnvelope ---
+
+@pytest.mark.parametrize('capacity, max_points', [(1000, 100), (1000, 64), (997, 30), (50, 100)])
+def test_envelope_matches_minmax_envelope_while_scrolling(capacity, max_points):
+    rng = np.random.default_rng(capacity)
+    t_all = np.arange(20 * capacity, dtype=np.float64)
+    y_all = rng.standard_normal(len(t_all))
+    envelope = IncrementalEnvelope()
+
+    written = capacity
+    for step in rng.integers(0, capacity // 3 + 2, size=60):
+        written += int(step)
+        t, y = t_all[written - capacity:written], y_all[written - capacity:written]
+        expected = minmax_envelope(t, y, max_points, phase=written - capacity)
+        for actual_column, expected_column in zip(envelope.update(t, y, written, max_points), expected):
+            np.testing.assert_array_equal(actual_column, expected_column)
+
+
+def test_envelope_starts_over_when_the_width_changes():
+    t = np.arange(1000, dtype=np.float64)
+    y = np.sin(t)
+    envelope = IncrementalEnvelope()
+    for max_points in (100, 40, 100):
+        for actual_column, expected_column in zip(envelope.update(t, y, 1000, max_points),
+                                                  minmax_envelope(t, y, max_points)):
+            np.testing.assert_array_equal(actual_column, expected_column)
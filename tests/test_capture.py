@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from src import capture
+from src.capture import CaptureReader, CaptureWriter
+from src.proto_gen import plot_pb2
+from src.sample_block import SampleBlock
+
+
+def block(signal_ids, lengths, start=0.0):
+    n = sum(lengths)
+    return SampleBlock(np.array(signal_ids, dtype=np.int64), np.array(lengths, dtype=np.int64),
+                       start + np.arange(n, dtype=np.float64), 100.0 + np.arange(n) * 0.01)
+
+
+def assert_same_block(actual, expected):
+    for actual_column, expected_column in zip(actual, expected):
+        np.testing.assert_array_equal(actual_column, expected_column)
+
+
+def test_records_round_trip(tmp_path):
+    path = str(tmp_path / 'session.bin')
+    items = [
+        ('add_axis', plot_pb2.AddAxisRequest(axis_id=1, plot_title='Axis', number_of_samples=500)),
+        ('add_signal', plot_pb2.AddSignalRequest(axis_id=1, signal_id=7, signal_name='seven')),
+        ('samples', [block([7], [3]), block([7, 8], [2, 5], start=10.0)]),
+        ('clear_all', None),
+        ('samples', [block([7], [1])]),
+    ]
+    writer = CaptureWriter(path)
+    for index, (kind, payload) in enumerate(items):
+        writer.write(kind, payload, capture_time=1000.0 + index)
+    writer.close()
+    assert writer.records == 6
+
+    with CaptureReader(path) as reader:
+        records = list(reader)
+    assert [kind for kind, _, _ in records] == [
+        'add_axis', 'add_signal', 'samples', 'samples', 'clear_all', 'samples']
+    assert [time for _, _, time in records] == [1000.0, 1001.0, 1002.0, 1002.0, 1003.0, 1004.0]
+    assert records[0][1] == items[0][1]
+    assert records[1][1] == items[1][1]
+    assert records[4][1] is None
+    for (_, payload, _), expected in zip(records[2:4], items[2][1]):
+        assert len(payload) == 1
+        assert_same_block(payload[0], expected)
+    assert_same_block(records[5][1][0], items[4][1][0])
+
+
+def test_file_is_truncated_on_close(tmp_path):
+    path = tmp_path / 'session.bin'
+    writer = CaptureWriter(str(path))
+    writer.write('samples', [block([1], [4])])
+    writer.close()
+    assert path.stat().st_size < capture.CHUNK_SIZE
+    assert path.stat().st_size % 8 == 0
+    # Writes after close() are ignored
+    writer.write('samples', [block([1], [4])])
+    with CaptureReader(str(path)) as reader:
+        assert len(list(reader)) == 1
+
+
+def test_file_grows_past_a_chunk(tmp_path, monkeypatch):
+    monkeypatch.setattr(capture, 'CHUNK_SIZE', 4096)
+    path = str(tmp_path / 'session.bin')
+    writer = CaptureWriter(path)
+    blocks = [block([index], [100], start=index) for index in range(20)]
+    for item in blocks:
+        writer.write('samples', [item])
+    writer.close()
+
+    with CaptureReader(path) as reader:
+        records = list(reader)
+    assert len(records) == 20
+    for (_, payload, _), expected in zip(records, blocks):
+        assert_same_block(payload[0], expected)
+
+
+def test_reader_rejects_other_files(tmp_path):
+    path = tmp_path / 'other.bin'
+    path.write_bytes(b'not a capture file')
+    with pytest.raises(ValueError):
+        CaptureReader(str(path))
+
+
+def test_reader_closes(tmp_path):
+    path = str(tmp_path / 'session.bin')
+    writer = CaptureWriter(path)
+    writer.write('samples', [block([1], [4])])
+    writer.close()
+
+    reader = CaptureReader(path)
+    (_, payload, _), = list(reader)
+    # The block still refers to the mapping: released once it is gone
+    reader.close()
+    assert_same_block(payload[0], block([1], [4]))
+    reader.close()
+    with pytest.raises(ValueError):
+        list(reader)
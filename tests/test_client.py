@@ -0,0 +1,89 @@
+import threading
+import time
+from concurrent import futures
+
+import grpc
+import pytest
+from google.protobuf import empty_pb2
+
+from src import client
+from src.client import Dashboard
+from src.proto_gen import plot_pb2_grpc
+
+
+class FailingServicer(plot_pb2_grpc.PlotServiceServicer):
+    """Fails the first `failures` streams with `code`, then takes them."""
+
+    def __init__(self, code, failures):
+        self.code = code
+        self.failures = failures
+        self.streams = 0
+        self.points = 0
+        self.done = threading.Event()
+
+    def streamPlotPacked(self, request_iterator, context):
+        self.streams += 1
+        for request in request_iterator:
+            if self.streams <= self.failures:
+                context.abort(self.code, "rejected")
+            self.points += len(request.signals[0].raw_values) // 4
+        self.done.set()
+        return empty_pb2.Empty()
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(servicer):
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+        plot_pb2_grpc.add_PlotServiceServicer_to_server(servicer, server)
+        port = server.add_insecure_port('127.0.0.1:0')
+        server.start()
+        servers.append(server)
+        return f'127.0.0.1:{port}'
+
+    yield start
+    for server in servers:
+        server.stop(0)
+
+
+def test_unavailable_streams_are_reopened(serve, monkeypatch):
+    monkeypatch.setattr(client, 'RETRY_INTERVAL', 0.01)
+    servicer = FailingServicer(grpc.StatusCode.UNAVAILABLE, failures=2)
+    dashboard = Dashboard(serve(servicer))
+    signal = dashboard.add_axis(1).add_signal(10)
+
+    dashboard.start()
+    deadline = time.monotonic() + 5
+    while servicer.streams < 3 and time.monotonic() < deadline:
+        signal.push(1.0)
+        time.sleep(0.01)
+    signal.push(2.0)
+    dashboard.close()
+
+    assert servicer.streams == 3
+    assert dashboard.error is None
+    stats = dashboard.stats()
+    # What the failed streams were sending is counted
+    assert stats['lost'] > 0
+    assert 0 < servicer.points <= stats['pushed'] - stats['lost']
+
+
+def test_other_errors_stop_the_stream(serve):
+    servicer = FailingServicer(grpc.StatusCode.INVALID_ARGUMENT, failures=1)
+    dashboard = Dashboard(serve(servicer))
+    signal = dashboard.add_axis(1).add_signal(10)
+
+    dashboard.start()
+    signal.push([1.0, 2.0, 3.0])
+    dashboard._thread.join(5)
+    assert not dashboard._thread.is_alive()
+    assert servicer.streams == 1
+    assert dashboard.error.code() == grpc.StatusCode.INVALID_ARGUMENT
+    assert dashboard.stats()['lost'] == 3
+
+    with pytest.raises(grpc.RpcError):
+        signal.push(4.0)
+    with pytest.raises(grpc.RpcError):
+        dashboard.close()
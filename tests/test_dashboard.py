@@ -0,0 +1,107 @@
+import os
+# Must be set before Qt is imported
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import numpy as np
+import pytest
+from PyQt5 import QtWidgets
+
+from src.main_window import MainWindow
+from src.proto_gen import plot_pb2
+from src.sample_block import SampleBlock
+
+SAMPLES = 8
+
+
+@pytest.fixture(scope='module')
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+@pytest.fixture
+def window(app):
+    window = MainWindow()
+    yield window
+    window.render_timer.stop()
+    window.close()
+
+
+def spec(axes, signals):
+    """A DashboardSpec: `axes` IDs, `signals` {signal ID: axis ID}."""
+    return plot_pb2.DashboardSpec(
+        axes=[plot_pb2.AddAxisRequest(axis_id=axis_id, plot_title=f"Axis {axis_id}",
+                                      number_of_samples=SAMPLES) for axis_id in axes],
+        signals=[plot_pb2.AddSignalRequest(axis_id=axis_id, signal_id=signal_id, signal_name=f"s{signal_id}")
+                 for signal_id, axis_id in signals.items()])
+
+
+def feed(window, signal_ids, length=3):
+    signal_ids = np.asarray(signal_ids, dtype=np.int64)
+    values = np.repeat(signal_ids, length).astype(np.float64)
+    window.on_add_sample_blocks([SampleBlock(signal_ids, np.full(len(signal_ids), length, dtype=np.int64),
+                                             values, np.arange(len(values), dtype=np.float64))])
+
+
+def data(window, signal_id):
+    """The values held for a signal, oldest first."""
+    slot = window.signal_index.lookup([signal_id])[0]
+    assert slot >= 0
+    row = window.sample_bank.row_view(slot)
+    return row[SAMPLES - int(min(window.sample_bank.written[slot], SAMPLES)):].tolist()
+
+
+def layout_order(window):
+    """Axis IDs in the order of their rows in the layout."""
+    rows = {window.layoutWidget.ci.items[window.plots[axis_id]['plot']][0][0]: axis_id
+            for axis_id in window.plots}
+    return [rows[row] for row in sorted(rows)]
+
+
+def test_signals_keep_their_data_across_a_reconfigure(window):
+    window.on_configure_dashboard(spec([1, 2], {10: 1, 20: 2}))
+    feed(window, [10, 20])
+
+    # Renamed, with a signal added in front of the existing one
+    changed = spec([1, 2], {11: 1, 10: 1, 20: 2})
+    changed.signals[1].signal_name = 'renamed'
+    window.on_configure_dashboard(changed)
+
+    assert data(window, 10) == [10.0] * 3
+    assert data(window, 20) == [20.0] * 3
+    assert data(window, 11) == []
+    assert window.plots[1]['signals'][10]['line'].name() == 'renamed'
+
+
+def test_removing_a_middle_signal_and_axis(window):
+    window.on_configure_dashboard(spec([1, 2, 3], {10: 1, 11: 1, 12: 1, 20: 2, 30: 3}))
+    feed(window, [10, 11, 12, 20, 30])
+
+    window.on_configure_dashboard(spec([1, 3], {10: 1, 12: 1, 30: 3}))
+
+    assert set(window.plots) == {1, 3}
+    assert set(window.signal_to_axis_map) == {10, 12, 30}
+    assert window.signal_index.lookup([11, 20]).tolist() == [-1, -1]
+    assert window.sample_bank.rows == 3
+    for signal_id in (10, 12, 30):
+        assert data(window, signal_id) == [float(signal_id)] * 3
+    assert layout_order(window) == [1, 3]
+
+    # The remaining signals still receive their own samples
+    feed(window, [12], length=1)
+    assert data(window, 12) == [12.0] * 4
+    assert data(window, 10) == [10.0] * 3
+
+
+def test_reordering_axes(window):
+    window.on_configure_dashboard(spec([1, 2, 3], {10: 1, 20: 2, 30: 3}))
+    feed(window, [10, 20, 30])
+    plot_items = {axis_id: plot_info['plot'] for axis_id, plot_info in window.plots.items()}
+
+    window.on_configure_dashboard(spec([3, 1, 2], {10: 1, 20: 2, 30: 3}))
+
+    assert window.axis_order == [3, 1, 2]
+    assert layout_order(window) == [3, 1, 2]
+    # Same plots, moved rather than recreated
+    assert all(window.plots[axis_id]['plot'] is plot_item for axis_id, plot_item in plot_items.items())
+    for signal_id in (10, 20, 30):
+        assert data(window, signal_id) == [float(signal_id)] * 3
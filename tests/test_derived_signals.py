@@ -0,0 +1,161 @@
+import numpy as np
+import pytest
+
+from src.derived_signals import DerivedSignals, make_transform
+from src.plot_servicer import validate_dashboard_spec
+from src.proto_gen import plot_pb2
+from src.sample_block import SampleBlock
+
+Transform = plot_pb2.DerivedSignal
+
+# Chunk boundaries the samples are split at
+SPLITS = [1, 2, 7, 8, 30, 31]
+
+
+# --- Reference implementations (one sample at a time) ---
+
+def ema(x, alpha):
+    y, last = [], x[0]
+    for value in x:
+        last = alpha * value + (1 - alpha) * last
+        y.append(last)
+    return np.array(y)
+
+
+def fir(x, taps):
+    return np.array([sum(tap * (x[n - k] if n >= k else 0.0) for k, tap in enumerate(taps))
+                     for n in range(len(x))])
+
+
+def rms(x, window):
+    return np.array([np.sqrt(np.mean(x[max(0, n - window + 1):n + 1] ** 2)) for n in range(len(x))])
+
+
+def chunked(transform, t, x):
+    outputs = [transform.process(t_chunk, x_chunk)
+               for t_chunk, x_chunk in zip(np.split(t, SPLITS), np.split(x, SPLITS))]
+    return (np.concatenate([t for t, _ in outputs]), np.concatenate([y for _, y in outputs]))
+
+
+@pytest.fixture
+def samples():
+    rng = np.random.default_rng(2)
+    return np.cumsum(rng.uniform(0.01, 0.02, 40)), rng.standard_normal(40)
+
+
+@pytest.mark.parametrize('derived, reference', [
+    (Transform(transform=Transform.EMA, alpha=0.3), lambda x: ema(x, 0.3)),
+    (Transform(transform=Transform.EMA, alpha=1.0), lambda x: x),
+    (Transform(transform=Transform.FIR, taps=[0.5, 0.25, 0.125, 0.125]),
+     lambda x: fir(x, [0.5, 0.25, 0.125, 0.125])),
+    (Transform(transform=Transform.RMS, window=5), lambda x: rms(x, 5)),
+    (Transform(transform=Transform.RMS, window=1), lambda x: rms(x, 1)),
+])
+def test_transform_across_chunks(samples, derived, reference):
+    t, x = samples
+    derived_t, y = chunked(make_transform(derived), t, x)
+    np.testing.assert_array_equal(derived_t, t)
+    np.testing.assert_allclose(y, reference(x), atol=1e-12)
+
+
+def test_ema_with_long_chunks_stays_finite():
+    transform = make_transform(Transform(transform=Transform.EMA, alpha=0.5))
+    x = np.ones(10000)
+    _, y = transform.process(np.arange(10000.0), x)
+    np.testing.assert_allclose(y, x)
+
+
+def test_ema_skips_non_finite_inputs():
+    transform = make_transform(Transform(transform=Transform.EMA, alpha=0.5))
+    t, y = transform.process(np.arange(4.0), np.array([2.0, np.nan, 4.0, np.inf]))
+    np.testing.assert_array_equal(t, [0.0, 2.0])
+    np.testing.assert_array_equal(y, [2.0, 3.0])
+    t, y = transform.process(np.array([4.0]), np.array([1.0]))
+    np.testing.assert_array_equal(y, [2.0])
+    t, y = transform.process(np.array([5.0]), np.array([np.nan]))
+    assert not len(t) and not len(y)
+
+
+def test_diff_across_chunks(samples):
+    t, x = samples
+    derived_t, y = chunked(make_transform(Transform(transform=Transform.DIFF)), t, x)
+    np.testing.assert_array_equal(derived_t, t[1:])
+    np.testing.assert_allclose(y, np.diff(x) / np.diff(t))
+
+
+def test_diff_skips_samples_without_a_time_step():
+    transform = make_transform(Transform(transform=Transform.DIFF))
+    transform.process(np.array([1.0]), np.array([0.0]))
+    t, y = transform.process(np.array([1.0, 2.0]), np.array([5.0, 2.0]))
+    np.testing.assert_array_equal(t, [2.0])
+    np.testing.assert_array_equal(y, [-3.0])
+
+
+@pytest.mark.parametrize('derived', [
+    Transform(transform=Transform.EMA, alpha=0.0),
+    Transform(transform=Transform.FIR),
+    Transform(transform=Transform.RMS, window=0),
+    Transform(),
+])
+def test_invalid_transforms(derived):
+    with pytest.raises(ValueError):
+        make_transform(derived)
+
+
+# --- DerivedSignals ---
+
+def test_apply_appends_derived_runs():
+    derived = DerivedSignals()
+    derived.add(10, Transform(source_signal_id=1, transform=Transform.FIR, taps=[2.0]))
+    block = SampleBlock(np.array([1, 2, 1]), np.array([2, 1, 1]),
+                        np.array([1.0, 2.0, 9.0, 3.0]), np.array([0.1, 0.2, 0.2, 0.3]))
+    result = derived.apply(block)
+    np.testing.assert_array_equal(result.signal_ids, [1, 2, 1, 10])
+    np.testing.assert_array_equal(result.lengths, [2, 1, 1, 3])
+    np.testing.assert_array_equal(result.values[4:], [2.0, 4.0, 6.0])
+    np.testing.assert_array_equal(result.timestamps[4:], [0.1, 0.2, 0.3])
+
+
+def test_configure_keeps_unchanged_state():
+    derived = DerivedSignals()
+    ema = Transform(source_signal_id=1, transform=Transform.EMA, alpha=0.5)
+    derived.add(10, ema)
+    derived.apply(SampleBlock(np.array([1]), np.array([1]), np.array([4.0]), np.array([0.0])))
+
+    derived.configure([plot_pb2.AddSignalRequest(signal_id=10, derived=ema)])
+    result = derived.apply(SampleBlock(np.array([1]), np.array([1]), np.array([0.0]), np.array([1.0])))
+    assert result.values[-1] == 2.0
+
+    derived.configure([])
+    block = SampleBlock(np.array([1]), np.array([1]), np.array([0.0]), np.array([2.0]))
+    assert derived.apply(block) is block
+
+
+def test_signal_cant_derive_from_itself():
+    with pytest.raises(ValueError):
+        DerivedSignals().add(3, Transform(source_signal_id=3, transform=Transform.DIFF))
+
+
+def test_derived_signals_cant_be_chained():
+    derived = DerivedSignals()
+    derived.add(10, Transform(source_signal_id=1, transform=Transform.DIFF))
+    # From a derived signal
+    with pytest.raises(ValueError):
+        derived.add(20, Transform(source_signal_id=10, transform=Transform.DIFF))
+    # A source made derived
+    with pytest.raises(ValueError):
+        derived.add(1, Transform(source_signal_id=2, transform=Transform.DIFF))
+    # Redefining a derived signal is fine
+    derived.add(10, Transform(source_signal_id=2, transform=Transform.DIFF))
+
+
+def test_dashboard_spec_cant_chain_derived_signals():
+    spec = plot_pb2.DashboardSpec(
+        axes=[plot_pb2.AddAxisRequest(axis_id=1)],
+        signals=[plot_pb2.AddSignalRequest(axis_id=1, signal_id=1),
+                 plot_pb2.AddSignalRequest(axis_id=1, signal_id=10,
+                                           derived=Transform(source_signal_id=1, transform=Transform.DIFF))])
+    validate_dashboard_spec(spec)
+    spec.signals.add(axis_id=1, signal_id=20, derived=Transform(source_signal_id=10, transform=Transform.DIFF))
+    with pytest.raises(ValueError):
+        validate_dashboard_spec(spec)
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from src.fanout import FanOut
+from src.proto_gen import plot_pb2
+from src.sample_block import SampleBlock
+from src.sessions import GLOBAL_ID_BASE, SessionRegistry
+
+
+def registry_with_producer():
+    """A registry where session 'a' declared signal 10 on axis 1."""
+    registry = SessionRegistry()
+    session = registry.get('a')
+    session.axis_request(plot_pb2.AddAxisRequest(axis_id=1))
+    session.signal_request(plot_pb2.AddSignalRequest(axis_id=1, signal_id=10))
+    return registry
+
+
+def registry_state(registry):
+    return (sorted(registry.sessions), dict(registry.owners), dict(registry._next_ids),
+            {name: dict(session._signal_ids) for name, session in registry.sessions.items()})
+
+
+def block(signal_ids, lengths):
+    samples = int(sum(lengths))
+    return SampleBlock(np.asarray(signal_ids, dtype=np.int64), np.asarray(lengths, dtype=np.int64),
+                       np.arange(samples, dtype=np.float32), np.arange(samples, dtype=np.float64))
+
+
+def decode(message):
+    request = plot_pb2.streamPackedRequest.FromString(message)
+    return {signal.signal_id: np.frombuffer(signal.raw_values, dtype='<f4').tolist()
+            for signal in request.signals}
+
+
+# --- subscribe ---
+
+def test_subscribing_leaves_the_sessions_unchanged():
+    registry = registry_with_producer()
+    before = registry_state(registry)
+    fanout = FanOut(registry)
+
+    for name in ('x', 'y', 'z'):
+        with pytest.raises(ValueError):
+            fanout.subscribe(plot_pb2.SubscribeRequest(session=name, signal_ids=range(1000)), 'peer')
+    with pytest.raises(ValueError):
+        fanout.subscribe(plot_pb2.SubscribeRequest(session='a', signal_ids=[10, 11]), 'peer')
+    fanout.unsubscribe(fanout.subscribe(plot_pb2.SubscribeRequest(session='a', signal_ids=[10]), 'peer'))
+    fanout.unsubscribe(fanout.subscribe(plot_pb2.SubscribeRequest(session='a'), 'peer'))
+
+    assert registry_state(registry) == before
+    assert fanout.subscribers == ()
+
+
+def test_default_session_subscription_does_not_create_sessions():
+    registry = SessionRegistry()
+    fanout = FanOut(registry)
+    subscriber = fanout.subscribe(plot_pb2.SubscribeRequest(signal_ids=[3]), 'peer')
+    assert subscriber.signal_ids == {3}
+    assert not registry.has_named_sessions()
+    with pytest.raises(ValueError):
+        fanout.subscribe(plot_pb2.SubscribeRequest(signal_ids=[GLOBAL_ID_BASE]), 'peer')
+
+
+# --- publish ---
+
+def test_subscriber_gets_its_signals_with_local_ids():
+    registry = registry_with_producer()
+    global_id = registry.sessions['a'].lookup_signal_id(10)
+    fanout = FanOut(registry)
+    subscriber = fanout.subscribe(plot_pb2.SubscribeRequest(session='a'), 'peer')
+
+    fanout.publish(block([global_id, 3], [2, 1]))
+    assert [decode(message) for message in subscriber.take(timeout=0)] == [{10: [0.0, 1.0]}]
+
+
+def test_decimation_keeps_one_sample_per_period():
+    registry = SessionRegistry()
+    fanout = FanOut(registry)
+    subscriber = fanout.subscribe(plot_pb2.SubscribeRequest(signal_ids=[3], max_rate=0.5), 'peer')
+
+    fanout.publish(block([3], [5]))
+    fanout.publish(block([3], [1]))
+    assert [decode(message) for message in subscriber.take(timeout=0)] == [{3: [0.0, 2.0, 4.0]}]
@@ -0,0 +1,111 @@
+import os
+
+import numpy as np
+import pytest
+
+from src import history
+from src.history import HistoryStore
+
+SAMPLES = 20_011
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(history, 'CHUNK_SIZE', 64)
+    monkeypatch.setattr(history, 'INITIAL_ROWS', 16)
+
+
+def samples(seed):
+    rng = np.random.default_rng(seed)
+    return np.arange(SAMPLES) * 0.01, rng.standard_normal(SAMPLES)
+
+
+def fill(store, batch=997):
+    """Two signals, interleaved in blocks of runs. Returns their samples."""
+    expected = {1: samples(1), 2: samples(2)}
+    for start in range(0, SAMPLES, batch):
+        piece = slice(start, start + batch)
+        lengths = np.array([len(expected[1][0][piece])] * 2)
+        store.append_runs(np.array([1, 2]), lengths,
+                          np.concatenate([expected[s][0][piece] for s in (1, 2)]),
+                          np.concatenate([expected[s][1][piece] for s in (1, 2)]))
+    return expected
+
+
+def assert_envelope(fetched, t, y, t0):
+    """
+    Each fetched row covers the samples from its time up to the next
+    row's (the last row, a raw sample, only itself): compare with the
+    min, max and mean of those samples.
+    """
+    bucket_t, bucket_min, bucket_max, bucket_mean = fetched
+    assert np.all(np.diff(bucket_t) > 0)
+    assert bucket_t[0] <= t0
+    assert bucket_t[-1] == t[-1]
+    bounds = np.searchsorted(t, np.r_[bucket_t, np.inf])
+    for i, (a, b) in enumerate(zip(bounds[:-1], bounds[1:])):
+        assert bucket_min[i] == y[a:b].min()
+        assert bucket_max[i] == y[a:b].max()
+        assert bucket_mean[i] == pytest.approx(y[a:b].mean())
+
+
+@pytest.mark.parametrize('max_points', [100_000, 500, 40])
+@pytest.mark.parametrize('t0', [0.0, 12.345])
+def test_envelope_across_spilled_and_memory_chunks(tmp_path, max_points, t0):
+    store = HistoryStore(memory_samples=64, directory=str(tmp_path))
+    expected = fill(store)
+    before_flush = store.get(1).fetch(t0, expected[1][0][-1], max_points)
+    assert store.flush(timeout=10)
+
+    raw = store.get(1).levels[0]
+    assert raw.files and all(os.path.exists(path) for path in raw.files)
+    assert isinstance(raw.chunks[0], np.memmap)
+    assert not isinstance(raw.chunks[-1], np.memmap)
+
+    for signal_id, (t, y) in expected.items():
+        fetched = store.get(signal_id).fetch(t0, t[-1], max_points)
+        assert len(fetched[0]) <= max_points + 2 * history.FACTOR * history.LEVELS
+        assert_envelope(fetched, t, y, t0)
+    # Spilling doesn't change what a fetch returns
+    for column, other in zip(store.get(1).fetch(t0, expected[1][0][-1], max_points), before_flush):
+        np.testing.assert_array_equal(column, other)
+    store.close()
+
+
+def test_raw_samples_are_returned_as_they_are(tmp_path):
+    store = HistoryStore(memory_samples=64, directory=str(tmp_path))
+    t, y = fill(store)[2]
+    a, b = 1000, 1500
+    fetched_t, fetched_min, fetched_max, fetched_mean = store.get(2).fetch(t[a], t[b], 10_000)
+    # With the samples just outside of the range
+    np.testing.assert_array_equal(fetched_t, t[a - 1:b + 2])
+    for column in (fetched_min, fetched_max, fetched_mean):
+        np.testing.assert_array_equal(column, y[a - 1:b + 2])
+    store.close()
+
+
+def test_without_a_directory_old_chunks_are_dropped():
+    store = HistoryStore(memory_samples=64)
+    t, y = fill(store)[1]
+    signal = store.get(1)
+    assert signal.levels[0].first > 0
+    assert not signal.levels[0].files
+    # The coarser levels still reach back to the start
+    assert signal.time_range() == (t[0], t[-1])
+    fetched_t, fetched_min, fetched_max, _ = signal.fetch(t[0], t[-1], 40)
+    assert fetched_t[0] == t[0]
+    assert fetched_min.min() == y.min()
+    assert fetched_max.max() == y.max()
+
+
+def test_remove_deletes_the_spill_files(tmp_path):
+    store = HistoryStore(memory_samples=64, directory=str(tmp_path))
+    fill(store)
+    store.flush(timeout=10)
+    files = [path for level in store.get(1).levels for path in level.files]
+    assert files
+    store.remove(1)
+    assert not any(os.path.exists(path) for path in files)
+    assert store.get(2).levels[0].files
+    store.close()
+    assert not os.path.exists(store.directory)
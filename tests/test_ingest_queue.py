@@ -0,0 +1,111 @@
+import pytest
+
+from src.ingest_queue import IngestQueue
+
+
+def payloads(items):
+    return [payload for _, payload in items]
+
+
+# --- Overflow policies ---
+
+def test_drop_oldest_discards_the_sessions_oldest_item():
+    queue = IngestQueue(capacity=2, policy='drop_oldest')
+    for value in (1, 2, 3):
+        queue.put('samples', [value])
+    assert payloads(queue.drain()) == [[2], [3]]
+    assert queue.stats()['dropped'] == 1
+
+
+def test_drop_oldest_only_drops_from_the_full_session():
+    queue = IngestQueue(capacity=1, policy='drop_oldest')
+    queue.put('samples', ['a1'], session='a')
+    queue.put('samples', ['b1'], session='b')
+    queue.put('samples', ['a2'], session='a')
+    assert payloads(queue.drain()) == [['b1'], ['a2']]
+
+
+def test_merge_folds_into_the_newest_item():
+    queue = IngestQueue(capacity=1, policy='merge')
+    assert queue.put('samples', [1]) == (True, True)
+    assert queue.put('samples', [2]) == (True, False)
+    assert payloads(queue.drain()) == [[1, 2]]
+    assert queue.stats()['merged'] == 1
+
+
+def test_merge_does_not_cross_a_configuration_item():
+    queue = IngestQueue(capacity=1, policy='merge')
+    queue.put('samples', [1])
+    queue.put('clear_all', None)
+    queue.put('samples', [2])
+    assert payloads(queue.drain()) == [[1], None, [2]]
+
+
+def test_merge_does_not_cross_a_configuration_item_of_a_named_session():
+    queue = IngestQueue(capacity=1, policy='merge')
+    queue.put('samples', ['a1'], session='robot')
+    queue.put('add_signal', 'signal')
+    queue.put('samples', ['a2'], session='robot')
+    assert payloads(queue.drain()) == [['a1'], 'signal', ['a2']]
+
+
+def test_block_times_out_when_full():
+    queue = IngestQueue(capacity=1, policy='block')
+    queue.put('samples', [1])
+    assert queue.put('samples', [2], timeout=0.01) == (False, False)
+    queue.drain()
+    assert queue.put('samples', [2], timeout=0.01) == (True, True)
+
+
+def test_configuration_items_are_never_dropped():
+    queue = IngestQueue(capacity=1, policy='drop_oldest')
+    for axis_id in range(5):
+        queue.put('add_axis', axis_id)
+    assert payloads(queue.drain()) == list(range(5))
+    assert queue.stats()['dropped'] == 0
+
+
+def test_invalid_settings():
+    with pytest.raises(ValueError):
+        IngestQueue(capacity=0)
+    with pytest.raises(ValueError):
+        IngestQueue(policy='spill')
+
+
+# --- Round-robin drain ---
+
+def test_drain_interleaves_sessions():
+    queue = IngestQueue()
+    for item in ('a1', 'a2', 'a3'):
+        queue.put('samples', item, session='a')
+    for item in ('b1', 'b2'):
+        queue.put('samples', item, session='b')
+    assert payloads(queue.drain()) == ['a1', 'b1', 'a2', 'b2', 'a3']
+    assert queue.depth() == 0
+
+
+def test_limited_drain_puts_the_rest_back_in_order():
+    queue = IngestQueue()
+    for item in ('a1', 'a2', 'a3'):
+        queue.put('samples', item, session='a')
+    for item in ('b1', 'b2'):
+        queue.put('samples', item, session='b')
+    assert payloads(queue.drain(max_data_items=3)) == ['a1', 'b1', 'a2']
+    assert payloads(queue.drain()) == ['a3', 'b2']
+
+
+def test_configuration_items_are_barriers():
+    queue = IngestQueue()
+    queue.put('samples', 'a1', session='a')
+    queue.put('samples', 'a2', session='a')
+    queue.put('add_axis', 'axis', session='b')
+    queue.put('samples', 'b1', session='b')
+    assert payloads(queue.drain()) == ['a1', 'a2', 'axis', 'b1']
+
+
+def test_single_session_drains_in_arrival_order():
+    queue = IngestQueue()
+    queue.put('samples', 1)
+    queue.put('remove_axis', 2)
+    queue.put('samples', 3)
+    assert payloads(queue.drain()) == [1, 2, 3]
@@ -0,0 +1,219 @@
+from collections import deque
+
+import numpy as np
+import pytest
+
+from src.ring_buffer import RingBufferBank
+from src.signal_index import SignalIndex
+
+
+# --- Reference ---
+# One plain deque per row: the bank must always show the same windows.
+class ReferenceBank:
+
+    def __init__(self):
+        self.rows = []
+
+    def insert_rows(self, rows, capacities):
+        for row, capacity in sorted(zip(rows, capacities)):
+            self.rows.insert(row, deque(maxlen=capacity))
+
+    def remove_rows(self, row, count=1):
+        del self.rows[row:row + count]
+
+    def extend_rows(self, rows, lengths, values):
+        values = np.asarray(values)
+        start = 0
+        for row, length in zip(rows, lengths):
+            self.rows[row].extend(values[..., start:start + length].T.tolist())
+            start += length
+
+    def window(self, row, channel=None):
+        capacity = self.rows[row].maxlen
+        samples = list(self.rows[row])
+        if channel is not None:
+            samples = [sample[channel] for sample in samples]
+        return [0.0] * (capacity - len(samples)) + samples
+
+
+def assert_same(bank, reference, channels=None):
+    assert bank.rows == len(reference.rows)
+    for row in range(bank.rows):
+        if channels is None:
+            np.testing.assert_array_equal(bank.row_view(row), reference.window(row))
+        else:
+            for channel in range(channels):
+                np.testing.assert_array_equal(bank.row_view(row, channel),
+                                              reference.window(row, channel))
+
+
+def both(capacities):
+    bank, reference = RingBufferBank(), ReferenceBank()
+    rows = list(range(len(capacities)))
+    bank.insert_rows(rows, capacities)
+    reference.insert_rows(rows, capacities)
+    return bank, reference
+
+
+# --- Wraparound ---
+
+def test_extend_wraps_around():
+    bank, reference = both([5])
+    values = np.arange(1.0, 13.0)
+    for chunk in np.split(values, [3, 4, 9]):
+        bank.extend_rows([0], [len(chunk)], chunk)
+        reference.extend_rows([0], [len(chunk)], chunk)
+        assert_same(bank, reference)
+    np.testing.assert_array_equal(bank.row_view(0), [8, 9, 10, 11, 12])
+    assert bank.written[0] == 12
+
+
+def test_run_longer_than_capacity_keeps_newest():
+    bank, reference = both([4, 3])
+    bank.extend_rows([0, 1], [10, 2], np.arange(12.0))
+    reference.extend_rows([0, 1], [10, 2], np.arange(12.0))
+    assert_same(bank, reference)
+    np.testing.assert_array_equal(bank.row_view(0), [6, 7, 8, 9])
+
+
+def test_single_sample_per_row_fast_path():
+    bank, reference = both([3, 2, 4])
+    for step in range(7):
+        values = np.array([step, 10 + step, 20 + step], dtype=float)
+        bank.extend_rows([2, 0, 1], [1, 1, 1], values)
+        reference.extend_rows([2, 0, 1], [1, 1, 1], values)
+        assert_same(bank, reference)
+
+
+def test_view_is_contiguous_after_wrap():
+    bank, _ = both([4])
+    bank.extend_rows([0], [6], np.arange(6.0))
+    view = bank.row_view(0)
+    assert view.base is not None
+    assert view.flags['C_CONTIGUOUS']
+
+
+# --- Multi-run extend ---
+
+def test_multi_run_extend_to_repeated_rows():
+    bank, reference = both([6, 4, 5])
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        runs = rng.integers(1, 8)
+        rows = rng.integers(0, 3, runs)
+        lengths = rng.integers(1, 9, runs)
+        values = rng.standard_normal(lengths.sum())
+        bank.extend_rows(rows, lengths, values)
+        reference.extend_rows(rows, lengths, values)
+        assert_same(bank, reference)
+
+
+def test_run_offsets_count_earlier_runs_of_same_row():
+    rows = np.array([1, 0, 1, 2, 1, 0])
+    lengths = np.array([2, 3, 4, 1, 5, 6])
+    np.testing.assert_array_equal(RingBufferBank._run_offsets(rows, lengths),
+                                  [0, 0, 2, 0, 6, 3])
+
+
+def test_multi_channel_rows_share_write_index():
+    bank, reference = RingBufferBank(channels=2), ReferenceBank()
+    bank.insert_rows([0, 1], [3, 4])
+    reference.insert_rows([0, 1], [3, 4])
+    values = np.array([np.arange(9.0), -np.arange(9.0)])
+    bank.extend_rows([1, 0, 1], [2, 4, 3], values)
+    reference.extend_rows([1, 0, 1], [2, 4, 3], values)
+    assert_same(bank, reference, channels=2)
+
+
+# --- Inserting and removing rows ---
+
+def test_insert_rows_in_the_middle_keeps_data():
+    bank, reference = both([3, 4, 5])
+    bank.extend_rows([0, 1, 2], [5, 6, 2], np.arange(13.0))
+    reference.extend_rows([0, 1, 2], [5, 6, 2], np.arange(13.0))
+
+    bank.insert_rows([1, 3], [2, 6])
+    reference.insert_rows([1, 3], [2, 6])
+    assert_same(bank, reference)
+    assert list(bank.capacity) == [3, 2, 4, 6, 5]
+    assert list(bank.written) == [5, 0, 6, 0, 2]
+
+    bank.extend_rows([1, 4, 3], [3, 4, 1], np.arange(8.0))
+    reference.extend_rows([1, 4, 3], [3, 4, 1], np.arange(8.0))
+    assert_same(bank, reference)
+
+
+def test_remove_rows_in_the_middle_keeps_data():
+    bank, reference = both([3, 4, 5, 2])
+    bank.extend_rows([0, 1, 2, 3], [4, 5, 6, 3], np.arange(18.0))
+    reference.extend_rows([0, 1, 2, 3], [4, 5, 6, 3], np.arange(18.0))
+
+    bank.remove_rows(1, 2)
+    reference.remove_rows(1, 2)
+    assert_same(bank, reference)
+    assert list(bank.capacity) == [3, 2]
+
+    bank.extend_rows([1, 0], [3, 1], np.arange(4.0))
+    reference.extend_rows([1, 0], [3, 1], np.arange(4.0))
+    assert_same(bank, reference)
+
+
+def test_random_inserts_removes_and_extends():
+    bank, reference = RingBufferBank(), ReferenceBank()
+    rng = np.random.default_rng(1)
+    for _ in range(200):
+        action = rng.integers(3)
+        if action == 0 or not bank.rows:
+            row = int(rng.integers(bank.rows + 1))
+            capacity = int(rng.integers(1, 9))
+            bank.insert_row(row, capacity)
+            reference.insert_rows([row], [capacity])
+        elif action == 1:
+            row = int(rng.integers(bank.rows))
+            count = int(rng.integers(1, bank.rows - row + 1))
+            bank.remove_rows(row, count)
+            reference.remove_rows(row, count)
+        else:
+            runs = rng.integers(1, 6)
+            rows = rng.integers(0, bank.rows, runs)
+            lengths = rng.integers(1, 12, runs)
+            values = rng.standard_normal(lengths.sum())
+            bank.extend_rows(rows, lengths, values)
+            reference.extend_rows(rows, lengths, values)
+        assert_same(bank, reference)
+
+
+def test_clear_removes_all_rows():
+    bank, _ = both([3, 4])
+    bank.extend_rows([0, 1], [2, 2], np.arange(4.0))
+    bank.clear()
+    assert bank.rows == 0
+    bank.insert_row(0, 2)
+    np.testing.assert_array_equal(bank.row_view(0), [0, 0])
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        RingBufferBank().insert_rows([0], [0])
+
+
+# --- SignalIndex slots as bank rows ---
+
+def test_signal_index_slots_follow_bank_rows():
+    index, bank = SignalIndex(), RingBufferBank()
+    index.add_axis(1)
+    index.add_axis(2)
+    for axis_id, signal_id in [(1, 10), (2, 20), (1, 11), (2, 21)]:
+        bank.insert_row(index.add_signal(axis_id, signal_id), 4)
+
+    slots = index.lookup([10, 11, 20, 21, 99])
+    np.testing.assert_array_equal(slots, [0, 1, 2, 3, -1])
+    bank.extend_rows(slots[:4], [1, 1, 1, 1], [10.0, 11.0, 20.0, 21.0])
+
+    # Removing signal 11 (row 1 of axis 1) moves axis 2 up by one
+    index.remove_signal(1, 1)
+    bank.remove_rows(1)
+    slots = index.lookup([10, 20, 21])
+    np.testing.assert_array_equal(slots, [0, 1, 2])
+    assert [bank.row_view(slot)[-1] for slot in slots] == [10.0, 20.0, 21.0]
+    assert index.axis_slots(2) == slice(1, 3)
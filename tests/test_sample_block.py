@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from src.proto_gen import plot_pb2
+from src.sample_block import (decode_packed_request, decode_packed_values, decode_quantized_values,
+                              quantization_scale, quantize_values)
+
+
+def scale(low=-1.0, high=1.0):
+    return quantization_scale(plot_pb2.Quantization(min=low, max=high))
+
+
+# --- Quantized values ---
+
+def test_quantized_round_trip_within_half_a_step():
+    offset, step = scale()
+    values = np.sin(np.linspace(0, 20, 1000))
+    decoded = decode_quantized_values(quantize_values(values, offset, step), offset, step)
+    assert np.abs(decoded - values).max() <= step / 2 + 1e-12
+
+
+def test_quantized_differences_wrap_around():
+    offset, step = scale()
+    # Full-scale jumps both ways: the uint16 deltas overflow
+    values = np.array([-1.0, 1.0, -1.0, 1.0, 0.0])
+    decoded = decode_quantized_values(quantize_values(values, offset, step), offset, step)
+    np.testing.assert_allclose(decoded, values, atol=step)
+
+
+def test_quantized_values_are_clamped_and_nan_is_the_top():
+    offset, step = scale()
+    data = quantize_values([-5.0, 5.0, np.nan], offset, step)
+    np.testing.assert_allclose(decode_quantized_values(data, offset, step), [-1.0, 1.0, 1.0])
+
+
+def test_quantized_values_need_a_declared_quantization():
+    samples = plot_pb2.packedSamples(signal_id=3, quantized_values=quantize_values([0.5], *scale()))
+    with pytest.raises(ValueError):
+        decode_packed_values(samples, {})
+    np.testing.assert_allclose(decode_packed_values(samples, {3: scale()}), [0.5], atol=1e-4)
+
+
+# --- Packed requests ---
+
+def test_raw_values_and_timestamps():
+    values = np.array([1.5, 2.5, 3.5], dtype='<f4')
+    timestamps = np.array([10.0, 10.1, 10.2], dtype='<f8')
+    request = plot_pb2.streamPackedRequest(signals=[plot_pb2.packedSamples(
+        signal_id=1, raw_values=values.tobytes(), raw_timestamps=timestamps.tobytes())])
+    block = decode_packed_request(request, 99.0, {})
+    np.testing.assert_array_equal(block.values, values)
+    np.testing.assert_array_equal(block.timestamps, timestamps)
+
+
+def test_runs_and_timestamp_rules():
+    request = plot_pb2.streamPackedRequest(signals=[
+        plot_pb2.packedSamples(signal_id=1, values=[1, 2, 3], start_time=5.0, sample_period=0.5),
+        plot_pb2.packedSamples(signal_id=2, values=[4, 5]),
+        plot_pb2.packedSamples(signal_id=3),
+        plot_pb2.packedSamples(signal_id=4, quantized_values=quantize_values([0.0, 0.25], *scale())),
+    ])
+    last_sample_time = {2: 8.0}
+    block = decode_packed_request(request, 10.0, last_sample_time, {4: scale()})
+
+    np.testing.assert_array_equal(block.signal_ids, [1, 2, 4])
+    np.testing.assert_array_equal(block.lengths, [3, 2, 2])
+    np.testing.assert_allclose(block.values, [1, 2, 3, 4, 5, 0.0, 0.25], atol=1e-4)
+    # Sample period from start_time; spread since the previous sample;
+    # the reception time otherwise
+    np.testing.assert_allclose(block.timestamps, [5.0, 5.5, 6.0, 9.0, 10.0, 10.0, 10.0])
+    assert last_sample_time == {1: 6.0, 2: 10.0, 4: 10.0}
+
+
+def test_mismatched_timestamps_are_rejected():
+    request = plot_pb2.streamPackedRequest(signals=[
+        plot_pb2.packedSamples(signal_id=1, values=[1, 2], timestamps=[1.0])])
+    with pytest.raises(ValueError):
+        decode_packed_request(request, 10.0, {})
+
+
+def test_empty_request_has_no_block():
+    assert decode_packed_request(plot_pb2.streamPackedRequest(), 10.0, {}) is None
@@ -0,0 +1,143 @@
+import numpy as np
+import pytest
+
+from src import sessions as sessions_module
+from src.proto_gen import plot_pb2
+from src.sample_block import SampleBlock
+from src.sessions import GLOBAL_ID_BASE, SessionRegistry
+
+
+def declare(session, axis_id, signal_ids):
+    axis = session.axis_request(plot_pb2.AddAxisRequest(axis_id=axis_id))
+    session.declare_axis(axis)
+    for signal_id in signal_ids:
+        local = plot_pb2.AddSignalRequest(axis_id=axis_id, signal_id=signal_id)
+        session.declare_signal(session.signal_request(local), local)
+
+
+def block(signal_ids, lengths):
+    samples = int(sum(lengths))
+    return SampleBlock(np.asarray(signal_ids, dtype=np.int64), np.asarray(lengths, dtype=np.int64),
+                       np.arange(samples, dtype=np.float32), np.arange(samples, dtype=np.float64))
+
+
+# --- Namespacing ---
+
+def test_colliding_local_ids_get_distinct_global_ids():
+    registry = SessionRegistry()
+    a, b = registry.get('a'), registry.get('b')
+    declare(a, 1, [10])
+    declare(b, 1, [10])
+
+    assert a.axis_id(1) != b.axis_id(1)
+    assert a.signal_id(10) != b.signal_id(10)
+    assert min(a.signal_id(10), b.signal_id(10), a.axis_id(1)) >= GLOBAL_ID_BASE
+    assert registry.owner(a.signal_id(10)) == ('a', 10)
+    assert registry.owner(b.signal_id(10)) == ('b', 10)
+
+    mapped = b.map_block(block([10], [3]))
+    assert mapped.signal_ids.tolist() == [b.signal_id(10)]
+
+
+def test_default_session_ids_are_used_as_they_are():
+    registry = SessionRegistry()
+    default = registry.get('')
+    assert default.signal_id(10) == 10
+    assert default.map_block(block([10, 11], [1, 1])).signal_ids.tolist() == [10, 11]
+    with pytest.raises(ValueError):
+        default.signal_id(GLOBAL_ID_BASE)
+    assert not registry.has_named_sessions()
+
+
+# --- Undeclared signals ---
+
+def test_unknown_ids_are_dropped_and_counted():
+    session = SessionRegistry().get('a')
+    declare(session, 1, [10, 12])
+
+    mapped = session.map_block(block([9, 10, 11, 12], [1, 2, 3, 4]))
+    assert mapped.signal_ids.tolist() == [session.signal_id(10), session.signal_id(12)]
+    assert mapped.lengths.tolist() == [2, 4]
+    np.testing.assert_array_equal(mapped.values, [1, 2, 6, 7, 8, 9])
+    np.testing.assert_array_equal(mapped.timestamps, [1, 2, 6, 7, 8, 9])
+    assert session.unknown == 4
+
+
+def test_default_session_cannot_stream_to_global_ids():
+    registry = SessionRegistry()
+    robot = registry.get('robot')
+    declare(robot, 1, [10])
+    default = registry.get('')
+
+    mapped = default.map_block(block([3, robot.signal_id(10)], [2, 4]))
+    assert mapped.signal_ids.tolist() == [3]
+    np.testing.assert_array_equal(mapped.values, [0, 1])
+    assert default.unknown == 4
+
+
+def test_session_without_signals_drops_everything():
+    session = SessionRegistry().get('a')
+    mapped = session.map_block(block([10], [5]))
+    assert mapped.size == 0
+    assert session.unknown == 5
+
+
+# --- Quotas of IDs ---
+
+def test_a_session_cannot_map_more_than_max_session_ids(monkeypatch):
+    monkeypatch.setattr(sessions_module, 'MAX_SESSION_IDS', 3)
+    registry = SessionRegistry()
+    session = registry.get('a')
+    for signal_id in range(3):
+        session.signal_id(signal_id)
+    with pytest.raises(ValueError):
+        session.signal_id(3)
+    # Known IDs still map, and no global ID was taken
+    assert session.signal_id(2) == GLOBAL_ID_BASE + 2
+    assert len(registry.owners) == 3
+
+
+# --- Number of sessions ---
+
+def test_idle_sessions_make_room_for_new_ones(monkeypatch):
+    monkeypatch.setattr(sessions_module, 'MAX_SESSIONS', 2)
+    monkeypatch.setattr(sessions_module, 'SESSION_IDLE_TIMEOUT', 0.0)
+    registry = SessionRegistry()
+    busy, idle = registry.get('busy'), registry.get('idle')
+    declare(busy, 1, [10])
+    idle.signal_id(10)
+    global_id = idle.signal_id(11)
+
+    new = registry.get('new')
+    assert sorted(registry.sessions) == ['', 'busy', 'new']
+    assert global_id not in registry.owners
+    # A stream still holding the dropped session gets nowhere
+    assert idle.map_block(block([10, 11], [1, 1])).size == 0
+    # Its global IDs are not handed out again
+    assert new.signal_id(10) > global_id
+
+
+def test_no_room_for_a_new_session(monkeypatch):
+    monkeypatch.setattr(sessions_module, 'MAX_SESSIONS', 1)
+    registry = SessionRegistry()
+    registry.get('a')
+    with pytest.raises(ValueError):
+        registry.get('b')
+    assert registry.get('') is not None
+    assert sorted(registry.sessions) == ['', 'a']
+
+
+# --- Merged dashboard ---
+
+def test_merged_spec_lists_the_sessions_in_order():
+    registry = SessionRegistry()
+    b, a = registry.get('b'), registry.get('a')
+    declare(a, 1, [10])
+    declare(b, 1, [10, 11])
+    # Not in the dashboard: its axis is gone
+    b.forget_axis(b.axis_id(1))
+    declare(b, 2, [20])
+
+    spec = registry.merged_spec()
+    assert [axis.axis_id for axis in spec.axes] == [b.axis_id(2), a.axis_id(1)]
+    assert [signal.signal_id for signal in spec.signals] == [b.signal_id(20), a.signal_id(10)]
@@ -0,0 +1,48 @@
+import threading
+
+import numpy as np
+import pytest
+
+from src.sample_block import SampleBlock
+from src.shm_ring import SharedRingReader, SharedRingWriter, create_ring
+
+
+def block(signal_id, length):
+    return SampleBlock(np.array([signal_id], dtype=np.int64), np.array([length], dtype=np.int64),
+                       np.arange(length, dtype=np.float64), np.arange(length, dtype=np.float64))
+
+
+@pytest.fixture
+def ring():
+    shm = create_ring(4096)
+    writer, reader = SharedRingWriter(shm), SharedRingReader(shm)
+    yield writer, reader
+    writer.close()
+    reader.close()
+    shm.close()
+    shm.unlink()
+
+
+def test_items_wrap_around_the_ring(ring):
+    writer, reader = ring
+    for signal_id in range(20):
+        assert writer.write('samples', [block(signal_id, 50)])
+        (kind, payload), = reader.drain()
+        assert kind == 'samples'
+        assert payload[0].signal_ids.tolist() == [signal_id]
+        np.testing.assert_array_equal(payload[0].values, np.arange(50))
+    reader.release()
+    assert reader.depth() == 0
+
+
+def test_full_ring_drops_the_item_once_stopping(ring):
+    writer, _ = ring
+    stopping = threading.Event()
+    while writer.capacity - writer.used() >= 1024:
+        assert writer.write('samples', [block(1, 50)], stopping=stopping)
+    used = writer.used()
+
+    stopping.set()
+    # Nobody drains the ring: this would wait forever without `stopping`
+    assert not writer.write('samples', [block(1, 100)], stopping=stopping)
+    assert writer.used() == used
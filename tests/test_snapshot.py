@@ -0,0 +1,45 @@
+import os
+import re
+
+import numpy as np
+import pytest
+
+from src.snapshot import Snapshot, read_snapshot, snapshot_path
+
+
+# --- snapshot_path ---
+
+def test_default_name_is_the_time():
+    path = snapshot_path('/data')
+    assert os.path.dirname(path) == '/data'
+    assert re.fullmatch(r'snapshot-\d{8}-\d{6}-\d{3}\.npz', os.path.basename(path))
+
+
+def test_extension_is_added_once():
+    assert snapshot_path('/data', 'run1') == os.path.join('/data', 'run1.npz')
+    assert snapshot_path('/data', 'run1.npz') == os.path.join('/data', 'run1.npz')
+
+
+@pytest.mark.parametrize('name', ['../run1', 'sub/run1', '/tmp/run1', '.', '..'])
+def test_names_must_stay_in_the_directory(name):
+    with pytest.raises(ValueError):
+        snapshot_path('/data', name)
+
+
+# --- Round trip ---
+
+def test_write_and_read(tmp_path):
+    signals = [{'signal_id': 3, 'axis_id': 1, 'name': 'three', 'color': 'r', 'samples': 4, 'written': 9}]
+    columns = {'t_3': np.arange(4.0), 'y_3': np.arange(4.0) * 2}
+    snapshot = Snapshot([{'axis_id': 1, 'signals': [3]}], signals, columns)
+
+    path = str(tmp_path / 'run1.npz')
+    response = snapshot.write(path)
+    assert response['signals'] == 1
+    assert response['samples'] == 4
+    assert not os.path.exists(path + '.part')
+
+    metadata, data = read_snapshot(path)
+    assert metadata['signals'] == signals
+    np.testing.assert_array_equal(data[3][0], columns['t_3'])
+    np.testing.assert_array_equal(data[3][1], columns['y_3'])
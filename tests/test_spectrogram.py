@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from src.proto_gen import plot_pb2
+from src.spectrogram import AxisSpectrogram
+
+RATE = 1000.0
+FREQUENCY = 125.0
+AMPLITUDE = 2.0
+
+
+def sine(n):
+    t = np.arange(n) / RATE
+    return t, AMPLITUDE * np.sin(2 * np.pi * FREQUENCY * t)
+
+
+def feed_in_blocks(spectrogram, t, y, sizes):
+    start = 0
+    for size in sizes:
+        spectrogram.feed(t[start:start + size], y[start:start + size])
+        start += size
+    assert start == len(t)
+
+
+@pytest.mark.parametrize('hop', [32, 64, 100])
+def test_sine_fed_across_blocks(hop):
+    spectrogram = AxisSpectrogram(plot_pb2.Spectrogram(fft_size=64, hop=hop, columns=100))
+    t, y = sine(1000)
+    feed_in_blocks(spectrogram, t, y, [10, 50, 63, 1, 200, 7, 669])
+
+    assert spectrogram.update()
+    times, spectra = spectrogram.image()
+    windows = 1 + (1000 - 64) // hop
+    assert spectrogram.computed == windows
+    assert spectrogram.count == len(times) == windows
+    # Each spectrum sits at the middle of its window
+    np.testing.assert_array_equal(times, t[np.arange(windows) * hop + 32])
+    # 125 Hz is bin 8 of 64 at 1 kHz, read at the sine's amplitude
+    assert np.all(spectra.argmax(axis=1) == FREQUENCY * 64 / RATE)
+    np.testing.assert_allclose(spectra.max(axis=1), 20 * np.log10(AMPLITUDE), atol=0.1)
+    assert spectrogram.sample_rate == pytest.approx(RATE)
+
+
+def test_same_spectra_whatever_the_blocks():
+    t, y = sine(700)
+    whole = AxisSpectrogram(plot_pb2.Spectrogram(fft_size=64, hop=48))
+    whole.feed(t, y)
+    pieces = AxisSpectrogram(plot_pb2.Spectrogram(fft_size=64, hop=48))
+    feed_in_blocks(pieces, t, y, [1] * 100 + [600])
+
+    whole.update()
+    pieces.update()
+    for a, b in zip(whole.image(), pieces.image()):
+        np.testing.assert_allclose(a, b, atol=1e-4)
+
+
+def test_hop_longer_than_the_window_skips_samples():
+    spectrogram = AxisSpectrogram(plot_pb2.Spectrogram(fft_size=32, hop=80))
+    t, y = sine(500)
+    feed_in_blocks(spectrogram, t, y, [40, 40, 40, 380])
+    spectrogram.update()
+    times, _ = spectrogram.image()
+    # Windows start at 0, 80, ..., 400 (the one at 480 isn't complete)
+    np.testing.assert_array_equal(times, t[np.arange(0, 401, 80) + 16])
+
+
+def test_backlog_keeps_the_newest_columns():
+    spectrogram = AxisSpectrogram(plot_pb2.Spectrogram(fft_size=64, hop=64, columns=4))
+    t, y = sine(1000)
+    feed_in_blocks(spectrogram, t, y, [300, 300, 400])
+    assert spectrogram.update()
+    times, _ = spectrogram.image()
+    assert spectrogram.count == 4
+    np.testing.assert_array_equal(times, t[np.arange(11, 15) * 64 + 32])
+    assert not spectrogram.update()
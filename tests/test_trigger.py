@@ -0,0 +1,115 @@
+import numpy as np
+import pytest
+
+from src.proto_gen import plot_pb2
+from src.trigger import ARMED, STOPPED, TRIGGERED, AxisTrigger, validate_trigger
+
+Trigger = plot_pb2.Trigger
+
+
+def make_trigger(**settings):
+    settings.setdefault('mode', Trigger.NORMAL)
+    settings.setdefault('pre_trigger', 0.5)
+    settings.setdefault('post_trigger', 1.0)
+    return AxisTrigger(Trigger(signal_id=1, **settings))
+
+
+def square(t, edges):
+    """0, then 1 from each rising edge time for 0.2 s."""
+    y = np.zeros(len(t))
+    for edge in edges:
+        y[(t >= edge) & (t < edge + 0.2)] = 1.0
+    return y
+
+
+def capture(t0, t1):
+    return {1: (t0, t1)}
+
+
+def feed(trigger, t, y, block=10):
+    """Processes (t, y) in blocks; returns how many frames were captured."""
+    return sum(trigger.process(t[start:start + block], y[start:start + block], capture)
+               for start in range(0, len(t), block))
+
+
+T = np.round(np.arange(0.0, 10.0, 0.1), 10)
+
+
+def test_frame_is_taken_once_post_trigger_is_reached():
+    trigger = make_trigger(level=0.5)
+    y = square(T, [2.0])
+    assert not trigger.process(T[:25], y[:25], capture)
+    assert trigger.state == TRIGGERED
+    assert trigger.process(T[25:], y[25:], capture)
+    frame = trigger.frame()
+    assert frame.trigger_time == 2.0
+    assert frame.signals == {1: (1.5, 3.0)}
+    assert not frame.forced
+    assert trigger.state == ARMED
+
+
+def test_crossing_between_blocks_counts():
+    trigger = make_trigger(level=0.5)
+    y = square(T, [2.0])
+    # T[20] (2.0) is the first sample of the third block
+    assert feed(trigger, T, y, block=10) == 1
+    assert trigger.frame().trigger_time == 2.0
+
+
+def test_events_during_a_frame_are_ignored():
+    trigger = make_trigger(level=0.5)
+    assert feed(trigger, T, square(T, [2.0, 2.5, 3.5])) == 2
+    assert [frame.trigger_time for frame in trigger.frames] == [2.0, 3.5]
+
+
+def test_single_stops_until_rearmed():
+    trigger = make_trigger(mode=Trigger.SINGLE, level=0.5)
+    y = square(T, [1.0, 4.0, 7.0])
+    assert feed(trigger, T[:50], y[:50]) == 1
+    assert trigger.state == STOPPED
+    assert feed(trigger, T[50:65], y[50:65]) == 0
+
+    trigger.arm()
+    assert trigger.state == ARMED
+    assert feed(trigger, T[65:], y[65:]) == 1
+    assert [frame.trigger_time for frame in trigger.frames] == [1.0, 7.0]
+    assert trigger.captured == 2
+
+
+def test_falling_and_outside_conditions():
+    falling = make_trigger(condition=Trigger.FALLING, level=0.5)
+    feed(falling, T, square(T, [2.0]))
+    assert falling.frame().trigger_time == 2.2
+
+    outside = make_trigger(condition=Trigger.OUTSIDE, low=-0.5, high=0.5)
+    feed(outside, T, square(T, [3.0]))
+    assert outside.frame().trigger_time == 3.0
+
+
+def test_auto_mode_forces_frames_without_events():
+    trigger = make_trigger(mode=Trigger.AUTO, level=5.0, auto_timeout=2.0)
+    captured = feed(trigger, T, np.zeros(len(T)))
+    assert captured >= 3
+    assert all(frame.forced for frame in trigger.frames)
+
+
+def test_normal_mode_waits_for_events():
+    trigger = make_trigger(level=5.0)
+    assert feed(trigger, T, np.zeros(len(T))) == 0
+    assert trigger.frame() is None
+
+
+@pytest.mark.parametrize('settings', [
+    Trigger(mode=Trigger.NORMAL, pre_trigger=-1.0, post_trigger=1.0),
+    Trigger(mode=Trigger.NORMAL),
+    Trigger(mode=Trigger.NORMAL, post_trigger=1.0, level=float('nan')),
+    Trigger(mode=Trigger.NORMAL, post_trigger=1.0, condition=Trigger.OUTSIDE, low=1.0, high=1.0),
+])
+def test_invalid_settings(settings):
+    with pytest.raises(ValueError):
+        validate_trigger(plot_pb2.AddAxisRequest(axis_id=1, trigger=settings))
+
+
+def test_valid_settings():
+    validate_trigger(plot_pb2.AddAxisRequest(axis_id=1, trigger=Trigger(mode=Trigger.OFF)))
+    validate_trigger(plot_pb2.AddAxisRequest(axis_id=1))